@@ -0,0 +1,68 @@
+"""add indexing jobs table
+
+Revision ID: d4b8e2f6a1c3
+Revises: c9e4a7b1d3f2
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "d4b8e2f6a1c3"
+down_revision = "c9e4a7b1d3f2"
+branch_labels = None
+depends_on = None
+
+
+indexing_job_status = postgresql.ENUM(
+    "queued",
+    "running",
+    "succeeded",
+    "failed",
+    "interrupted",
+    name="indexingjobstatus",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    indexing_job_status.create(bind, checkfirst=True)
+
+    op.create_table(
+        "indexing_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("kind", sa.String(length=40), nullable=False),
+        sa.Column("status", indexing_job_status, nullable=False),
+        sa.Column("owner_id", sa.String(length=100), nullable=True),
+        sa.Column("document_uuid", sa.String(length=100), nullable=True),
+        sa.Column("model_used", sa.String(length=200), nullable=True),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("chunks_total", sa.Integer(), nullable=False),
+        sa.Column("chunks_embedded", sa.Integer(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_indexing_jobs_kind"), "indexing_jobs", ["kind"], unique=False)
+    op.create_index(op.f("ix_indexing_jobs_status"), "indexing_jobs", ["status"], unique=False)
+    op.create_index(op.f("ix_indexing_jobs_owner_id"), "indexing_jobs", ["owner_id"], unique=False)
+    op.create_index(op.f("ix_indexing_jobs_document_uuid"), "indexing_jobs", ["document_uuid"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_indexing_jobs_document_uuid"), table_name="indexing_jobs")
+    op.drop_index(op.f("ix_indexing_jobs_owner_id"), table_name="indexing_jobs")
+    op.drop_index(op.f("ix_indexing_jobs_status"), table_name="indexing_jobs")
+    op.drop_index(op.f("ix_indexing_jobs_kind"), table_name="indexing_jobs")
+    op.drop_table("indexing_jobs")
+
+    bind = op.get_bind()
+    indexing_job_status.drop(bind, checkfirst=True)
@@ -0,0 +1,43 @@
+"""add document catalog table
+
+Revision ID: e7a3c5d9b2f4
+Revises: d4b8e2f6a1c3
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e7a3c5d9b2f4"
+down_revision = "d4b8e2f6a1c3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_catalog",
+        sa.Column("document_uuid", sa.String(length=100), nullable=False),
+        sa.Column("model_used", sa.String(length=200), nullable=False),
+        sa.Column("name", sa.String(length=500), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("mime_type", sa.String(length=200), nullable=True),
+        sa.Column("source_type", sa.String(length=40), nullable=True),
+        sa.Column("is_bayleaf", sa.Boolean(), nullable=False),
+        sa.Column("bayleaf_document_uuid", sa.String(length=100), nullable=True),
+        sa.Column("status", sa.String(length=60), nullable=True),
+        sa.Column("indexed_at", sa.String(length=40), nullable=True),
+        sa.Column("content_sha256", sa.String(length=64), nullable=True),
+        sa.Column("chunking", sa.String(length=100), nullable=True),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("document_uuid", "model_used"),
+    )
+    op.create_index(op.f("ix_document_catalog_indexed_at"), "document_catalog", ["indexed_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_document_catalog_indexed_at"), table_name="document_catalog")
+    op.drop_table("document_catalog")
@@ -0,0 +1,28 @@
+"""add indexing job leases
+
+Revision ID: f1d7b3e5a9c2
+Revises: e7a3c5d9b2f4
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f1d7b3e5a9c2"
+down_revision = "e7a3c5d9b2f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("indexing_jobs", sa.Column("worker_id", sa.String(length=200), nullable=True))
+    op.add_column("indexing_jobs", sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+    op.create_index(op.f("ix_indexing_jobs_lease_expires_at"), "indexing_jobs", ["lease_expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_indexing_jobs_lease_expires_at"), table_name="indexing_jobs")
+    op.drop_column("indexing_jobs", "lease_expires_at")
+    op.drop_column("indexing_jobs", "worker_id")
@@ -1,5 +1,6 @@
 from ..llm.base import LLMProvider
 from ..services.phi_filter import PHIFilterClient
+from ..services.reranker import CrossEncoderReranker
 from ..tools.bayleaf import BayleafClient
 from ..tools.documents import DocumentsToolset
 from .reasoning import ReasoningBaseAgent
@@ -13,6 +14,7 @@ class LabcopilotAgent(ReasoningBaseAgent):
         documents_tools: DocumentsToolset | None = None,
         phi_filter: PHIFilterClient | None = None,
         decider_provider: LLMProvider | None = None,
+        reranker: CrossEncoderReranker | None = None,
     ):
         super().__init__(
             name="Labcopilot Agent",
@@ -330,3 +332,4 @@ class LabcopilotAgent(ReasoningBaseAgent):
             documents_doc_key="lab",
         )
         self.decider_provider = decider_provider or provider
+        self.reranker = reranker
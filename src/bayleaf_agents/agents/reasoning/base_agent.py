@@ -193,6 +193,26 @@ class ReasoningBaseAgent(BaseAgent):
             },
         }
 
+    def _rerank_prefetch(self, query: str, prefetch_result: Dict[str, Any]) -> Dict[str, Any]:
+        # Optional cross-encoder pass: keeps only the best chunks for the system prompt.
+        reranker = getattr(self, "reranker", None)
+        chunks = [c for c in (prefetch_result.get("chunks") or []) if isinstance(c, dict)]
+        if reranker is None or not chunks:
+            return prefetch_result
+        trace = dict(prefetch_result.get("trace") or {})
+        try:
+            ranked, stats = reranker.rerank(query, chunks, chunk_ref=self._prefetch_chunk_key)
+        except Exception as exc:
+            try:
+                self.log.warning("retrieval_rerank_failed", error=str(exc))
+            except Exception:
+                pass
+            trace["rerank"] = {"error": str(exc)}
+            return {**prefetch_result, "trace": trace}
+        trace["rerank"] = stats
+        trace["returned_chunks"] = len(ranked)
+        return {**prefetch_result, "chunks": ranked, "trace": trace}
+
     def chat(
         self,
         db: Session,
@@ -340,6 +360,10 @@ class ReasoningBaseAgent(BaseAgent):
                         principal=principal,
                     )
                 prefetch_result = self._merge_prefetch_results(focused_result, general_result)
+                prefetch_result = self._rerank_prefetch(user_message, prefetch_result)
+                rerank_trace = (prefetch_result.get("trace") or {}).get("rerank") or {}
+                if "kept" in rerank_trace:
+                    prefetch_top_k = rerank_trace["kept"]
                 route_trace["prefetch"] = {
                     "requested_query": user_message,
                     "prefetch_strategy": ("dual_general_plus_candidates" if candidate_ids else "single_general"),
@@ -1,4 +1,7 @@
 # src/bayleaf_agents/app.py
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
@@ -8,11 +11,50 @@ from .logging import setup_logging
 from .routers import health
 from .routers.agents import router as agents_router
 from .routers.documents import router as documents_router
+from .services import factories
+from .services.factories import get_indexing_jobs, get_qdrant_documents, get_startup_warmup
+
+
+def _backfill_document_catalog(log) -> None:
+    try:
+        get_qdrant_documents().backfill_document_catalog()
+    except Exception as exc:
+        log.warning("document_catalog_backfill_failed", error=str(exc))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log = setup_logging()
+    if settings.DOCUMENT_CATALOG_ENABLED:
+        threading.Thread(
+            target=_backfill_document_catalog,
+            args=(log,),
+            name="document-catalog-backfill",
+            daemon=True,
+        ).start()
+    warmup = get_startup_warmup()
+    warmup.start()
+    jobs = None
+    if settings.INDEXING_JOBS_RESUME_ON_STARTUP:
+        try:
+            jobs = get_indexing_jobs()
+            jobs.resume_pending()
+        except Exception as exc:
+            log.warning("indexing_jobs_resume_failed", error=str(exc))
+    yield
+    warmup.stop()
+    if jobs is not None:
+        jobs.shutdown(wait=False)
+    documents = factories._qdrant_documents
+    if documents is not None and documents.pdf_extractor is not None:
+        documents.pdf_extractor.shutdown()
+    if factories._embedding_workers is not None:
+        factories._embedding_workers.shutdown()
 
 
 def create_app() -> FastAPI:
     log = setup_logging()
-    app = FastAPI(title="Bayleaf Agents", version="0.1.0")
+    app = FastAPI(title="Bayleaf Agents", version="0.1.0", lifespan=lifespan)
     app.router.redirect_slashes = False
 
     app.add_middleware(
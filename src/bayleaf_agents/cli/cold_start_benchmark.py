@@ -0,0 +1,113 @@
+"""
+Measure time-to-first-answer of a freshly started API process.
+
+    python -m bayleaf_agents.cli.cold_start_benchmark --runs 3 --query "ldl target" --preload
+    python -m bayleaf_agents.cli.cold_start_benchmark --runs 3 --query "ldl target" --no-preload
+
+Each run starts uvicorn in a subprocess with the current environment and times,
+from process start: the first 200 on /health (listening), the first 200 on /ready
+(warm-up done), and the first answer to POST /agents/documents/query, followed by
+one more query for the warm latency. --preload/--no-preload override
+EMBEDDING_PRELOAD_ON_STARTUP for the child process.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _poll(url: str, started: float, deadline: float, proc: subprocess.Popen) -> float:
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with status {proc.returncode}")
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return time.perf_counter() - started
+        except requests.RequestException:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(url)
+
+
+def _query(base: str, args: argparse.Namespace) -> float:
+    body = {"query": args.query, "top_k": args.top_k}
+    if args.model:
+        body["model_used"] = args.model
+    started = time.perf_counter()
+    resp = requests.post(
+        f"{base}/agents/documents/query",
+        json=body,
+        headers={"Authorization": f"Bearer {args.token}"},
+        timeout=args.timeout,
+    )
+    resp.raise_for_status()
+    return time.perf_counter() - started
+
+
+def run_once(args: argparse.Namespace) -> dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(os.environ)
+    if args.preload is not None:
+        env["EMBEDDING_PRELOAD_ON_STARTUP"] = "true" if args.preload else "false"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "bayleaf_agents.app:create_app", "--factory", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + args.timeout
+        listening = _poll(f"{base}/health", started, deadline, proc)
+        ready = _poll(f"{base}/ready", started, deadline, proc)
+        first_query = _query(base, args)
+        first_answer = time.perf_counter() - started
+        warm_query = _query(base, args)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return {
+        "listening_s": round(listening, 3),
+        "ready_s": round(ready, 3),
+        "first_answer_s": round(first_answer, 3),
+        "first_query_ms": round(first_query * 1000, 1),
+        "warm_query_ms": round(warm_query * 1000, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--query", default="ldl cholesterol target")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds per run")
+    parser.add_argument("--token", default="benchmark", help="bearer token sent with the queries")
+    parser.add_argument("--preload", dest="preload", action="store_true", default=None)
+    parser.add_argument("--no-preload", dest="preload", action="store_false")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args) for _ in range(max(1, args.runs))]
+    summary = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    print(json.dumps({"preload": args.preload, "runs": runs, "median": summary}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Download embedding (and reranker) model weights into the Hugging Face cache.
+
+    python -m bayleaf_agents.cli.download_models
+    python -m bayleaf_agents.cli.download_models --models BAAI/bge-m3 --no-reranker
+
+Meant for image builds: run it in the Dockerfile so containers start with the
+weights on disk (HF_HOME) instead of downloading them on the first request.
+Defaults to every model in EMBEDDING_MODELS plus RERANK_MODEL when set.
+"model@onnx" / "model@onnx-int8" entries are also exported to ONNX_MODEL_DIR
+unless already there. Each model is loaded and encodes once, so a broken
+download fails the build.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from ..config import settings
+from ..services.embedding_models import ModelLoadError, load_embedding_model, split_model_spec
+from ..services.factories import embedding_loader_kwargs
+from ..services.onnx_embedder import EXPORT_CONFIG, export_onnx_model, onnx_model_dir
+from ..services.reranker import CrossEncoderReranker, RerankerUnavailable
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", default=settings.EMBEDDING_MODELS, help="comma-separated embedding models")
+    parser.add_argument("--reranker", default=settings.RERANK_MODEL, help="cross-encoder model; empty skips it")
+    parser.add_argument("--no-reranker", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = {}
+    failed = False
+    options = embedding_loader_kwargs()
+    for spec in [m.strip() for m in args.models.split(",") if m.strip()]:
+        name, backend = split_model_spec(spec)
+        started = time.perf_counter()
+        try:
+            target = onnx_model_dir(options["onnx_dir"], name)
+            if backend != "torch" and not os.path.exists(os.path.join(target, EXPORT_CONFIG)):
+                export_onnx_model(name, target)
+            load_embedding_model(spec, **options).encode(["warm-up query"])
+            report[spec] = {"seconds": round(time.perf_counter() - started, 1)}
+        except ModelLoadError as exc:
+            report[spec] = {"error": exc.code, "detail": exc.detail}
+            failed = True
+    reranker = "" if args.no_reranker else args.reranker.strip()
+    if reranker:
+        started = time.perf_counter()
+        try:
+            CrossEncoderReranker(reranker).warm_up()
+            report[reranker] = {"seconds": round(time.perf_counter() - started, 1)}
+        except RerankerUnavailable as exc:
+            report[reranker] = {"error": "reranker_unavailable", "detail": str(exc)}
+            failed = True
+    print(json.dumps(report, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Compare query-embedding throughput in-process against the embedding worker pool.
+
+    python -m bayleaf_agents.cli.embedding_throughput --model intfloat/multilingual-e5-base --threads 16 --requests 2000
+
+Each of --threads request threads encodes single queries, as concurrent chat
+turns do. The in-process run shares one model across the threads; the worker
+run sends every call to the pool, which micro-batches them.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from ..config import settings
+from ..services.embedding_models import EmbeddingModelRegistry, load_embedding_model
+from ..services.embedding_worker import EmbeddingWorkerPool
+from ..services.factories import embedding_loader_kwargs
+
+
+def _measure(encode, threads: int, requests: int) -> dict:
+    queries = [f"ldl cholesterol target for patient {idx}" for idx in range(requests)]
+    encode(queries[0])
+    latencies = []
+
+    def _one(query: str) -> None:
+        started = time.perf_counter()
+        encode(query)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(_one, queries))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "qps": round(requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--model",
+        default=settings.EMBEDDING_DEFAULT_MODEL or settings.EMBEDDING_MODELS.split(",")[0],
+        help="model spec; a @onnx / @onnx-int8 suffix benchmarks the ONNX backend",
+    )
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=max(1, settings.EMBEDDING_WORKERS))
+    parser.add_argument("--max-batch", type=int, default=settings.EMBEDDING_WORKER_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.EMBEDDING_WORKER_MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+    model = args.model.strip()
+
+    registry = EmbeddingModelRegistry(
+        torch_threads=settings.EMBEDDING_TORCH_THREADS,
+        loader=partial(load_embedding_model, **embedding_loader_kwargs()),
+    )
+
+    def _inline(query: str) -> None:
+        with registry.use(model) as embedder:
+            embedder.encode([query], normalize_embeddings=True, show_progress_bar=False)
+
+    report = {"model": model, "threads": args.threads, "requests": args.requests}
+    report["in_process"] = _measure(_inline, args.threads, args.requests)
+    registry.evict(model)
+
+    pool = EmbeddingWorkerPool(
+        workers=args.workers,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        torch_threads=settings.EMBEDDING_TORCH_THREADS,
+        loader_kwargs=embedding_loader_kwargs(),
+    )
+    try:
+        embedder = pool.embedder(model)
+
+        def _worker(query: str) -> None:
+            embedder.encode([query], normalize_embeddings=True)
+
+        report["workers"] = _measure(_worker, args.threads, args.requests)
+        report["workers"]["pool"] = pool.stats()
+    finally:
+        pool.shutdown()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
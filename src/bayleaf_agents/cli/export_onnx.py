@@ -0,0 +1,43 @@
+"""
+Export embedding models to ONNX (fp32 plus a dynamically int8-quantized copy).
+
+    python -m bayleaf_agents.cli.export_onnx intfloat/multilingual-e5-base
+    python -m bayleaf_agents.cli.export_onnx BAAI/bge-m3 --no-int8 --out /models/onnx
+
+Exports land in ONNX_MODEL_DIR/<model with / replaced by __>, where
+"model@onnx" and "model@onnx-int8" entries in EMBEDDING_MODELS look for them.
+Check the result with python -m bayleaf_agents.cli.onnx_parity before switching.
+"""
+import argparse
+import json
+import sys
+
+from ..config import settings
+from ..services.embedding_models import ModelLoadError, split_model_spec
+from ..services.onnx_embedder import export_onnx_model, onnx_model_dir
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("models", nargs="+", help="model names (a @backend suffix is ignored)")
+    parser.add_argument("--out", default=settings.ONNX_MODEL_DIR.strip(), help="export root; defaults to ONNX_MODEL_DIR")
+    parser.add_argument("--no-int8", action="store_true", help="skip the int8-quantized copy")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args(argv)
+
+    report = {}
+    failed = False
+    for spec in args.models:
+        name, _ = split_model_spec(spec)
+        target = onnx_model_dir(args.out, name)
+        try:
+            report[name] = {"dir": target, **export_onnx_model(name, target, quantize=not args.no_int8, opset=args.opset)}
+        except ModelLoadError as exc:
+            report[name] = {"error": exc.code, "detail": exc.detail}
+            failed = True
+    print(json.dumps(report, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Copy a model's indexed chunks to another embedding model without re-downloading documents.
+
+    python -m bayleaf_agents.cli.migrate_collection intfloat/multilingual-e5-base --target BAAI/bge-m3
+    python -m bayleaf_agents.cli.migrate_collection --resume <job id>
+
+Runs a "migrate" indexing job and waits for it, printing progress. Page
+checkpoints are stored in the indexing_jobs table (the job is also visible at
+GET /agents/documents/jobs/<id>). Ctrl-C stops the job after its current page;
+--resume continues it from the last checkpoint. Switch EMBEDDING_DEFAULT_MODEL
+to the target once the job succeeds.
+"""
+import argparse
+import json
+import sys
+
+from ..config import settings
+from ..services.factories import get_indexing_jobs
+from ..services.qdrant_documents import DocumentServiceError
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", nargs="?", help="model whose collection is copied")
+    parser.add_argument("--target", default=None, help="target model; defaults to EMBEDDING_DEFAULT_MODEL")
+    parser.add_argument("--batch-size", type=int, default=settings.MIGRATION_BATCH_SIZE)
+    parser.add_argument("--max-points-per-second", type=float, default=settings.MIGRATION_MAX_POINTS_PER_SECOND)
+    parser.add_argument("--resume", default=None, metavar="JOB_ID", help="continue a failed or interrupted migration")
+    args = parser.parse_args(argv)
+    if not args.source and not args.resume:
+        parser.error("give a source model or --resume JOB_ID")
+
+    jobs = get_indexing_jobs()
+    try:
+        if args.resume:
+            job = jobs.retry(args.resume, None)
+            if job is None:
+                print(f"job {args.resume} not found", file=sys.stderr)
+                return 1
+        else:
+            job = jobs.submit_migrate(
+                source_model=args.source,
+                target_model=args.target,
+                batch_size=args.batch_size,
+                max_points_per_second=args.max_points_per_second,
+            )
+    except DocumentServiceError as exc:
+        print(json.dumps({"error": exc.message, "details": exc.details}), file=sys.stderr)
+        return 1
+
+    job_id = job["id"]
+    print(f"migration job {job_id}", file=sys.stderr)
+    try:
+        while job["status"] in ("queued", "running"):
+            try:
+                job = jobs.wait(job_id, timeout=10.0)
+            except TimeoutError:
+                job = jobs.get(job_id)
+            print(f"{job['chunks_embedded']} chunks migrated", file=sys.stderr)
+    except KeyboardInterrupt:
+        jobs.interrupt(job_id)
+        print(f"stopping after the current page; resume with --resume {job_id}", file=sys.stderr)
+        job = jobs.wait(job_id)
+    print(json.dumps({"id": job_id, "status": job["status"], "result": job["result"], "error": job["error"]}, indent=2))
+    return 0 if job["status"] == "succeeded" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
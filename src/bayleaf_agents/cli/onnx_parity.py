@@ -0,0 +1,50 @@
+"""
+Check an ONNX export against the PyTorch model and benchmark both backends.
+
+    python -m bayleaf_agents.cli.onnx_parity intfloat/multilingual-e5-base --backend onnx-int8 --min-cosine 0.99
+    python -m bayleaf_agents.cli.onnx_parity intfloat/multilingual-e5-base --corpus passages.txt
+
+Texts come from the model's indexed chunks (--sample, default 500) or from a
+file with one passage per line (--corpus). Reports per-text cosine between the
+two backends and texts/s at batch 1 and 32, and exits with status 1 when the
+lowest cosine is below --min-cosine.
+"""
+import argparse
+import json
+import sys
+
+from ..services.embedding_models import load_embedding_model, split_model_spec
+from ..services.factories import embedding_loader_kwargs, get_qdrant_documents
+from ..services.onnx_embedder import ONNX_BACKENDS, compare_embedders
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model", help="model name (a @backend suffix is ignored)")
+    parser.add_argument("--backend", choices=ONNX_BACKENDS, default="onnx-int8")
+    parser.add_argument("--corpus", default=None, help="text file with one passage per line")
+    parser.add_argument("--sample", type=int, default=500, help="indexed chunks to use when --corpus is not given")
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args(argv)
+
+    name, _ = split_model_spec(args.model)
+    if args.corpus:
+        with open(args.corpus, "r", encoding="utf-8") as fh:
+            texts = [line.strip() for line in fh if line.strip()]
+    else:
+        texts = get_qdrant_documents().sample_chunks(name, limit=args.sample)
+    if not texts:
+        print("no texts to compare", file=sys.stderr)
+        return 1
+
+    options = embedding_loader_kwargs()
+    reference = load_embedding_model(name, **options)
+    candidate = load_embedding_model(f"{name}@{args.backend}", **options)
+    report = {"model": name, "backend": args.backend, "min_cosine": args.min_cosine}
+    report.update(compare_embedders(reference, candidate, texts))
+    print(json.dumps(report, indent=2))
+    return 0 if report["cosine_min"] >= args.min_cosine else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
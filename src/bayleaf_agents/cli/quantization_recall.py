@@ -0,0 +1,34 @@
+"""
+Measure recall@k of the configured (quantized) dense search against exact search.
+
+    python -m bayleaf_agents.cli.quantization_recall queries.txt --model BAAI/bge-m3 --min-recall 0.95
+
+queries.txt holds one query per line. Exits with status 1 when the mean
+recall@k falls below --min-recall, so it can gate a quantization rollout.
+"""
+import argparse
+import json
+import sys
+
+from ..services.factories import get_qdrant_documents
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("queries", help="text file with one query per line")
+    parser.add_argument("--model", default=None, help="embedding model; defaults to EMBEDDING_DEFAULT_MODEL")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    args = parser.parse_args(argv)
+
+    with open(args.queries, "r", encoding="utf-8") as fh:
+        queries = [line.strip() for line in fh if line.strip()]
+    report = get_qdrant_documents().quantization_recall(queries, model_used=args.model, top_k=args.top_k)
+    report["min_recall"] = args.min_recall
+    print(json.dumps(report, indent=2))
+    recall = report.get("recall_at_k")
+    return 0 if recall is not None and recall >= args.min_recall else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,12 +42,98 @@ class Settings(BaseModel):
     BAYLEAF_TOKEN_MODE: str = Field(default=os.getenv("BAYLEAF_TOKEN_MODE", "static"))  # static|client_credentials|obo
 
     # Qdrant (document indexing)
+    VECTOR_STORE: str = Field(default=os.getenv("VECTOR_STORE", "qdrant"))  # qdrant|local
+    LOCAL_VECTOR_STORE_DIR: str = Field(default=os.getenv("LOCAL_VECTOR_STORE_DIR", "./data/vectors"))
     QDRANT_URL: str = Field(default=os.getenv("QDRANT_URL", "http://localhost:6333"))
     QDRANT_COLLECTION: str = Field(default=os.getenv("QDRANT_COLLECTION", "documents"))
     QDRANT_DISTANCE: str = Field(default=os.getenv("QDRANT_DISTANCE", "Cosine"))
     QDRANT_TIMEOUT: int = Field(default=int(os.getenv("QDRANT_TIMEOUT", "20")))
+    QDRANT_CONNECT_TIMEOUT: float = Field(default=float(os.getenv("QDRANT_CONNECT_TIMEOUT", "3")))
+    # Read timeout for /points/search and /points/query; defaults to QDRANT_TIMEOUT
+    QDRANT_SEARCH_TIMEOUT: float = Field(default=float(os.getenv("QDRANT_SEARCH_TIMEOUT") or os.getenv("QDRANT_TIMEOUT", "20")))
+    QDRANT_POOL_SIZE: int = Field(default=int(os.getenv("QDRANT_POOL_SIZE", "16")))
+    QDRANT_MAX_RETRIES: int = Field(default=int(os.getenv("QDRANT_MAX_RETRIES", "3")))
+    QDRANT_RETRY_BACKOFF: float = Field(default=float(os.getenv("QDRANT_RETRY_BACKOFF", "0.3")))
+    QDRANT_UPSERT_BATCH_SIZE: int = Field(default=int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "64")))
+    # false: send upserts without waiting and confirm completion by counting points afterwards
+    QDRANT_UPSERT_WAIT: bool = Field(default=os.getenv("QDRANT_UPSERT_WAIT", "true").strip().lower() in {"1", "true", "yes", "on"})
+    QDRANT_QUANTIZATION: str = Field(default=os.getenv("QDRANT_QUANTIZATION", "none"))  # none|scalar|binary
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = Field(
+        default=os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").strip().lower() in {"1", "true", "yes", "on"}
+    )
+    QDRANT_SEARCH_OVERSAMPLING: float = Field(default=float(os.getenv("QDRANT_SEARCH_OVERSAMPLING", "2.0")))
+    QDRANT_SEARCH_RESCORE: bool = Field(
+        default=os.getenv("QDRANT_SEARCH_RESCORE", "true").strip().lower() in {"1", "true", "yes", "on"}
+    )
+    QDRANT_UPSERT_CONFIRM_TIMEOUT: float = Field(default=float(os.getenv("QDRANT_UPSERT_CONFIRM_TIMEOUT", "30")))
     EMBEDDING_MODELS: str = Field(default=os.getenv("EMBEDDING_MODELS", "intfloat/multilingual-e5-base"))
     EMBEDDING_DEFAULT_MODEL: str = Field(default=os.getenv("EMBEDDING_DEFAULT_MODEL", ""))
+    EMBEDDING_BATCH_SIZE: int = Field(default=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")))
+    # 0 disables the budget; otherwise least recently used idle models are unloaded to stay under it.
+    EMBEDDING_MODEL_MEMORY_BUDGET_MB: float = Field(default=float(os.getenv("EMBEDDING_MODEL_MEMORY_BUDGET_MB", "0")))
+    EMBEDDING_TORCH_THREADS: int = Field(default=int(os.getenv("EMBEDDING_TORCH_THREADS", "0")))  # 0 = torch default
+    EMBEDDING_MODEL_THREADS: str = Field(default=os.getenv("EMBEDDING_MODEL_THREADS", ""))  # model=threads,...
+    # Exports for "model@onnx" / "model@onnx-int8" entries in EMBEDDING_MODELS; empty = ~/.cache/bayleaf-agents/onnx
+    ONNX_MODEL_DIR: str = Field(default=os.getenv("ONNX_MODEL_DIR", ""))
+    # >0 moves encoding into this many worker processes that micro-batch concurrent requests.
+    EMBEDDING_WORKERS: int = Field(default=int(os.getenv("EMBEDDING_WORKERS", "0")))
+    EMBEDDING_WORKER_MAX_BATCH: int = Field(default=int(os.getenv("EMBEDDING_WORKER_MAX_BATCH", "64")))
+    EMBEDDING_WORKER_MAX_WAIT_MS: float = Field(default=float(os.getenv("EMBEDDING_WORKER_MAX_WAIT_MS", "5")))
+    EMBEDDING_WORKER_TIMEOUT: float = Field(default=float(os.getenv("EMBEDDING_WORKER_TIMEOUT", "120")))
+    # Load, encode with and bootstrap collections for these models before /ready reports ready.
+    EMBEDDING_PRELOAD_ON_STARTUP: bool = Field(
+        default=os.getenv("EMBEDDING_PRELOAD_ON_STARTUP", "false").strip().lower() in {"1", "true", "yes", "on"}
+    )
+    EMBEDDING_PRELOAD_MODELS: str = Field(default=os.getenv("EMBEDDING_PRELOAD_MODELS", ""))  # empty = default model; "all"
+    EMBEDDING_PRELOAD_RETRY_SECONDS: float = Field(default=float(os.getenv("EMBEDDING_PRELOAD_RETRY_SECONDS", "10")))
+    # Chunk size in embedding-model tokens; capped at the model's max_seq_length.
+    CHUNK_MAX_TOKENS: int = Field(default=int(os.getenv("CHUNK_MAX_TOKENS", "384")))
+    CHUNK_OVERLAP_TOKENS: int = Field(default=int(os.getenv("CHUNK_OVERLAP_TOKENS", "48")))
+    # Cross-encoder applied to reasoning-agent prefetch results; empty disables reranking.
+    RERANK_MODEL: str = Field(default=os.getenv("RERANK_MODEL", ""))
+    RERANK_TOP_N: int = Field(default=int(os.getenv("RERANK_TOP_N", "6")))
+    RERANK_BATCH_SIZE: int = Field(default=int(os.getenv("RERANK_BATCH_SIZE", "32")))
+    RERANK_CACHE_SIZE: int = Field(default=int(os.getenv("RERANK_CACHE_SIZE", "4096")))
+    # Persistent (model, sha256(text)) -> vector cache; empty disables it
+    EMBEDDING_CACHE_DIR: str = Field(default=os.getenv("EMBEDDING_CACHE_DIR", ""))
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(default=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000")))
+    # In-process LRU for query vectors; size 0 disables it
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(default=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")))
+    QUERY_EMBEDDING_CACHE_TTL: float = Field(default=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "600")))
+    # Downloads and uploads are spooled here while hashing and extracting; empty uses the system temp dir
+    DOCUMENT_SPOOL_DIR: str = Field(default=os.getenv("DOCUMENT_SPOOL_DIR", ""))
+
+    # dense | hybrid (dense + BM25-style sparse vectors fused in Qdrant); hybrid is opt-in and needs
+    # collections created by this version, older ones keep answering with dense search.
+    RETRIEVAL_MODE: str = Field(default=os.getenv("RETRIEVAL_MODE", "dense"))
+    RETRIEVAL_FUSION: str = Field(default=os.getenv("RETRIEVAL_FUSION", "rrf"))  # rrf|dbsf
+
+    # Postgres summary of indexed documents; listing reads it instead of scrolling Qdrant.
+    # When enabled and empty at startup, it is backfilled from Qdrant in the background.
+    DOCUMENT_CATALOG_ENABLED: bool = Field(
+        default=os.getenv("DOCUMENT_CATALOG_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+    )
+
+    # Concurrent download/extraction workers for POST /agents/documents/index/bulk
+    BULK_INDEX_WORKERS: int = Field(default=int(os.getenv("BULK_INDEX_WORKERS", "4")))
+
+    # PDF text extraction process pool; 0 workers extracts inline on the calling thread
+    PDF_EXTRACT_WORKERS: int = Field(default=int(os.getenv("PDF_EXTRACT_WORKERS", "2")))
+    PDF_EXTRACT_PAGES_PER_TASK: int = Field(default=int(os.getenv("PDF_EXTRACT_PAGES_PER_TASK", "16")))
+    PDF_EXTRACT_TIMEOUT: float = Field(default=float(os.getenv("PDF_EXTRACT_TIMEOUT", "120")))
+
+    # Background indexing jobs
+    INDEXING_JOB_WORKERS: int = Field(default=int(os.getenv("INDEXING_JOB_WORKERS", "2")))
+    INDEXING_JOBS_SPOOL_DIR: str = Field(default=os.getenv("INDEXING_JOBS_SPOOL_DIR", ""))
+    INDEXING_JOBS_SPOOL_RETENTION_HOURS: float = Field(default=float(os.getenv("INDEXING_JOBS_SPOOL_RETENTION_HOURS", "24")))
+    INDEXING_JOBS_RESUME_ON_STARTUP: bool = Field(
+        default=os.getenv("INDEXING_JOBS_RESUME_ON_STARTUP", "true").strip().lower() in {"1", "true", "yes", "on"}
+    )
+    # Running jobs renew their lease every third of this; other processes resume them once it expires
+    INDEXING_JOB_LEASE_SECONDS: float = Field(default=float(os.getenv("INDEXING_JOB_LEASE_SECONDS", "60")))
+    # Cross-model migrations: source points scrolled (and re-embedded) per page, and a rate cap (0 = unthrottled)
+    MIGRATION_BATCH_SIZE: int = Field(default=int(os.getenv("MIGRATION_BATCH_SIZE", "256")))
+    MIGRATION_MAX_POINTS_PER_SECOND: float = Field(default=float(os.getenv("MIGRATION_MAX_POINTS_PER_SECOND", "50")))
 
 
 settings = Settings()
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, DateTime, ForeignKey, Enum, JSON, Integer, UniqueConstraint
+from sqlalchemy import Boolean, String, Text, DateTime, ForeignKey, Enum, JSON, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .db import Base
 import enum
@@ -19,6 +19,14 @@ class ConversationGroupType(str, enum.Enum):
     event = "event"
 
 
+class IndexingJobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    interrupted = "interrupted"
+
+
 class ConversationGroup(Base):
     __tablename__ = "conversation_groups"
 
@@ -116,3 +124,58 @@ class PHIEntity(Base):
     start: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     end: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class IndexingJob(Base):
+    __tablename__ = "indexing_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind: Mapped[str] = mapped_column(String(40), index=True)  # index | upload | reindex | migrate
+    status: Mapped[IndexingJobStatus] = mapped_column(
+        Enum(IndexingJobStatus), index=True, default=IndexingJobStatus.queued
+    )
+    owner_id: Mapped[Optional[str]] = mapped_column(String(100), index=True, nullable=True)
+    document_uuid: Mapped[Optional[str]] = mapped_column(String(100), index=True, nullable=True)
+    model_used: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    params: Mapped[dict] = mapped_column(JSON, default=dict)
+    chunks_total: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_embedded: Mapped[int] = mapped_column(Integer, default=0)
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Process that holds the job; active jobs whose lease has expired are free to resume.
+    worker_id: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+
+
+class DocumentCatalogEntry(Base):
+    """One summary row per indexed (document, embedding model), mirrored from the Qdrant payload."""
+
+    __tablename__ = "document_catalog"
+
+    document_uuid: Mapped[str] = mapped_column(String(100), primary_key=True)
+    model_used: Mapped[str] = mapped_column(String(200), primary_key=True)
+    name: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    mime_type: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    source_type: Mapped[Optional[str]] = mapped_column(String(40), nullable=True)
+    is_bayleaf: Mapped[bool] = mapped_column(Boolean, default=False)
+    bayleaf_document_uuid: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    status: Mapped[Optional[str]] = mapped_column(String(60), nullable=True)
+    # ISO-8601 UTC string, exactly as stored in the Qdrant payload.
+    indexed_at: Mapped[Optional[str]] = mapped_column(String(40), index=True, nullable=True)
+    content_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    chunking: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    chunk_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
@@ -32,6 +32,7 @@ from ..services.factories import (
     get_documents_tools,
     get_phi_filter,
     get_provider,
+    get_reranker,
 )
 from ..tools.bayleaf import BayleafAuthError
 
@@ -148,6 +149,7 @@ for slug, AgentCls in _AGENT_CLASSES.items():
             "phi_filter": get_phi_filter(),
             "documents_tools": get_documents_tools(),
             "decider_provider": get_decider_provider(),
+            "reranker": get_reranker(),
         }
         init_params = inspect.signature(_AgentCls.__init__).parameters
         accepted = {k: v for k, v in common_kwargs.items() if k in init_params}
@@ -1,8 +1,11 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from ..auth.deps import Principal, require_auth
-from ..services.factories import get_documents_tools, get_qdrant_documents
+from ..config import settings
+from ..services.factories import get_documents_tools, get_embedding_workers, get_indexing_jobs, get_qdrant_documents
 from ..services.qdrant_documents import DocumentServiceError
 
 
@@ -25,10 +28,38 @@ class DocumentsAvailableResponse(BaseModel):
 class DocumentIndexRequest(BaseModel):
     document_uuid: str
     model_used: str | None = None
+    force: bool = False
+
+
+class DocumentBulkIndexRequest(BaseModel):
+    document_uuids: list[str] = Field(min_length=1, max_length=500)
+    model_used: str | None = None
+    force: bool = False
+
+
+class DocumentBulkIndexResult(BaseModel):
+    document_uuid: str
+    ok: bool
+    document: IndexedDocument | None = None
+    error: dict | None = None
+
+
+class DocumentBulkIndexResponse(BaseModel):
+    results: list[DocumentBulkIndexResult]
+    indexed: int
+    failed: int
 
 
 class DocumentReindexRequest(BaseModel):
     model_used: str | None = None
+    force: bool = False
+
+
+class DocumentMigrationRequest(BaseModel):
+    source_model: str
+    target_model: str | None = None  # defaults to EMBEDDING_DEFAULT_MODEL
+    batch_size: int | None = Field(default=None, ge=1, le=2048)
+    max_points_per_second: float | None = Field(default=None, ge=0)  # 0 = unthrottled
 
 
 class DocumentQueryRequest(BaseModel):
@@ -39,6 +70,8 @@ class DocumentQueryRequest(BaseModel):
     document_uuids: list[str] | None = None
     source_type: str | None = None
     is_bayleaf: bool | None = None
+    retrieval_mode: str | None = None  # dense | hybrid; defaults to RETRIEVAL_MODE
+    all_models: bool = False  # search every EMBEDDING_MODELS collection and merge with RRF
 
 
 class RetrievedChunk(BaseModel):
@@ -62,6 +95,22 @@ class DocumentQueryResponse(BaseModel):
     trace: dict
 
 
+class IndexingJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    document_uuid: str | None = None
+    model_used: str | None = None
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    # Indexing jobs return a document; migrations return their own summary.
+    result: IndexedDocument | dict | None = Field(default=None, union_mode="left_to_right")
+    error: dict | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 router = APIRouter(prefix="/agents", tags=["documents"])
 
 
@@ -72,8 +121,10 @@ def _raise_document_error(exc: DocumentServiceError) -> None:
     raise HTTPException(status_code=exc.status_code, detail=detail) from exc
 
 
+# Plain def for the blocking handlers: FastAPI runs them in its threadpool, so PDF extraction,
+# embedding and spooling uploads to disk never hold the event loop.
 @router.post("/documents/index", response_model=IndexedDocument)
-async def index_document(
+def index_document(
     req: DocumentIndexRequest,
     principal: Principal = Depends(require_auth()),
 ):
@@ -83,14 +134,38 @@ async def index_document(
             document_uuid=req.document_uuid,
             principal=principal,
             model_used=req.model_used,
+            force=req.force,
         )
         return IndexedDocument(**indexed)
     except DocumentServiceError as exc:
         _raise_document_error(exc)
 
 
+@router.post("/documents/index/bulk", response_model=DocumentBulkIndexResponse)
+def index_documents_bulk(
+    req: DocumentBulkIndexRequest,
+    principal: Principal = Depends(require_auth()),
+):
+    service = get_qdrant_documents()
+    try:
+        results = service.index_documents_bulk(
+            document_uuids=req.document_uuids,
+            principal=principal,
+            model_used=req.model_used,
+            force=req.force,
+        )
+        indexed = sum(1 for r in results if r["ok"])
+        return DocumentBulkIndexResponse(
+            results=[DocumentBulkIndexResult(**r) for r in results],
+            indexed=indexed,
+            failed=len(results) - indexed,
+        )
+    except DocumentServiceError as exc:
+        _raise_document_error(exc)
+
+
 @router.post("/documents/index/upload", response_model=IndexedDocument)
-async def index_document_upload(
+def index_document_upload(
     file: UploadFile = File(...),
     model_used: str | None = Form(default=None),
     principal: Principal = Depends(require_auth()),
@@ -98,10 +173,9 @@ async def index_document_upload(
     _ = principal
     service = get_qdrant_documents()
     try:
-        content = await file.read()
         indexed = service.index_uploaded_document(
             filename=file.filename or "uploaded_document",
-            content=content,
+            fileobj=file.file,
             mime_type=file.content_type,
             model_used=model_used,
         )
@@ -110,6 +184,90 @@ async def index_document_upload(
         _raise_document_error(exc)
 
 
+@router.post("/documents/index/jobs", response_model=IndexingJobResponse, status_code=202)
+async def enqueue_index_document(
+    req: DocumentIndexRequest,
+    principal: Principal = Depends(require_auth()),
+):
+    jobs = get_indexing_jobs()
+    try:
+        job = jobs.submit_index(
+            document_uuid=req.document_uuid,
+            principal=principal,
+            model_used=req.model_used,
+            force=req.force,
+        )
+        return IndexingJobResponse(**job)
+    except DocumentServiceError as exc:
+        _raise_document_error(exc)
+
+
+@router.post("/documents/index/upload/jobs", response_model=IndexingJobResponse, status_code=202)
+def enqueue_index_document_upload(
+    file: UploadFile = File(...),
+    model_used: str | None = Form(default=None),
+    principal: Principal = Depends(require_auth()),
+):
+    jobs = get_indexing_jobs()
+    try:
+        job = jobs.submit_upload(
+            filename=file.filename or "uploaded_document",
+            fileobj=file.file,
+            mime_type=file.content_type,
+            principal=principal,
+            model_used=model_used,
+        )
+        return IndexingJobResponse(**job)
+    except DocumentServiceError as exc:
+        _raise_document_error(exc)
+
+
+@router.post("/documents/migrate/jobs", response_model=IndexingJobResponse, status_code=202)
+async def enqueue_collection_migration(
+    req: DocumentMigrationRequest,
+    principal: Principal = Depends(require_auth()),
+):
+    jobs = get_indexing_jobs()
+    try:
+        job = jobs.submit_migrate(
+            source_model=req.source_model,
+            target_model=req.target_model,
+            principal=principal,
+            batch_size=req.batch_size or settings.MIGRATION_BATCH_SIZE,
+            max_points_per_second=(
+                settings.MIGRATION_MAX_POINTS_PER_SECOND if req.max_points_per_second is None else req.max_points_per_second
+            ),
+        )
+        return IndexingJobResponse(**job)
+    except DocumentServiceError as exc:
+        _raise_document_error(exc)
+
+
+@router.get("/documents/jobs/{job_id}", response_model=IndexingJobResponse)
+async def get_indexing_job(
+    job_id: str,
+    principal: Principal = Depends(require_auth()),
+):
+    job = get_indexing_jobs().get(job_id, principal)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error": "indexing_job_not_found"})
+    return IndexingJobResponse(**job)
+
+
+@router.post("/documents/jobs/{job_id}/retry", response_model=IndexingJobResponse, status_code=202)
+async def retry_indexing_job(
+    job_id: str,
+    principal: Principal = Depends(require_auth()),
+):
+    try:
+        job = get_indexing_jobs().retry(job_id, principal)
+    except DocumentServiceError as exc:
+        _raise_document_error(exc)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error": "indexing_job_not_found"})
+    return IndexingJobResponse(**job)
+
+
 @router.get("/documents-available", response_model=DocumentsAvailableResponse)
 async def documents_available(
     principal: Principal = Depends(require_auth()),
@@ -123,6 +281,19 @@ async def documents_available(
         _raise_document_error(exc)
 
 
+@router.get("/documents/embedding-models")
+async def embedding_models(
+    principal: Principal = Depends(require_auth()),
+):
+    # Loaded models in this worker with load time, memory and eviction counters.
+    _ = principal
+    stats = get_qdrant_documents().models.stats()
+    workers = get_embedding_workers()
+    if workers is not None:
+        stats["workers"] = workers.stats()
+    return stats
+
+
 @router.get("/documents/{document_uuid}", response_model=IndexedDocument)
 async def get_document(
     document_uuid: str,
@@ -153,6 +324,8 @@ async def query_documents(
             document_uuids=req.document_uuids,
             source_type=req.source_type,
             is_bayleaf=req.is_bayleaf,
+            retrieval_mode=req.retrieval_mode,
+            all_models=req.all_models,
         )
         return DocumentQueryResponse(
             query=result["query"],
@@ -166,7 +339,7 @@ async def query_documents(
 
 
 @router.post("/documents/{document_uuid}/reindex", response_model=IndexedDocument)
-async def reindex_document(
+def reindex_document(
     document_uuid: str,
     req: DocumentReindexRequest = DocumentReindexRequest(),
     principal: Principal = Depends(require_auth()),
@@ -177,7 +350,27 @@ async def reindex_document(
             document_uuid=document_uuid,
             principal=principal,
             model_used=req.model_used,
+            force=req.force,
         )
         return IndexedDocument(**doc)
     except DocumentServiceError as exc:
         _raise_document_error(exc)
+
+
+@router.post("/documents/{document_uuid}/reindex/jobs", response_model=IndexingJobResponse, status_code=202)
+async def enqueue_reindex_document(
+    document_uuid: str,
+    req: DocumentReindexRequest = DocumentReindexRequest(),
+    principal: Principal = Depends(require_auth()),
+):
+    jobs = get_indexing_jobs()
+    try:
+        job = jobs.submit_reindex(
+            document_uuid=document_uuid,
+            principal=principal,
+            model_used=req.model_used,
+            force=req.force,
+        )
+        return IndexingJobResponse(**job)
+    except DocumentServiceError as exc:
+        _raise_document_error(exc)
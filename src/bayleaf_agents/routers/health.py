@@ -1,8 +1,15 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from ..config import settings
+from ..services.factories import get_startup_warmup
 
 router = APIRouter(tags=["health"])
 
 @router.get("/health")
 def health():
     return {"status": "ok", "env": settings.APP_ENV, "provider": settings.LLM_PROVIDER}
+
+@router.get("/ready")
+def ready():
+    snapshot = get_startup_warmup().snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
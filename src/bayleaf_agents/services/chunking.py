@@ -0,0 +1,157 @@
+import math
+import re
+from typing import Callable, List, Optional, Tuple
+
+# Counts tokens for many texts in one call (one tokenizer batch per document).
+TokenCounter = Callable[[List[str]], List[int]]
+
+_HEADING_RE = re.compile(
+    r"^(?:#{1,6}\s+\S.*"  # markdown heading
+    r"|(?:\d+[.)])+(?:\d+)?\s+[^\s.].{0,90}"  # "3.", "3.2)", "4.1.2" numbered section titles
+    r"|[^a-z\n]{3,80})$"  # short all-caps line
+)
+_TABLE_RE = re.compile(r"\|.*\||\t|\S {3,}\S.* {3,}\S")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?;:])\s+(?=[\"'(\[]?[A-ZÀ-Ý0-9])")
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+PARAGRAPH, SENTENCE, ROW, HEADING = "\n\n", " ", "\n", "heading"
+
+
+def approximate_token_counts(texts: List[str]) -> List[int]:
+    # Words plus punctuation: a lower bound for subword tokenizers, used when the model has none.
+    return [len(_APPROX_TOKEN_RE.findall(text)) for text in texts]
+
+
+def _is_heading(line: str) -> bool:
+    if len(line) > 100 or line.endswith((".", ",", ";")):
+        return False
+    return bool(_HEADING_RE.match(line)) and any(ch.isalpha() for ch in line)
+
+
+def _blocks(text: str) -> List[Tuple[str, List[str]]]:
+    # (kind, lines): headings, tables (rows kept verbatim) and paragraphs (lines re-flowed).
+    blocks: List[Tuple[str, List[str]]] = []
+    kind: Optional[str] = None
+    lines: List[str] = []
+
+    def _close() -> None:
+        nonlocal kind, lines
+        if lines:
+            blocks.append((kind or PARAGRAPH, lines))
+        kind, lines = None, []
+
+    for raw in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        line = raw.strip()
+        if not line:
+            _close()
+            continue
+        if _TABLE_RE.search(raw):
+            line_kind = ROW
+        elif _is_heading(line):
+            _close()
+            blocks.append((HEADING, [line]))
+            continue
+        else:
+            line_kind = PARAGRAPH
+        if kind is not None and kind != line_kind:
+            _close()
+        kind = line_kind
+        lines.append(" ".join(raw.split()) if line_kind == PARAGRAPH else raw.rstrip())
+    _close()
+    return blocks
+
+
+class StructuredChunker:
+    """
+    Packs headings, paragraphs, table rows and sentences into chunks of at most
+    ``max_tokens`` model tokens.
+
+    Blocks that fit are never split; larger paragraphs fall back to sentences and
+    larger tables to rows, and only a single oversized sentence or row is cut by
+    words. Chunks start at headings when possible, and consecutive chunks share up
+    to ``overlap_tokens`` of trailing sentences/rows. Tokens are counted per unit,
+    so the whole document is tokenized once.
+    """
+
+    def __init__(self, *, max_tokens: int, overlap_tokens: int = 0, count_tokens: Optional[TokenCounter] = None):
+        self.max_tokens = max(8, int(max_tokens))
+        self.overlap_tokens = max(0, min(int(overlap_tokens), self.max_tokens // 2))
+        self.count_tokens = count_tokens or approximate_token_counts
+
+    def _split_words(self, text: str, tokens: int) -> List[Tuple[str, int]]:
+        words = text.split()
+        parts = max(2, math.ceil(tokens / self.max_tokens))
+        while True:
+            size = max(1, math.ceil(len(words) / parts))
+            pieces = [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+            counts = self.count_tokens(pieces)
+            if max(counts) <= self.max_tokens or size == 1:
+                return list(zip(pieces, counts))
+            parts *= 2
+
+    def _units(self, text: str) -> List[Tuple[str, str, int]]:
+        # (joiner, text, tokens); the joiner says how a unit attaches to the previous one.
+        candidates: List[Tuple[str, str]] = []
+        for kind, lines in _blocks(text):
+            if kind == ROW:
+                candidates.append((PARAGRAPH, "\n".join(lines)))
+            else:
+                candidates.append((kind, " ".join(lines)))
+        counts = self.count_tokens([body for _, body in candidates])
+
+        units: List[Tuple[str, str, int]] = []
+        for (kind, body), tokens in zip(candidates, counts):
+            if tokens <= self.max_tokens:
+                units.append((kind, body, tokens))
+                continue
+            if "\n" in body:
+                pieces, joiner = body.split("\n"), ROW
+            else:
+                pieces, joiner = _SENTENCE_END_RE.split(body), SENTENCE
+            for idx, (piece, piece_tokens) in enumerate(zip(pieces, self.count_tokens(pieces))):
+                parts = [(piece, piece_tokens)] if piece_tokens <= self.max_tokens else self._split_words(piece, piece_tokens)
+                for part_idx, (part, part_tokens) in enumerate(parts):
+                    first = idx == 0 and part_idx == 0
+                    units.append((PARAGRAPH if first else joiner if part_idx == 0 else SENTENCE, part, part_tokens))
+        return units
+
+    def split(self, text: str) -> List[str]:
+        chunks: List[str] = []
+        current: List[Tuple[str, str, int]] = []
+        total = 0
+        fresh = False  # current holds more than overlap carried from the previous chunk
+
+        def _flush(keep_overlap: bool) -> None:
+            nonlocal current, total, fresh
+            if fresh:
+                parts = [current[0][1]]
+                for joiner, body, _ in current[1:]:
+                    parts.append(("\n\n" if joiner == HEADING else joiner) + body)
+                chunks.append("".join(parts))
+            carried: List[Tuple[str, str, int]] = []
+            carried_tokens = 0
+            if keep_overlap and self.overlap_tokens:
+                for unit in reversed(current):
+                    if unit[0] == HEADING or carried_tokens + unit[2] > self.overlap_tokens:
+                        break
+                    carried.insert(0, unit)
+                    carried_tokens += unit[2]
+            current, total, fresh = carried, carried_tokens, False
+
+        for unit in self._units(text):
+            joiner, _, tokens = unit
+            if joiner == HEADING:
+                if fresh and current[-1][0] != HEADING:
+                    _flush(keep_overlap=False)
+                elif not fresh:
+                    # A new section does not need the previous section's tail.
+                    current, total = [], 0
+            if total + tokens > self.max_tokens:
+                _flush(keep_overlap=True)
+                if total + tokens > self.max_tokens:
+                    current, total = [], 0
+            current.append(unit)
+            total += tokens
+            fresh = True
+        _flush(keep_overlap=False)
+        return chunks
@@ -0,0 +1,163 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..models import DocumentCatalogEntry
+
+_PAYLOAD_FIELDS = (
+    "name",
+    "description",
+    "mime_type",
+    "source_type",
+    "bayleaf_document_uuid",
+    "status",
+    "indexed_at",
+    "content_sha256",
+    "chunking",
+)
+
+# model_used of the row rebuild() writes once the table holds every indexed document;
+# never an allowed model, so it is not listed.
+BACKFILL_MARKER = "__catalog_backfilled__"
+
+
+class DocumentCatalog:
+    """
+    Postgres summary of what is indexed in Qdrant: one row per (document, model).
+
+    QdrantDocumentsService writes a row after every successful index, so listing
+    documents reads one row per document instead of scrolling every chunk. Qdrant
+    remains the source of truth. A failed catalog write is logged and does not fail
+    the indexing call, and ``rebuild`` resyncs the table from the collections.
+
+    The table is only read once it is known to be complete (``mark_ready``, after
+    the startup backfill); until then callers keep scrolling Qdrant.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self.log = structlog.get_logger("document_catalog")
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self) -> None:
+        self._ready.set()
+
+    @staticmethod
+    def _summary(entry: DocumentCatalogEntry) -> Dict[str, Any]:
+        return {
+            "uuid": entry.document_uuid,
+            "name": entry.name,
+            "description": entry.description,
+            "status": entry.status,
+            "is_bayleaf": bool(entry.is_bayleaf),
+            "source_type": entry.source_type,
+            "indexed_at": entry.indexed_at,
+            "chunks": entry.chunk_count or 0,
+            "model_used": entry.model_used,
+        }
+
+    def _apply(self, db: Session, payload: Dict[str, Any]) -> None:
+        key = (str(payload["document_uuid"]), str(payload["model_used"]))
+        entry = db.get(DocumentCatalogEntry, key)
+        if entry is None:
+            entry = DocumentCatalogEntry(document_uuid=key[0], model_used=key[1])
+            db.add(entry)
+        for field in _PAYLOAD_FIELDS:
+            setattr(entry, field, payload.get(field))
+        entry.is_bayleaf = bool(payload.get("is_bayleaf"))
+        entry.chunk_count = int(payload.get("chunk_count") or 0)
+
+    def upsert(self, payload: Dict[str, Any]) -> None:
+        # payload is the document-level Qdrant payload (see QdrantDocumentsService._document_payload).
+        for attempt in range(2):
+            db = self.session_factory()
+            try:
+                self._apply(db, payload)
+                db.commit()
+                return
+            except IntegrityError:
+                # Another worker inserted the same key between our read and write.
+                db.rollback()
+                if attempt:
+                    raise
+            finally:
+                db.close()
+
+    def safe_upsert(self, payload: Dict[str, Any]) -> None:
+        try:
+            self.upsert(payload)
+        except SQLAlchemyError as exc:
+            self.log.warning(
+                "document_catalog_write_failed",
+                document_uuid=payload.get("document_uuid"),
+                model_used=payload.get("model_used"),
+                error=str(exc),
+            )
+
+    def list_latest(self, models: Iterable[str]) -> List[Dict[str, Any]]:
+        # Newest entry per document across the given models, newest documents first.
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(DocumentCatalogEntry)
+                .where(DocumentCatalogEntry.model_used.in_(list(models)))
+                .order_by(DocumentCatalogEntry.indexed_at.desc())
+            ).scalars().all()
+            latest: Dict[str, Dict[str, Any]] = {}
+            for row in rows:
+                latest.setdefault(row.document_uuid, self._summary(row))
+            return list(latest.values())
+        finally:
+            db.close()
+
+    def get_latest(self, document_uuid: str, models: Iterable[str]) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            row = db.execute(
+                select(DocumentCatalogEntry)
+                .where(
+                    DocumentCatalogEntry.document_uuid == document_uuid,
+                    DocumentCatalogEntry.model_used.in_(list(models)),
+                )
+                .order_by(DocumentCatalogEntry.indexed_at.desc())
+                .limit(1)
+            ).scalars().first()
+            return self._summary(row) if row is not None else None
+        finally:
+            db.close()
+
+    def is_backfilled(self) -> bool:
+        # Rows written by indexing before the first rebuild do not make the table complete.
+        db = self.session_factory()
+        try:
+            return db.get(DocumentCatalogEntry, ("", BACKFILL_MARKER)) is not None
+        finally:
+            db.close()
+
+    def rebuild(self, payloads: Iterable[Dict[str, Any]], models: Iterable[str]) -> int:
+        # Replace the rows for the given models with one entry per payload.
+        db = self.session_factory()
+        try:
+            db.query(DocumentCatalogEntry).filter(
+                DocumentCatalogEntry.model_used.in_(list(models))
+            ).delete(synchronize_session=False)
+            count = 0
+            for payload in payloads:
+                self._apply(db, payload)
+                db.flush()
+                count += 1
+            if db.get(DocumentCatalogEntry, ("", BACKFILL_MARKER)) is None:
+                db.add(DocumentCatalogEntry(document_uuid="", model_used=BACKFILL_MARKER, is_bayleaf=False, chunk_count=0))
+            db.commit()
+            self.mark_ready()
+            return count
+        finally:
+            db.close()
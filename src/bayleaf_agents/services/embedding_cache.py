@@ -0,0 +1,261 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _ModelStore:
+    """
+    One model's slice of the cache: a fixed-capacity float32 memmap of vectors,
+    a parallel memmap holding the key that owns each slot, and a SQLite index
+    mapping key -> slot with last-use timestamps for LRU eviction.
+    """
+
+    def __init__(self, directory: str, capacity: int):
+        self.directory = directory
+        self.capacity = capacity
+        self.dim: Optional[int] = None
+        self.vectors: Optional[np.memmap] = None
+        self.owners: Optional[np.memmap] = None
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_used ON entries (last_used)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._sync_dim()
+
+    def _sync_dim(self) -> None:
+        # Another worker may have created the store after this one opened it.
+        if self.vectors is not None:
+            return
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        if row:
+            self._open(int(row[0]))
+
+    def _known_slots(self, keys: List[str]) -> Dict[str, int]:
+        slots: Dict[str, int] = {}
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            marks = ",".join("?" for _ in part)
+            rows = self.db.execute(f"SELECT key, slot FROM entries WHERE key IN ({marks})", part).fetchall()
+            slots.update({key: int(slot) for key, slot in rows})
+        return slots
+
+    def _open(self, dim: int) -> None:
+        vectors_path = os.path.join(self.directory, "vectors.f32")
+        owners_path = os.path.join(self.directory, "owners.bin")
+        mode = "r+" if os.path.exists(vectors_path) and os.path.exists(owners_path) else "w+"
+        self.vectors = np.memmap(vectors_path, dtype=np.float32, mode=mode, shape=(self.capacity, dim))
+        self.owners = np.memmap(owners_path, dtype=np.uint8, mode=mode, shape=(self.capacity, 32))
+        self.dim = dim
+
+    def _reset(self, dim: int) -> None:
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.execute("DELETE FROM entries")
+            self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dim', ?)", (str(dim),))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        for name in ("vectors.f32", "owners.bin"):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+        self._open(dim)
+
+    def get_many(self, keys: List[str]) -> Dict[int, np.ndarray]:
+        if not keys:
+            return {}
+        with self.lock:
+            self._sync_dim()
+            if self.vectors is None or self.owners is None:
+                return {}
+            found: Dict[int, np.ndarray] = {}
+            slots = self._known_slots(list(dict.fromkeys(keys)))
+            hits: List[str] = []
+            for position, key in enumerate(keys):
+                slot = slots.get(key)
+                if slot is None:
+                    continue
+                vector = np.array(self.vectors[slot], dtype=np.float32)
+                # Another process may have evicted and rewritten the slot since the index lookup.
+                if self.owners[slot].tobytes() != bytes.fromhex(key):
+                    continue
+                found[position] = vector
+                hits.append(key)
+            if hits:
+                now = time.time()
+                self.db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in set(hits)],
+                )
+            return found
+
+    def put_many(self, keys: List[str], matrix: np.ndarray) -> None:
+        if not keys:
+            return
+        with self.lock:
+            self._sync_dim()
+            if self.dim != matrix.shape[1]:
+                self._reset(int(matrix.shape[1]))
+            pending = dict(zip(keys, matrix))
+            if len(pending) > self.capacity:
+                pending = dict(list(pending.items())[-self.capacity:])
+            now = time.time()
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                known = set(self._known_slots(list(pending)))
+                fresh = [key for key in pending if key not in known]
+                # Slots are handed out sequentially and evicted slots are reused in the same
+                # transaction, so occupied slots are always exactly 0..used-1.
+                used = int(self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+                slots = list(range(used, min(self.capacity, used + len(fresh))))
+                evict = len(fresh) - len(slots)
+                if evict > 0:
+                    victims = self.db.execute(
+                        "SELECT key, slot FROM entries ORDER BY last_used ASC LIMIT ?",
+                        (evict,),
+                    ).fetchall()
+                    self.db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+                    slots.extend(int(slot) for _, slot in victims)
+                for key, slot in zip(fresh, slots):
+                    self.owners[slot] = 0
+                    self.vectors[slot] = pending[key]
+                    self.owners[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+                self.vectors.flush()
+                self.owners.flush()
+                self.db.executemany(
+                    "INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                    [(key, slot, now) for key, slot in zip(fresh, slots)],
+                )
+                if known:
+                    self.db.executemany(
+                        "UPDATE entries SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in known],
+                    )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by (model, sha256(text)).
+
+    Vectors live in a memory-mapped float32 file per model, so lookups are
+    page-cache reads and the cache survives restarts and is shared by every
+    worker on the host. Each model keeps at most ``max_entries`` vectors and
+    evicts the least recently used ones when full.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 200_000):
+        self.directory = directory
+        self.max_entries = max(1, int(max_entries))
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = threading.Lock()
+        self.log = structlog.get_logger("embedding_cache")
+
+    def _store(self, model_used: str) -> _ModelStore:
+        store = self._stores.get(model_used)
+        if store is not None:
+            return store
+        with self._lock:
+            store = self._stores.get(model_used)
+            if store is None:
+                safe_model = re.sub(r"[^a-z0-9]+", "-", model_used.lower()).strip("-")[:32] or "model"
+                suffix = hashlib.sha1(model_used.encode("utf-8")).hexdigest()[:8]
+                store = _ModelStore(os.path.join(self.directory, f"{safe_model}_{suffix}"), self.max_entries)
+                self._stores[model_used] = store
+        return store
+
+    def get_many(self, model_used: str, keys: List[str]) -> Dict[int, np.ndarray]:
+        try:
+            return self._store(model_used).get_many(keys)
+        except (OSError, sqlite3.Error, ValueError) as exc:
+            self.log.warning("embedding_cache_read_failed", model_used=model_used, error=str(exc))
+            return {}
+
+    def put_many(self, model_used: str, keys: List[str], matrix: np.ndarray) -> None:
+        try:
+            self._store(model_used).put_many(keys, np.asarray(matrix, dtype=np.float32))
+        except (OSError, sqlite3.Error, ValueError) as exc:
+            self.log.warning("embedding_cache_write_failed", model_used=model_used, error=str(exc))
+
+
+class QueryEmbeddingLRU:
+    """
+    In-process LRU with TTL for query vectors, keyed by (model, normalized query).
+
+    Queries are only whitespace-normalized: the embedding models are cased, so
+    folding case would change the vector.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[float, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.split())
+
+    def get(self, model_used: str, query: str) -> Optional[List[float]]:
+        key = (model_used, self.normalize(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, model_used: str, query: str, vector: List[float]) -> None:
+        if not self.max_entries:
+            return
+        key = (model_used, self.normalize(query))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), tuple(vector))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
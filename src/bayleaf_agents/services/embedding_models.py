@@ -0,0 +1,338 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+
+class ModelLoadError(Exception):
+    def __init__(self, code: str, detail: str):
+        self.code = code
+        self.detail = detail
+        super().__init__(f"{code}: {detail}")
+
+
+def load_sentence_transformer(model_name: str) -> Any:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except Exception as exc:
+        raise ModelLoadError(
+            "embedding_dependency_missing",
+            "Install sentence-transformers to use local embedding models.",
+        ) from exc
+    try:
+        return SentenceTransformer(model_name)
+    except Exception as exc:
+        raise ModelLoadError("embedding_model_load_failed", str(exc)) from exc
+
+
+def split_model_spec(spec: str) -> Tuple[str, str]:
+    # "intfloat/multilingual-e5-base@onnx-int8" -> (model name, backend); no suffix means torch.
+    name, sep, backend = spec.strip().rpartition("@")
+    if not sep:
+        return spec.strip(), "torch"
+    return name.strip(), backend.strip().lower() or "torch"
+
+
+def parse_embedding_models(spec: str) -> Tuple[List[str], Dict[str, str]]:
+    # EMBEDDING_MODELS -> (plain model names, {name: full spec}). The backend only
+    # changes how a model is run, so collections and payloads keep the plain name.
+    names: List[str] = []
+    specs: Dict[str, str] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _ = split_model_spec(item)
+        if name not in specs:
+            names.append(name)
+        specs[name] = item.strip()
+    return names, specs
+
+
+def load_embedding_model(spec: str, *, onnx_dir: str = "", threads: int = 0) -> Any:
+    name, backend = split_model_spec(spec)
+    if backend == "torch":
+        return load_sentence_transformer(name)
+    from .onnx_embedder import ONNX_BACKENDS, OnnxEmbedder, onnx_model_dir
+
+    if backend not in ONNX_BACKENDS:
+        raise ModelLoadError("embedding_backend_unknown", f"unknown embedding backend {backend!r} in {spec!r}")
+    return OnnxEmbedder.load(onnx_model_dir(onnx_dir, name), quantized=backend == "onnx-int8", threads=threads)
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _model_bytes(model: Any) -> Optional[int]:
+    # Parameters + buffers of a torch module; None for anything else.
+    total = 0
+    try:
+        for tensor in list(model.parameters()) + list(model.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    except Exception:
+        return None
+    return total
+
+
+def parse_model_threads(spec: str) -> Dict[str, int]:
+    # "BAAI/bge-m3=4,intfloat/multilingual-e5-base=2" -> {model: threads}
+    out: Dict[str, int] = {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().rpartition("=")
+        if sep and name.strip() and value.strip().isdigit():
+            out[name.strip()] = int(value)
+    return out
+
+
+class _Entry:
+    __slots__ = ("model", "bytes", "load_seconds", "loaded_at", "last_used", "in_use", "uses")
+
+    def __init__(self, model: Any, size: int, load_seconds: float):
+        self.model = model
+        self.bytes = size
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.uses = 0
+
+
+class EmbeddingModelRegistry:
+    """
+    Process-wide owner of the loaded embedding models.
+
+    Concurrent first requests for a model share one load (a per-model lock), and
+    the sum of loaded model sizes is kept under ``memory_budget_mb`` by evicting
+    the least recently used models that no request is currently encoding with.
+    A model's size is its parameter and buffer bytes, falling back to the RSS
+    growth measured around its load. Torch intra-op threads default to
+    ``torch_threads`` and can be overridden per model (``model_threads``).
+    ``torch.set_num_threads`` is process-global, so an encode with an override
+    runs alone: other encodes wait for it and it waits for them.
+    """
+
+    def __init__(
+        self,
+        *,
+        memory_budget_mb: float = 0.0,
+        torch_threads: int = 0,
+        model_threads: Optional[Dict[str, int]] = None,
+        model_specs: Optional[Dict[str, str]] = None,
+        loader: Optional[Callable[[str], Any]] = None,
+    ):
+        self.memory_budget = int(max(0.0, float(memory_budget_mb)) * 1024 * 1024)
+        self.torch_threads = max(0, int(torch_threads))
+        self.model_threads = dict(model_threads or {})
+        # The loader receives the full spec ("name@backend"); everything else uses the plain name.
+        self.model_specs = dict(model_specs or {})
+        self.loader = loader or load_embedding_model
+        self.log = structlog.get_logger("embedding_models")
+        self._entries: Dict[str, _Entry] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._known_bytes: Dict[str, int] = {}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._threads_applied = False
+        self._encode_gate = threading.Condition()
+        self._shared_encodes = 0
+        self._override_waiting = 0
+        self._override_running = False
+
+    def _metric(self, name: str) -> Dict[str, Any]:
+        return self._metrics.setdefault(name, {"loads": 0, "evictions": 0, "hits": 0, "load_seconds_total": 0.0})
+
+    def _set_threads(self, threads: int) -> Optional[int]:
+        # Returns the previous thread count when it changed, so callers can restore it.
+        if threads <= 0:
+            return None
+        try:
+            import torch
+        except Exception:
+            return None
+        previous = torch.get_num_threads()
+        if previous == threads:
+            return None
+        torch.set_num_threads(threads)
+        return previous
+
+    def _apply_process_threads(self) -> None:
+        if self._threads_applied:
+            return
+        self._threads_applied = True
+        self._set_threads(self.torch_threads)
+
+    @contextmanager
+    def _thread_scope(self, name: str) -> Iterator[None]:
+        if not self.model_threads:
+            yield
+            return
+        threads = self.model_threads.get(name, 0)
+        with self._encode_gate:
+            if threads > 0:
+                self._override_waiting += 1
+                self._encode_gate.wait_for(lambda: not self._override_running and self._shared_encodes == 0)
+                self._override_waiting -= 1
+                self._override_running = True
+            else:
+                # Waiting overrides go first so a steady stream of encodes cannot starve them.
+                self._encode_gate.wait_for(lambda: not self._override_running and self._override_waiting == 0)
+                self._shared_encodes += 1
+        previous_threads = self._set_threads(threads)
+        try:
+            yield
+        finally:
+            if previous_threads is not None:
+                self._set_threads(previous_threads)
+            with self._encode_gate:
+                if threads > 0:
+                    self._override_running = False
+                else:
+                    self._shared_encodes -= 1
+                self._encode_gate.notify_all()
+
+    def _evict_for(self, incoming: int, keep: str) -> None:
+        # Caller holds self._lock.
+        if not self.memory_budget:
+            return
+        used = sum(entry.bytes for entry in self._entries.values())
+        idle = sorted(
+            (entry.last_used, name)
+            for name, entry in self._entries.items()
+            if name != keep and entry.in_use == 0
+        )
+        for _, name in idle:
+            if used + incoming <= self.memory_budget:
+                break
+            entry = self._entries.pop(name)
+            used -= entry.bytes
+            self._metric(name)["evictions"] += 1
+            self.log.info("embedding_model_evicted", model=name, freed_mb=round(entry.bytes / 2**20, 1))
+        if used + incoming > self.memory_budget:
+            self.log.warning(
+                "embedding_model_budget_exceeded",
+                model=keep,
+                used_mb=round((used + incoming) / 2**20, 1),
+                budget_mb=round(self.memory_budget / 2**20, 1),
+            )
+
+    def _touch(self, name: str, pin: bool) -> Optional[Any]:
+        # Caller holds self._lock.
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        entry.last_used = time.monotonic()
+        entry.in_use += int(pin)
+        entry.uses += 1
+        self._metric(name)["hits"] += 1
+        return entry.model
+
+    def _acquire(self, name: str, pin: bool) -> Any:
+        with self._lock:
+            model = self._touch(name, pin)
+            if model is not None:
+                return model
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                # Loaded by the request we waited on.
+                model = self._touch(name, pin)
+                if model is not None:
+                    return model
+                # Make room up front when this model's size is known from an earlier load.
+                self._evict_for(self._known_bytes.get(name, 0), keep=name)
+            self._apply_process_threads()
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            model = self.loader(self.model_specs.get(name, name))
+            load_seconds = time.perf_counter() - started
+            rss_after = _rss_bytes()
+            size = _model_bytes(model)
+            if size is None:
+                size = max(0, (rss_after or 0) - (rss_before or 0))
+            with self._lock:
+                self._known_bytes[name] = size
+                self._evict_for(size, keep=name)
+                entry = _Entry(model, size, load_seconds)
+                entry.in_use = int(pin)
+                entry.uses = 1
+                self._entries[name] = entry
+                metric = self._metric(name)
+                metric["loads"] += 1
+                metric["load_seconds_total"] += load_seconds
+            self.log.info(
+                "embedding_model_loaded",
+                model=name,
+                load_seconds=round(load_seconds, 2),
+                memory_mb=round(size / 2**20, 1),
+            )
+            return model
+
+    def get(self, name: str) -> Any:
+        return self._acquire(name, pin=False)
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        # Pins the model for the duration of an encode so it cannot be evicted mid-use.
+        model = self._acquire(name, pin=True)
+        try:
+            with self._thread_scope(name):
+                yield model
+        finally:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None and entry.model is model:
+                    entry.in_use = max(0, entry.in_use - 1)
+                    entry.last_used = time.monotonic()
+
+    def put(self, name: str, model: Any) -> None:
+        # Registers an already constructed model (tests, custom backends).
+        with self._lock:
+            self._entries[name] = _Entry(model, _model_bytes(model) or 0, 0.0)
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.in_use:
+                return False
+            del self._entries[name]
+            self._metric(name)["evictions"] += 1
+            return True
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models: Dict[str, Any] = {}
+            for name in set(self._entries) | set(self._metrics):
+                entry = self._entries.get(name)
+                metric = dict(self._metric(name))
+                metric["load_seconds_total"] = round(metric["load_seconds_total"], 3)
+                metric["loaded"] = entry is not None
+                if entry is not None:
+                    metric.update(
+                        {
+                            "memory_mb": round(entry.bytes / 2**20, 1),
+                            "last_load_seconds": round(entry.load_seconds, 3),
+                            "idle_seconds": round(time.monotonic() - entry.last_used, 1),
+                            "in_use": entry.in_use,
+                            "uses": entry.uses,
+                            "backend": split_model_spec(self.model_specs.get(name, name))[1],
+                            "torch_threads": self.model_threads.get(name, self.torch_threads) or None,
+                        }
+                    )
+                models[name] = metric
+            return {
+                "memory_budget_mb": round(self.memory_budget / 2**20, 1) or None,
+                "memory_used_mb": round(sum(e.bytes for e in self._entries.values()) / 2**20, 1),
+                "models": models,
+            }
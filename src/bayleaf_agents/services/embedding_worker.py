@@ -0,0 +1,383 @@
+import importlib
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .embedding_models import EmbeddingModelRegistry, ModelLoadError, split_model_spec
+
+# Loader used inside worker processes, as "module:function" so it survives spawn.
+DEFAULT_LOADER = "bayleaf_agents.services.embedding_models:load_embedding_model"
+
+
+class EmbeddingWorkerError(Exception):
+    pass
+
+
+def _resolve_loader(path: str) -> Callable[[str], Any]:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _drain(requests_q: Any, first: Tuple, max_batch: int, max_wait: float) -> Tuple[List[Tuple], bool]:
+    # Collects whatever else arrives within max_wait of the first request, up to max_batch texts.
+    batch = [first]
+    rows = len(first[3]) if first[0] == "encode" else 0
+    deadline = time.monotonic() + max_wait
+    while rows < max_batch:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = requests_q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if item is None:
+            return batch, True
+        batch.append(item)
+        if item[0] == "encode":
+            rows += len(item[3])
+    return batch, False
+
+
+def _worker_main(
+    requests_q: Any,
+    responses_q: Any,
+    claims_q: Any,
+    loader_path: str,
+    loader_kwargs: Dict[str, Any],
+    max_batch: int,
+    max_wait_ms: float,
+    torch_threads: int,
+    memory_budget_mb: float = 0.0,
+    model_threads: Optional[Dict[str, int]] = None,
+) -> None:
+    # Same registry as the in-process path: the memory budget and thread overrides apply per worker.
+    registry = EmbeddingModelRegistry(
+        memory_budget_mb=memory_budget_mb,
+        torch_threads=torch_threads,
+        model_threads=model_threads,
+        loader=partial(_resolve_loader(loader_path), **loader_kwargs),
+    )
+
+    def _name(spec: str) -> str:
+        # Requests carry the full "name@backend" spec; the registry keys models by plain name.
+        name = split_model_spec(spec)[0]
+        registry.model_specs[name] = spec
+        return name
+
+    stop = False
+    while not stop:
+        first = requests_q.get()
+        if first is None:
+            break
+        batch, stop = _drain(requests_q, first, max_batch, max_wait_ms / 1000.0)
+        # Lets the pool fail these requests right away if this worker dies before answering.
+        # A SimpleQueue writes synchronously, so the claim is out even if the process is killed.
+        claims_q.put((os.getpid(), [item[1] for item in batch]))
+
+        groups: Dict[Tuple[str, bool], List[Tuple]] = {}
+        for item in batch:
+            if item[0] == "load":
+                _, request_id, name = item
+                try:
+                    with registry.use(_name(name)) as model:
+                        probe = np.asarray(model.encode(["dim probe"]), dtype=np.float32)
+                    info = {"dim": int(probe.shape[-1]), "max_seq_length": getattr(model, "max_seq_length", None)}
+                    responses_q.put(("info", request_id, info))
+                except ModelLoadError as exc:
+                    responses_q.put(("error", [request_id], exc.code, exc.detail))
+                except Exception as exc:
+                    responses_q.put(("error", [request_id], "embedding_model_load_failed", str(exc)))
+                continue
+            groups.setdefault((item[2], item[4]), []).append(item)
+
+        for (name, normalize), items in groups.items():
+            request_ids = [item[1] for item in items]
+            texts = [text for item in items for text in item[3]]
+            try:
+                with registry.use(_name(name)) as model:
+                    vectors = model.encode(
+                        texts,
+                        batch_size=max(1, min(len(texts), max_batch)),
+                        normalize_embeddings=normalize,
+                        convert_to_numpy=True,
+                        show_progress_bar=False,
+                    )
+                matrix = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+            except ModelLoadError as exc:
+                responses_q.put(("error", request_ids, exc.code, exc.detail))
+                continue
+            except Exception as exc:
+                responses_q.put(("error", request_ids, "embedding_failed", str(exc)))
+                continue
+            # Vectors travel through shared memory; only the layout goes through the queue.
+            # The API process copies its rows out and unlinks the segment.
+            shm = shared_memory.SharedMemory(create=True, size=max(1, matrix.nbytes))
+            np.ndarray(matrix.shape, dtype=np.float32, buffer=shm.buf)[:] = matrix
+            layout, offset = [], 0
+            for item in items:
+                layout.append((item[1], offset, len(item[3])))
+                offset += len(item[3])
+            responses_q.put(("vectors", shm.name, matrix.shape[1], layout))
+            shm.close()
+
+
+class WorkerEmbedder:
+    """
+    Stand-in for a SentenceTransformer whose ``encode`` runs in the worker pool.
+
+    The tokenizer is loaded in-process (it is small and needs no torch) so
+    token-aware chunking keeps counting with the model's own tokenizer.
+    """
+
+    def __init__(self, pool: "EmbeddingWorkerPool", model_name: str, info: Dict[str, Any]):
+        self.pool = pool
+        self.model_name = model_name
+        self.dim = info.get("dim")
+        self.max_seq_length = info.get("max_seq_length")
+        self._tokenizer: Any = None
+        self._tokenizer_loaded = False
+
+    @property
+    def tokenizer(self) -> Any:
+        if not self._tokenizer_loaded:
+            self._tokenizer_loaded = True
+            try:
+                from transformers import AutoTokenizer
+
+                self._tokenizer = AutoTokenizer.from_pretrained(split_model_spec(self.model_name)[0])
+            except Exception:
+                self._tokenizer = None
+        return self._tokenizer
+
+    def encode(self, sentences: Any, normalize_embeddings: bool = False, **kwargs: Any) -> np.ndarray:
+        _ = kwargs
+        single = isinstance(sentences, str)
+        matrix = self.pool.encode(self.model_name, [sentences] if single else list(sentences), normalize_embeddings)
+        return matrix[0] if single else matrix
+
+
+class EmbeddingWorkerPool:
+    """
+    Encodes in dedicated worker processes instead of API request threads.
+
+    Requests from all threads go to one queue shared by the workers. A worker
+    takes a request, waits up to ``max_wait_ms`` for more (up to ``max_batch``
+    texts), and encodes each model's share as a single batch, so concurrent
+    single-query embeds are amortized into one forward pass. Result matrices are
+    handed back through shared memory; a dispatcher thread copies each caller's
+    rows out and resolves its future. Model weights live only in the workers,
+    each of which keeps its models under ``memory_budget_mb``. Workers are
+    spawned on first use and restarted if they die; requests a dead worker had
+    taken fail immediately instead of waiting for ``timeout``.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 1,
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0,
+        timeout: float = 120.0,
+        torch_threads: int = 0,
+        memory_budget_mb: float = 0.0,
+        model_threads: Optional[Dict[str, int]] = None,
+        loader: str = DEFAULT_LOADER,
+        loader_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.workers = max(1, int(workers))
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.timeout = max(0.1, float(timeout))
+        self.torch_threads = max(0, int(torch_threads))
+        self.memory_budget_mb = max(0.0, float(memory_budget_mb))
+        self.model_threads = dict(model_threads or {})
+        self.loader = loader
+        self.loader_kwargs = dict(loader_kwargs or {})
+        self.log = structlog.get_logger("embedding_worker")
+        self._ctx = mp.get_context("spawn")
+        self._requests: Any = None
+        self._responses: Any = None
+        self._claims: Any = None
+        self._processes: List[Any] = []
+        self._futures: Dict[int, Future] = {}
+        self._claimed: Dict[int, set] = {}  # worker pid -> request ids it is working on
+        self._last_check = 0.0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._dispatcher: Optional[threading.Thread] = None
+        self._stats = {"requests": 0, "texts": 0, "batches": 0, "max_batch_requests": 0, "restarts": 0}
+
+    def _spawn(self) -> Any:
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                self._requests,
+                self._responses,
+                self._claims,
+                self.loader,
+                self.loader_kwargs,
+                self.max_batch,
+                self.max_wait_ms,
+                self.torch_threads,
+                self.memory_budget_mb,
+                self.model_threads,
+            ),
+            name="embedding-worker",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def start(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise EmbeddingWorkerError("embedding worker pool is shut down")
+            if self._started:
+                return
+            self._requests = self._ctx.Queue()
+            self._responses = self._ctx.Queue()
+            self._claims = self._ctx.SimpleQueue()
+            self._processes = [self._spawn() for _ in range(self.workers)]
+            self._dispatcher = threading.Thread(target=self._dispatch, name="embedding-dispatch", daemon=True)
+            self._dispatcher.start()
+            self._started = True
+        self.log.info("embedding_workers_started", workers=self.workers, max_batch=self.max_batch, max_wait_ms=self.max_wait_ms)
+
+    def _read_claims(self) -> None:
+        while not self._claims.empty():
+            pid, request_ids = self._claims.get()
+            if any(process.pid == pid for process in self._processes):
+                self._claimed.setdefault(pid, set()).update(request_ids)
+            else:
+                # The worker died and was replaced before its claim was read.
+                for request_id in request_ids:
+                    self._resolve(request_id, error=EmbeddingWorkerError("embedding worker exited"))
+
+    def _check_workers(self) -> None:
+        self._last_check = time.monotonic()
+        self._read_claims()
+        for idx, process in enumerate(self._processes):
+            if not process.is_alive() and not self._closed:
+                lost = self._claimed.pop(process.pid, set())
+                self.log.warning("embedding_worker_died", exitcode=process.exitcode, failed_requests=len(lost))
+                self._processes[idx] = self._spawn()
+                self._stats["restarts"] += 1
+                for request_id in lost:
+                    self._resolve(
+                        request_id,
+                        error=EmbeddingWorkerError(f"embedding worker exited with code {process.exitcode}"),
+                    )
+
+    def _resolve(self, request_id: int, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            future = self._futures.pop(request_id, None)
+        for claimed in self._claimed.values():
+            claimed.discard(request_id)
+        if future is None:
+            return  # caller timed out
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _dispatch(self) -> None:
+        while not self._closed:
+            # Checked on a clock, not only when idle, so a busy pool still notices a dead worker.
+            if time.monotonic() - self._last_check >= 1.0:
+                self._check_workers()
+            try:
+                message = self._responses.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            self._read_claims()
+            kind = message[0]
+            if kind == "vectors":
+                _, shm_name, dim, layout = message
+                shm = shared_memory.SharedMemory(name=shm_name)
+                try:
+                    rows = sum(count for _, _, count in layout)
+                    matrix = np.ndarray((rows, dim), dtype=np.float32, buffer=shm.buf)
+                    results = [(request_id, matrix[offset:offset + count].copy()) for request_id, offset, count in layout]
+                    del matrix
+                finally:
+                    shm.close()
+                    shm.unlink()
+                with self._lock:
+                    self._stats["batches"] += 1
+                    self._stats["max_batch_requests"] = max(self._stats["max_batch_requests"], len(layout))
+                for request_id, vectors in results:
+                    self._resolve(request_id, vectors)
+            elif kind == "info":
+                self._resolve(message[1], message[2])
+            elif kind == "error":
+                _, request_ids, code, detail = message
+                for request_id in request_ids:
+                    self._resolve(request_id, error=ModelLoadError(code, detail))
+
+    def _submit(self, build: Callable[[int], Tuple]) -> Any:
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._futures[request_id] = future
+        self._requests.put(build(request_id))
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError as exc:
+            with self._lock:
+                self._futures.pop(request_id, None)
+            raise EmbeddingWorkerError(f"embedding worker did not answer within {self.timeout}s") from exc
+
+    def encode(self, model_name: str, texts: List[str], normalize: bool = True) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["texts"] += len(texts)
+        return self._submit(lambda request_id: ("encode", request_id, model_name, list(texts), bool(normalize)))
+
+    def embedder(self, model_name: str) -> WorkerEmbedder:
+        # Registry loader: loads the model in a worker and returns a proxy for it.
+        info = self._submit(lambda request_id: ("load", request_id, model_name))
+        return WorkerEmbedder(self, model_name, info)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["pending"] = len(self._futures)
+        out["workers"] = self.workers
+        out["alive"] = sum(1 for process in self._processes if process.is_alive())
+        out["avg_batch_requests"] = round(out["requests"] / out["batches"], 2) if out["batches"] else None
+        return out
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            if not self._started or self._closed:
+                self._closed = True
+                return
+            self._closed = True
+        for _ in self._processes:
+            self._requests.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        with self._lock:
+            pending, self._futures = list(self._futures.values()), {}
+        for future in pending:
+            future.set_exception(EmbeddingWorkerError("embedding worker pool shut down"))
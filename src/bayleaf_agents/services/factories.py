@@ -1,10 +1,30 @@
+import time
+from functools import partial
+
 from ..config import settings
+from ..db import SessionLocal
 from ..llm.base import LLMProvider
 from ..llm.mock import MockProvider
 from ..tools.bayleaf import BayleafClient
 from ..tools.documents import DocumentsToolset
+from ..services.document_catalog import DocumentCatalog
+from ..services.embedding_cache import EmbeddingCache, QueryEmbeddingLRU
+from ..services.embedding_models import (
+    EmbeddingModelRegistry,
+    load_embedding_model,
+    parse_embedding_models,
+    parse_model_threads,
+    split_model_spec,
+)
+from ..services.embedding_worker import EmbeddingWorkerPool
+from ..services.indexing_jobs import IndexingJobRunner
+from ..services.pdf_extraction import PdfTextExtractor
 from ..services.phi_filter import PHIFilterClient
 from ..services.qdrant_documents import QdrantDocumentsService
+from ..services.qdrant_transport import QdrantTransport
+from ..services.reranker import CrossEncoderReranker
+from ..services.vector_store import LocalVectorStore
+from ..services.warmup import StartupWarmup
 
 try:
     from ..llm.openai_provider import OpenAIProvider  # optional
@@ -16,7 +36,11 @@ _bayleaf: BayleafClient | None = None
 _phi_filter: PHIFilterClient | None = None
 _qdrant_documents: QdrantDocumentsService | None = None
 _documents_tools: DocumentsToolset | None = None
+_indexing_jobs: IndexingJobRunner | None = None
 _decider_provider: LLMProvider | None = None
+_reranker: CrossEncoderReranker | None = None
+_startup_warmup: StartupWarmup | None = None
+_embedding_workers: EmbeddingWorkerPool | None = None
 
 
 def get_provider() -> LLMProvider:
@@ -43,13 +67,65 @@ def get_phi_filter() -> PHIFilterClient:
     return _phi_filter
 
 
+def embedding_loader_kwargs() -> dict:
+    # ONNX Runtime sessions get the same intra-op thread count as torch.
+    return {"onnx_dir": settings.ONNX_MODEL_DIR.strip(), "threads": settings.EMBEDDING_TORCH_THREADS}
+
+
+def get_embedding_workers() -> EmbeddingWorkerPool | None:
+    global _embedding_workers
+    if _embedding_workers is None and settings.EMBEDDING_WORKERS > 0:
+        _embedding_workers = EmbeddingWorkerPool(
+            workers=settings.EMBEDDING_WORKERS,
+            max_batch=settings.EMBEDDING_WORKER_MAX_BATCH,
+            max_wait_ms=settings.EMBEDDING_WORKER_MAX_WAIT_MS,
+            timeout=settings.EMBEDDING_WORKER_TIMEOUT,
+            torch_threads=settings.EMBEDDING_TORCH_THREADS,
+            memory_budget_mb=settings.EMBEDDING_MODEL_MEMORY_BUDGET_MB,
+            model_threads=parse_model_threads(settings.EMBEDDING_MODEL_THREADS),
+            loader_kwargs=embedding_loader_kwargs(),
+        )
+    return _embedding_workers
+
+
+def _embedding_model_registry(model_specs: dict) -> EmbeddingModelRegistry:
+    workers = get_embedding_workers()
+    if workers is not None:
+        # Weights live in the worker processes, which apply the memory budget and thread overrides;
+        # the registry here only holds proxies.
+        return EmbeddingModelRegistry(model_specs=model_specs, loader=workers.embedder)
+    return EmbeddingModelRegistry(
+        memory_budget_mb=settings.EMBEDDING_MODEL_MEMORY_BUDGET_MB,
+        torch_threads=settings.EMBEDDING_TORCH_THREADS,
+        model_threads=parse_model_threads(settings.EMBEDDING_MODEL_THREADS),
+        model_specs=model_specs,
+        loader=partial(load_embedding_model, **embedding_loader_kwargs()),
+    )
+
+
 def get_qdrant_documents() -> QdrantDocumentsService:
     global _qdrant_documents
     if _qdrant_documents is None:
-        allowed_models = [m.strip() for m in settings.EMBEDDING_MODELS.split(",") if m.strip()]
+        allowed_models, model_specs = parse_embedding_models(settings.EMBEDDING_MODELS)
         if not allowed_models:
             allowed_models = ["intfloat/multilingual-e5-base"]
-        default_model = settings.EMBEDDING_DEFAULT_MODEL.strip() or (allowed_models[0] if allowed_models else "")
+        default_model = split_model_spec(settings.EMBEDDING_DEFAULT_MODEL)[0] or allowed_models[0]
+        embedding_cache = None
+        if settings.EMBEDDING_CACHE_DIR.strip():
+            embedding_cache = EmbeddingCache(
+                settings.EMBEDDING_CACHE_DIR.strip(),
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            )
+        pdf_extractor = None
+        if settings.PDF_EXTRACT_WORKERS > 0:
+            pdf_extractor = PdfTextExtractor(
+                max_workers=settings.PDF_EXTRACT_WORKERS,
+                pages_per_task=settings.PDF_EXTRACT_PAGES_PER_TASK,
+                timeout=settings.PDF_EXTRACT_TIMEOUT,
+            )
+        vector_store = None
+        if settings.VECTOR_STORE.strip().lower() == "local":
+            vector_store = LocalVectorStore(settings.LOCAL_VECTOR_STORE_DIR.strip())
         _qdrant_documents = QdrantDocumentsService(
             base_url=settings.QDRANT_URL,
             collection_prefix=settings.QDRANT_COLLECTION,
@@ -58,6 +134,38 @@ def get_qdrant_documents() -> QdrantDocumentsService:
             bayleaf=get_bayleaf(),
             allowed_models=allowed_models,
             default_model=default_model,
+            embed_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            upsert_batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+            upsert_wait=settings.QDRANT_UPSERT_WAIT,
+            upsert_confirm_timeout=settings.QDRANT_UPSERT_CONFIRM_TIMEOUT,
+            embedding_cache=embedding_cache,
+            query_cache=QueryEmbeddingLRU(
+                max_entries=settings.QUERY_EMBEDDING_CACHE_SIZE,
+                ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL,
+            ),
+            bulk_workers=settings.BULK_INDEX_WORKERS,
+            pdf_extractor=pdf_extractor,
+            spool_dir=settings.DOCUMENT_SPOOL_DIR.strip() or None,
+            catalog=DocumentCatalog(SessionLocal) if settings.DOCUMENT_CATALOG_ENABLED else None,
+            retrieval_mode=settings.RETRIEVAL_MODE.strip().lower(),
+            fusion=settings.RETRIEVAL_FUSION.strip().lower(),
+            vector_store=vector_store,
+            quantization=settings.QDRANT_QUANTIZATION.strip().lower(),
+            quantization_always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
+            search_oversampling=settings.QDRANT_SEARCH_OVERSAMPLING,
+            search_rescore=settings.QDRANT_SEARCH_RESCORE,
+            chunk_max_tokens=settings.CHUNK_MAX_TOKENS,
+            chunk_overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+            model_registry=_embedding_model_registry(model_specs),
+            transport=QdrantTransport(
+                settings.QDRANT_URL,
+                timeout=settings.QDRANT_TIMEOUT,
+                connect_timeout=settings.QDRANT_CONNECT_TIMEOUT,
+                search_timeout=settings.QDRANT_SEARCH_TIMEOUT,
+                pool_size=settings.QDRANT_POOL_SIZE,
+                max_retries=settings.QDRANT_MAX_RETRIES,
+                backoff_factor=settings.QDRANT_RETRY_BACKOFF,
+            ),
         )
     return _qdrant_documents
 
@@ -69,6 +177,59 @@ def get_documents_tools() -> DocumentsToolset:
     return _documents_tools
 
 
+def get_indexing_jobs() -> IndexingJobRunner:
+    global _indexing_jobs
+    if _indexing_jobs is None:
+        _indexing_jobs = IndexingJobRunner(
+            get_qdrant_documents(),
+            SessionLocal,
+            max_workers=settings.INDEXING_JOB_WORKERS,
+            spool_dir=settings.INDEXING_JOBS_SPOOL_DIR.strip() or None,
+            lease_seconds=settings.INDEXING_JOB_LEASE_SECONDS,
+            spool_retention_hours=settings.INDEXING_JOBS_SPOOL_RETENTION_HOURS,
+        )
+    return _indexing_jobs
+
+
+def get_reranker() -> CrossEncoderReranker | None:
+    global _reranker
+    if _reranker is None and settings.RERANK_MODEL.strip():
+        _reranker = CrossEncoderReranker(
+            settings.RERANK_MODEL.strip(),
+            top_n=settings.RERANK_TOP_N,
+            batch_size=settings.RERANK_BATCH_SIZE,
+            cache_size=settings.RERANK_CACHE_SIZE,
+        )
+    return _reranker
+
+
+def _warm_up() -> dict:
+    documents = get_qdrant_documents()
+    spec = settings.EMBEDDING_PRELOAD_MODELS.strip()
+    if spec.lower() == "all":
+        models = documents.allowed_models
+    else:
+        models = [m.strip() for m in spec.split(",") if m.strip()] or None
+    report = {"models": documents.warm_up(models)}
+    reranker = get_reranker()
+    if reranker is not None:
+        started = time.perf_counter()
+        reranker.warm_up()
+        report["reranker"] = {"model": reranker.model_name, "load_ms": round((time.perf_counter() - started) * 1000, 1)}
+    return report
+
+
+def get_startup_warmup() -> StartupWarmup:
+    global _startup_warmup
+    if _startup_warmup is None:
+        _startup_warmup = StartupWarmup(
+            _warm_up,
+            enabled=settings.EMBEDDING_PRELOAD_ON_STARTUP,
+            retry_seconds=settings.EMBEDDING_PRELOAD_RETRY_SECONDS,
+        )
+    return _startup_warmup
+
+
 def get_decider_provider() -> LLMProvider:
     global _decider_provider
     if _decider_provider is not None:
@@ -0,0 +1,578 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Callable, Dict, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..auth.deps import Principal
+from ..models import IndexingJob, IndexingJobStatus
+from .qdrant_documents import DocumentServiceError, QdrantDocumentsService
+
+# Persist progress at most this often; the final state is always written.
+PROGRESS_FLUSH_SECONDS = 1.0
+
+ACTIVE_STATUSES = (IndexingJobStatus.queued, IndexingJobStatus.running)
+
+
+class JobInterrupted(Exception):
+    pass
+
+
+class IndexingJobRunner:
+    """
+    Runs QdrantDocumentsService indexing (and cross-model migrations) in a
+    background worker pool.
+
+    Job state lives in the ``indexing_jobs`` table so it survives restarts.
+    Bayleaf bearer tokens are never persisted: jobs that need one and were cut
+    short by a restart are marked ``interrupted`` and can be retried with a
+    fresh token. Uploaded files are spooled to disk and resume on their own, as do
+    migrations, from the checkpoint saved after each page. An upload keeps the
+    document_uuid chosen at submit time, so a retried or resumed run overwrites
+    its own points. Spooled files of permanently failed uploads are deleted right
+    away; those of other finished uploads stay retryable for
+    ``spool_retention_hours`` and are then swept.
+
+    Several processes share the table, so each job is leased to the process
+    that runs it (``worker_id``). A heartbeat renews the leases of the jobs held
+    here, a job only starts if its queued row is claimed atomically, and
+    ``resume_pending`` only takes over jobs whose lease has expired.
+    """
+
+    def __init__(
+        self,
+        documents_service: QdrantDocumentsService,
+        session_factory: Callable[[], Session],
+        *,
+        max_workers: int = 2,
+        spool_dir: Optional[str] = None,
+        lease_seconds: float = 60.0,
+        spool_retention_hours: float = 24.0,
+    ):
+        self.documents_service = documents_service
+        self.session_factory = session_factory
+        self.spool_dir = spool_dir or os.path.join(tempfile.gettempdir(), "bayleaf-agents-jobs")
+        self.lease_seconds = max(1.0, float(lease_seconds))
+        self.spool_retention = max(0.0, float(spool_retention_hours)) * 3600
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.log = structlog.get_logger("indexing_jobs")
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="indexing-job")
+        self._principals: Dict[str, Principal] = {}
+        self._futures: Dict[str, Future] = {}
+        self._interrupts: Set[str] = set()
+        self._lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def _create(self, **fields: Any) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            job = IndexingJob(
+                status=IndexingJobStatus.queued,
+                params={},
+                chunks_total=0,
+                chunks_embedded=0,
+                worker_id=self.worker_id,
+                lease_expires_at=self._lease_deadline(),
+            )
+            for key, value in fields.items():
+                setattr(job, key, value)
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return self._snapshot(job)
+        finally:
+            db.close()
+
+    def _update(self, job_id: str, **fields: Any) -> bool:
+        # Only writes while this process holds the job; False means the lease was lost.
+        db = self.session_factory()
+        try:
+            updated = (
+                db.query(IndexingJob)
+                .filter(IndexingJob.id == job_id, IndexingJob.worker_id == self.worker_id)
+                .update({**fields, "updated_at": datetime.utcnow()}, synchronize_session=False)
+            )
+            db.commit()
+            return bool(updated)
+        finally:
+            db.close()
+
+    def _finish(self, job_id: str, **fields: Any) -> None:
+        if not self._update(job_id, lease_expires_at=None, finished_at=datetime.utcnow(), **fields):
+            self.log.warning("indexing_job_lease_lost", job_id=job_id, status=fields.get("status"))
+
+    def _snapshot(self, job: IndexingJob) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status.value,
+            "document_uuid": job.document_uuid,
+            "model_used": job.model_used,
+            "chunks_total": job.chunks_total or 0,
+            "chunks_embedded": job.chunks_embedded or 0,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    def _enqueue(self, job_id: str, principal: Optional[Principal]) -> None:
+        with self._lock:
+            if principal is not None:
+                self._principals[job_id] = principal
+            self._futures[job_id] = self._executor.submit(self._run, job_id)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._renew_leases, name="indexing-job-lease", daemon=True)
+                self._heartbeat.start()
+
+    def _renew_leases(self) -> None:
+        while not self._stopped.wait(self.lease_seconds / 3):
+            with self._lock:
+                held = list(self._futures)
+            if not held:
+                continue
+            db = self.session_factory()
+            try:
+                db.query(IndexingJob).filter(
+                    IndexingJob.id.in_(held),
+                    IndexingJob.worker_id == self.worker_id,
+                    IndexingJob.status.in_(ACTIVE_STATUSES),
+                ).update({"lease_expires_at": self._lease_deadline()}, synchronize_session=False)
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                self.log.warning("indexing_job_lease_renewal_failed", error=str(exc))
+            finally:
+                db.close()
+
+    def get(self, job_id: str, principal: Optional[Principal] = None) -> Optional[Dict[str, Any]]:
+        # With a principal, jobs submitted by someone else are reported as not found.
+        db = self.session_factory()
+        try:
+            job = db.get(IndexingJob, job_id)
+            if job is None or (principal is not None and job.owner_id != principal.user_id):
+                return None
+            return self._snapshot(job)
+        finally:
+            db.close()
+
+    def submit_index(
+        self,
+        *,
+        document_uuid: str,
+        principal: Principal,
+        model_used: Optional[str] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        job = self._create(
+            kind="index",
+            owner_id=principal.user_id,
+            document_uuid=document_uuid,
+            model_used=model_used,
+            params={"force": force},
+        )
+        self._enqueue(job["id"], principal)
+        return job
+
+    def submit_reindex(
+        self,
+        *,
+        document_uuid: str,
+        principal: Principal,
+        model_used: Optional[str] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        job = self._create(
+            kind="reindex",
+            owner_id=principal.user_id,
+            document_uuid=document_uuid,
+            model_used=model_used,
+            params={"force": force},
+        )
+        self._enqueue(job["id"], principal)
+        return job
+
+    def submit_migrate(
+        self,
+        *,
+        source_model: str,
+        target_model: Optional[str] = None,
+        principal: Optional[Principal] = None,
+        batch_size: int = 256,
+        max_points_per_second: float = 0.0,
+    ) -> Dict[str, Any]:
+        target = self.documents_service._resolve_model(target_model)
+        source = self.documents_service._resolve_model(source_model)
+        if source == target:
+            raise DocumentServiceError(400, "migration_same_model", {"model_used": source})
+        job = self._create(
+            kind="migrate",
+            owner_id=principal.user_id if principal else None,
+            model_used=target,
+            params={
+                "source_model": source,
+                "batch_size": batch_size,
+                "max_points_per_second": max_points_per_second,
+            },
+        )
+        self._enqueue(job["id"], None)
+        return job
+
+    def submit_upload(
+        self,
+        *,
+        filename: str,
+        fileobj: BinaryIO,
+        mime_type: Optional[str],
+        principal: Optional[Principal] = None,
+        model_used: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        os.makedirs(self.spool_dir, exist_ok=True)
+        spool_path = os.path.join(self.spool_dir, f"upload-{uuid.uuid4().hex}")
+        with open(spool_path, "wb") as out:
+            while True:
+                block = fileobj.read(1024 * 1024)
+                if not block:
+                    break
+                out.write(block)
+        job = self._create(
+            kind="upload",
+            owner_id=principal.user_id if principal else None,
+            document_uuid=str(uuid.uuid4()),
+            model_used=model_used,
+            params={"filename": filename, "mime_type": mime_type, "spool_path": spool_path},
+        )
+        self._enqueue(job["id"], None)
+        return job
+
+    def retry(self, job_id: str, principal: Optional[Principal]) -> Optional[Dict[str, Any]]:
+        job = self.get(job_id, principal)
+        if job is None:
+            return None
+        if job["kind"] == "upload":
+            db = self.session_factory()
+            try:
+                spool_path = str((db.get(IndexingJob, job_id).params or {}).get("spool_path") or "")
+            finally:
+                db.close()
+            if not os.path.exists(spool_path):
+                raise DocumentServiceError(409, "indexing_job_upload_expired", "Upload the file again.")
+        retryable = (IndexingJobStatus.failed, IndexingJobStatus.interrupted)
+        db = self.session_factory()
+        try:
+            # Conditional so that two concurrent retries cannot both requeue the job.
+            requeued = (
+                db.query(IndexingJob)
+                .filter(IndexingJob.id == job_id, IndexingJob.status.in_(retryable))
+                .update(
+                    {
+                        "status": IndexingJobStatus.queued,
+                        "error": None,
+                        "result": None,
+                        # Migrations resume from their checkpoint, so their progress stays.
+                        "chunks_embedded": job["chunks_embedded"] if job["kind"] == "migrate" else 0,
+                        "started_at": None,
+                        "finished_at": None,
+                        "worker_id": self.worker_id,
+                        "lease_expires_at": self._lease_deadline(),
+                        "updated_at": datetime.utcnow(),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+        if not requeued:
+            raise DocumentServiceError(409, "indexing_job_not_retryable", {"status": job["status"]})
+        queued = self.get(job_id)
+        self._enqueue(job_id, principal)
+        return queued
+
+    def interrupt(self, job_id: str) -> bool:
+        # Migrations stop after their current page and can be resumed with retry().
+        with self._lock:
+            if job_id not in self._futures:
+                return False
+            self._interrupts.add(job_id)
+            return True
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except CancelledError:
+                pass
+        return self.get(job_id)
+
+    def resume_pending(self) -> int:
+        # Takes over active jobs whose owner stopped renewing its lease; jobs held by
+        # live processes are left alone.
+        now = datetime.utcnow()
+        orphaned = (
+            IndexingJob.status.in_(ACTIVE_STATUSES),
+            or_(IndexingJob.lease_expires_at.is_(None), IndexingJob.lease_expires_at < now),
+        )
+        db = self.session_factory()
+        resumable, interrupted = [], 0
+        try:
+            pending = [(job.id, job.kind, dict(job.params or {})) for job in db.query(IndexingJob).filter(*orphaned).all()]
+            for job_id, kind, params in pending:
+                spooled = kind == "upload" and os.path.exists(str(params.get("spool_path") or ""))
+                fields: Dict[str, Any] = {"worker_id": self.worker_id, "updated_at": now}
+                if spooled or kind == "migrate":
+                    fields.update(status=IndexingJobStatus.queued, lease_expires_at=self._lease_deadline())
+                else:
+                    fields.update(
+                        status=IndexingJobStatus.interrupted,
+                        error={"error": "indexing_job_interrupted", "details": "Retry the job to resubmit it."},
+                        finished_at=now,
+                        lease_expires_at=None,
+                    )
+                taken = (
+                    db.query(IndexingJob)
+                    .filter(IndexingJob.id == job_id, *orphaned)
+                    .update(fields, synchronize_session=False)
+                )
+                db.commit()
+                if not taken:
+                    continue  # another process got there first
+                if fields["status"] == IndexingJobStatus.queued:
+                    resumable.append(job_id)
+                else:
+                    interrupted += 1
+        finally:
+            db.close()
+        # Before the resumed jobs start: their spooled files are already protected as queued.
+        self.sweep_spool()
+        for job_id in resumable:
+            self._enqueue(job_id, None)
+        if resumable or interrupted:
+            self.log.info("indexing_jobs_resumed", resumed=len(resumable), interrupted=interrupted)
+        return len(resumable)
+
+    def sweep_spool(self) -> int:
+        # Deletes spooled uploads older than the retention that no queued or running job needs.
+        if not os.path.isdir(self.spool_dir):
+            return 0
+        cutoff = time.time() - self.spool_retention
+        db = self.session_factory()
+        try:
+            active = db.query(IndexingJob.params).filter(
+                IndexingJob.kind == "upload", IndexingJob.status.in_(ACTIVE_STATUSES)
+            )
+            needed = {str((params or {}).get("spool_path") or "") for (params,) in active.all()}
+        finally:
+            db.close()
+        removed = 0
+        for name in os.listdir(self.spool_dir):
+            path = os.path.join(self.spool_dir, name)
+            if not name.startswith("upload-") or path in needed:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            self.log.info("indexing_job_spool_swept", removed=removed)
+        return removed
+
+    def _remove_spool(self, params: Dict[str, Any]) -> None:
+        try:
+            os.remove(params["spool_path"])
+        except (KeyError, OSError):
+            pass
+
+    def _progress_callback(self, job_id: str) -> Callable[[int, int], None]:
+        last_flush = [0.0]
+
+        def _progress(done: int, total: int) -> None:
+            now = time.monotonic()
+            if done < total and now - last_flush[0] < PROGRESS_FLUSH_SECONDS:
+                return
+            last_flush[0] = now
+            self._update(job_id, chunks_embedded=done, chunks_total=total)
+
+        return _progress
+
+    def _checkpoint_callback(self, job_id: str, params: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+        def _checkpoint(state: Dict[str, Any]) -> None:
+            held = self._update(job_id, params={**params, "checkpoint": state}, chunks_embedded=state["migrated"])
+            with self._lock:
+                interrupted = job_id in self._interrupts
+            if interrupted or not held:
+                raise JobInterrupted()
+
+        return _checkpoint
+
+    def _execute(self, job: Dict[str, Any], params: Dict[str, Any], principal: Optional[Principal]) -> Dict[str, Any]:
+        progress = self._progress_callback(job["id"])
+        if job["kind"] == "migrate":
+            return self.documents_service.migrate_collection(
+                source_model=params["source_model"],
+                target_model=job["model_used"],
+                batch_size=int(params.get("batch_size") or 256),
+                max_points_per_second=float(params.get("max_points_per_second") or 0.0),
+                checkpoint=params.get("checkpoint"),
+                on_checkpoint=self._checkpoint_callback(job["id"], params),
+                progress=progress,
+            )
+        if job["kind"] == "upload":
+            return self.documents_service.index_uploaded_file(
+                filename=params.get("filename") or "uploaded_document",
+                path=params["spool_path"],
+                mime_type=params.get("mime_type"),
+                model_used=job["model_used"],
+                document_uuid=job["document_uuid"],
+                progress=progress,
+            )
+        if principal is None:
+            raise DocumentServiceError(409, "indexing_job_interrupted", "Retry the job to resubmit it.")
+        if job["kind"] == "reindex":
+            return self.documents_service.reindex_document(
+                document_uuid=job["document_uuid"],
+                principal=principal,
+                model_used=job["model_used"],
+                force=bool(params.get("force")),
+                progress=progress,
+            )
+        return self.documents_service.index_document(
+            document_uuid=job["document_uuid"],
+            principal=principal,
+            model_used=job["model_used"],
+            force=bool(params.get("force")),
+            progress=progress,
+        )
+
+    def _run(self, job_id: str) -> None:
+        try:
+            self._run_job(job_id)
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+                self._interrupts.discard(job_id)
+
+    def _claim(self, job_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        # queued -> running in one conditional UPDATE, so a job never starts twice.
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            claimed = (
+                db.query(IndexingJob)
+                .filter(
+                    IndexingJob.id == job_id,
+                    IndexingJob.status == IndexingJobStatus.queued,
+                    IndexingJob.worker_id == self.worker_id,
+                )
+                .update(
+                    {
+                        "status": IndexingJobStatus.running,
+                        "started_at": now,
+                        "lease_expires_at": self._lease_deadline(),
+                        "updated_at": now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if not claimed:
+                return None
+            record = db.get(IndexingJob, job_id)
+            return self._snapshot(record), dict(record.params or {})
+        finally:
+            db.close()
+
+    def _run_job(self, job_id: str) -> None:
+        with self._lock:
+            principal = self._principals.pop(job_id, None)
+        claimed = self._claim(job_id)
+        if claimed is None:
+            self.log.info("indexing_job_not_claimed", job_id=job_id)
+            return
+        job, params = claimed
+
+        started = time.monotonic()
+        try:
+            result = self._execute(job, params, principal)
+        except JobInterrupted:
+            self._finish(
+                job_id,
+                status=IndexingJobStatus.interrupted,
+                error={"error": "indexing_job_interrupted", "details": "Retry the job to resume it."},
+            )
+            self.log.info("indexing_job_interrupted", job_id=job_id, kind=job["kind"])
+            return
+        except DocumentServiceError as exc:
+            self._finish(
+                job_id,
+                status=IndexingJobStatus.failed,
+                error={"error": exc.message, "status_code": exc.status_code, "details": exc.details},
+            )
+            # A 4xx (unsupported or unreadable file) fails the same way on retry, so its upload is dropped now.
+            if job["kind"] == "upload" and exc.status_code < 500:
+                self._remove_spool(params)
+            self.log.info("indexing_job_failed", job_id=job_id, kind=job["kind"], error=exc.message)
+            return
+        except Exception as exc:
+            self._finish(
+                job_id,
+                status=IndexingJobStatus.failed,
+                error={"error": "indexing_job_crashed", "details": str(exc)},
+            )
+            self.log.exception("indexing_job_crashed", job_id=job_id, kind=job["kind"])
+            return
+
+        chunks = int(result.get("chunks") or 0)
+        self._finish(
+            job_id,
+            status=IndexingJobStatus.succeeded,
+            result=result,
+            document_uuid=result.get("uuid") or job["document_uuid"],
+            model_used=result.get("model_used") or job["model_used"],
+            chunks_total=chunks,
+            chunks_embedded=chunks,
+        )
+        if job["kind"] == "upload":
+            self._remove_spool(params)
+        self.log.info(
+            "indexing_job_succeeded",
+            job_id=job_id,
+            kind=job["kind"],
+            document_uuid=result.get("uuid"),
+            chunks=chunks,
+            elapsed_ms=int((time.monotonic() - started) * 1000),
+        )
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._stopped.set()
+        # Jobs that never started here can be picked up by the next process right away.
+        db = self.session_factory()
+        try:
+            db.query(IndexingJob).filter(
+                IndexingJob.worker_id == self.worker_id,
+                IndexingJob.status == IndexingJobStatus.queued,
+            ).update({"lease_expires_at": None}, synchronize_session=False)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            self.log.warning("indexing_job_lease_release_failed", error=str(exc))
+        finally:
+            db.close()
@@ -0,0 +1,223 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_models import ModelLoadError
+
+# Backend suffixes accepted in EMBEDDING_MODELS, e.g. "intfloat/multilingual-e5-base@onnx-int8".
+ONNX_BACKENDS = ("onnx", "onnx-int8")
+DEFAULT_ONNX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bayleaf-agents", "onnx")
+EXPORT_CONFIG = "bayleaf_onnx.json"
+MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model_int8.onnx"
+
+
+def onnx_model_dir(root: Optional[str], model_name: str) -> str:
+    return os.path.join(root or DEFAULT_ONNX_DIR, model_name.replace("/", "__"))
+
+
+class OnnxEmbedder:
+    """
+    SentenceTransformer-compatible ``encode`` on top of an ONNX Runtime session.
+
+    The session runs the exported transformer and returns token states; pooling
+    (mean or CLS) and normalization are applied here with the settings recorded
+    at export time, so vectors match the PyTorch model's.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: Any,
+        *,
+        pooling: str = "mean",
+        normalize: bool = False,
+        max_seq_length: int = 512,
+        batch_size: int = 32,
+    ):
+        if pooling not in ("mean", "cls"):
+            raise ModelLoadError("onnx_pooling_unsupported", f"pooling mode {pooling!r} is not supported")
+        self.session = session
+        self.tokenizer = tokenizer
+        self.pooling = pooling
+        self.normalize = normalize
+        self.max_seq_length = int(max_seq_length)
+        self.batch_size = max(1, int(batch_size))
+        self._input_names = [item.name for item in session.get_inputs()]
+
+    @classmethod
+    def load(cls, model_dir: str, *, quantized: bool = False, threads: int = 0) -> "OnnxEmbedder":
+        try:
+            import onnxruntime
+            from transformers import AutoTokenizer
+        except Exception as exc:
+            raise ModelLoadError(
+                "embedding_dependency_missing",
+                "Install onnxruntime and transformers to use ONNX embedding models.",
+            ) from exc
+        path = os.path.join(model_dir, INT8_MODEL_FILE if quantized else MODEL_FILE)
+        config_path = os.path.join(model_dir, EXPORT_CONFIG)
+        if not os.path.exists(path) or not os.path.exists(config_path):
+            raise ModelLoadError(
+                "onnx_model_missing",
+                f"{path} not found; export it with python -m bayleaf_agents.cli.export_onnx",
+            )
+        with open(config_path, "r", encoding="utf-8") as fh:
+            config = json.load(fh)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        try:
+            session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+            tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        except Exception as exc:
+            raise ModelLoadError("embedding_model_load_failed", str(exc)) from exc
+        return cls(
+            session,
+            tokenizer,
+            pooling=config.get("pooling", "mean"),
+            normalize=bool(config.get("normalize", False)),
+            max_seq_length=config.get("max_seq_length", 512),
+        )
+
+    def _pool(self, hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if self.pooling == "cls":
+            return hidden[:, 0]
+        weights = mask[..., None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        sentences: Any,
+        batch_size: Optional[int] = None,
+        normalize_embeddings: bool = False,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        _ = kwargs
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        size = max(1, int(batch_size or self.batch_size))
+        parts: List[np.ndarray] = []
+        for start in range(0, len(texts), size):
+            encoded = self.tokenizer(
+                texts[start:start + size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {name: np.asarray(encoded[name], dtype=np.int64) for name in self._input_names if name in encoded}
+            if "token_type_ids" in self._input_names and "token_type_ids" not in feed:
+                feed["token_type_ids"] = np.zeros_like(feed["input_ids"])
+            hidden = self.session.run(None, feed)[0]
+            parts.append(self._pool(hidden, np.asarray(encoded["attention_mask"])))
+        matrix = np.concatenate(parts).astype(np.float32) if parts else np.empty((0, 0), dtype=np.float32)
+        if self.normalize or normalize_embeddings:
+            matrix /= np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+        return matrix[0] if single else matrix
+
+
+def export_onnx_model(model_name: str, model_dir: str, *, quantize: bool = True, opset: int = 17) -> Dict[str, Any]:
+    """
+    Exports the transformer of a SentenceTransformer to ``model_dir`` (fp32 and,
+    with ``quantize``, a dynamically int8-quantized copy) with its tokenizer and
+    the pooling/normalization settings the ONNX embedder needs.
+    """
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+    except Exception as exc:
+        raise ModelLoadError("embedding_dependency_missing", "Exporting needs torch and sentence-transformers.") from exc
+
+    model = SentenceTransformer(model_name, device="cpu")
+    modules = list(model)
+    pooling = "mean"
+    for module in modules:
+        if hasattr(module, "get_pooling_mode_str"):
+            pooling = module.get_pooling_mode_str()
+    if pooling not in ("mean", "cls"):
+        raise ModelLoadError("onnx_pooling_unsupported", f"pooling mode {pooling!r} is not supported")
+    normalize = any(type(module).__name__ == "Normalize" for module in modules)
+    transformer = modules[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    sample = tokenizer(["warm-up query", "a longer warm-up passage for the export"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class _Encoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    os.makedirs(model_dir, exist_ok=True)
+    path = os.path.join(model_dir, MODEL_FILE)
+    axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["token_states"]}
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(),
+            tuple(sample[name] for name in input_names),
+            path,
+            input_names=input_names,
+            output_names=["token_states"],
+            dynamic_axes=axes,
+            opset_version=opset,
+        )
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(path, os.path.join(model_dir, INT8_MODEL_FILE), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(model_dir)
+    config = {
+        "model": model_name,
+        "pooling": pooling,
+        "normalize": normalize,
+        "max_seq_length": model.max_seq_length,
+        "dim": model.get_sentence_embedding_dimension(),
+        "quantized": quantize,
+    }
+    with open(os.path.join(model_dir, EXPORT_CONFIG), "w", encoding="utf-8") as fh:
+        json.dump(config, fh, indent=2)
+    return config
+
+
+def compare_embedders(
+    reference: Any,
+    candidate: Any,
+    texts: List[str],
+    *,
+    batch_sizes: Tuple[int, ...] = (1, 32),
+) -> Dict[str, Any]:
+    """
+    Cosine parity of ``candidate`` against ``reference`` on ``texts``, plus the
+    encode throughput of both at each batch size (1 = query path, 32 = indexing).
+    """
+    expected = np.asarray(reference.encode(texts, batch_size=32, normalize_embeddings=True), dtype=np.float32)
+    actual = np.asarray(candidate.encode(texts, batch_size=32, normalize_embeddings=True), dtype=np.float32)
+    cosines = (expected * actual).sum(axis=1)
+    worst = np.argsort(cosines)[:5]
+    report: Dict[str, Any] = {
+        "texts": len(texts),
+        "cosine_min": round(float(cosines.min()), 5),
+        "cosine_mean": round(float(cosines.mean()), 5),
+        "cosine_p01": round(float(np.percentile(cosines, 1)), 5),
+        "worst": [{"cosine": round(float(cosines[idx]), 5), "text": texts[idx][:120]} for idx in worst],
+        "throughput": {},
+    }
+    for size in batch_sizes:
+        row: Dict[str, Any] = {}
+        for label, embedder in (("reference", reference), ("candidate", candidate)):
+            started = time.perf_counter()
+            for start in range(0, len(texts), size):
+                embedder.encode(texts[start:start + size], batch_size=size, normalize_embeddings=True)
+            elapsed = time.perf_counter() - started
+            row[f"{label}_texts_per_s"] = round(len(texts) / elapsed, 1) if elapsed > 0 else None
+        if row["reference_texts_per_s"] and row["candidate_texts_per_s"]:
+            row["speedup"] = round(row["candidate_texts_per_s"] / row["reference_texts_per_s"], 2)
+        report["throughput"][f"batch_{size}"] = row
+    return report
@@ -0,0 +1,114 @@
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Union
+
+import structlog
+
+# Raw PDF bytes, or a path to a PDF on local disk (preferred for large files:
+# workers open the file themselves instead of receiving a pickled copy).
+PdfSource = Union[bytes, str]
+
+
+class PdfExtractionTimeout(Exception):
+    pass
+
+
+def _open_reader(source: PdfSource):
+    from pypdf import PdfReader
+
+    if isinstance(source, (bytes, bytearray)):
+        return PdfReader(io.BytesIO(source))
+    return PdfReader(source)
+
+
+def pdf_page_count(source: PdfSource) -> int:
+    return len(_open_reader(source).pages)
+
+
+def extract_page_range(source: PdfSource, start: int, stop: int) -> List[str]:
+    reader = _open_reader(source)
+    return [reader.pages[idx].extract_text() or "" for idx in range(start, min(stop, len(reader.pages)))]
+
+
+class PdfTextExtractor:
+    """
+    Extracts PDF text in a process pool so parsing never holds the API worker's GIL.
+
+    Documents longer than ``pages_per_task`` pages are split into page ranges that
+    are extracted in parallel and reassembled in page order. A document that does
+    not finish within ``timeout`` seconds has its worker processes terminated, so a
+    pathological PDF cannot pin the pool.
+    """
+
+    def __init__(self, max_workers: int = 2, pages_per_task: int = 16, timeout: float = 120.0):
+        self.max_workers = max(1, int(max_workers))
+        self.pages_per_task = max(1, int(pages_per_task))
+        self.timeout = float(timeout)
+        self.log = structlog.get_logger("pdf_extraction")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: the API process runs threads, which fork does not copy safely.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _timed_out(self, pool: ProcessPoolExecutor, pages: Optional[int]) -> None:
+        self.log.warning("pdf_extraction_timeout", pages=pages, timeout=self.timeout)
+        self._discard_pool(pool)
+        raise PdfExtractionTimeout(f"PDF text extraction exceeded {self.timeout:g}s")
+
+    def extract_pages(self, source: PdfSource) -> List[str]:
+        try:
+            return self._extract_pages(source)
+        except (BrokenProcessPool, RuntimeError):
+            # Another document's timeout recycled the pool under this one; retry once.
+            return self._extract_pages(source)
+
+    def _extract_pages(self, source: PdfSource) -> List[str]:
+        pool = self._get_pool()
+        deadline = time.monotonic() + self.timeout
+        try:
+            total = pool.submit(pdf_page_count, source).result(timeout=self.timeout)
+        except FuturesTimeout:
+            self._timed_out(pool, pages=None)
+        ranges = [(start, min(total, start + self.pages_per_task)) for start in range(0, total, self.pages_per_task)]
+        futures = [pool.submit(extract_page_range, source, start, stop) for start, stop in ranges]
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_EXCEPTION)
+        for future in done:
+            if future.exception() is not None:
+                for pending in not_done:
+                    pending.cancel()
+                raise future.exception()
+        if not_done:
+            self._timed_out(pool, pages=total)
+        pages: List[str] = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,16 +1,57 @@
 import hashlib
-import io
+import os
 import re
+import tempfile
+import threading
+import time
 import uuid
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
+import numpy as np
 import requests
 import structlog
+from sqlalchemy.exc import SQLAlchemyError
 
 from ..auth.deps import Principal
 from ..tools.bayleaf import BayleafClient
+from .chunking import StructuredChunker, TokenCounter, approximate_token_counts
+from .document_catalog import DocumentCatalog
+from .embedding_models import EmbeddingModelRegistry, ModelLoadError
+from .embedding_worker import EmbeddingWorkerError
+from .embedding_cache import EmbeddingCache, QueryEmbeddingLRU, text_key
+from .pdf_extraction import PdfExtractionTimeout, PdfTextExtractor
+from .qdrant_transport import QdrantTransport
+from .vector_store import RRF_K, VectorStore
+from .sparse_vectors import SPARSE_VECTOR_NAME, document_sparse_vector, query_sparse_vector
+
+
+# Called as progress(chunks_done, chunks_total) while a document is being indexed.
+IndexProgress = Callable[[int, int], None]
+
+# Payload fields used by query filters, tail deletes and catalog scrolls, with their Qdrant index schema.
+PAYLOAD_INDEXES = {
+    "document_uuid": "keyword",
+    "source_type": "keyword",
+    "model_used": "keyword",
+    "is_bayleaf": "bool",
+    "chunk_index": "integer",
+}
+
+RETRIEVAL_MODES = ("dense", "hybrid")
+FUSION_METHODS = ("rrf", "dbsf")
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+# model_used reported by fan-out queries that search every allowed model.
+ALL_MODELS = "all"
+
+# Downloads and uploads are spooled to disk in blocks of this size.
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+# Longest a migration page waits for in-flight query embeddings before encoding anyway.
+MIGRATION_YIELD_SECONDS = 1.0
 
 
 class DocumentServiceError(Exception):
@@ -21,6 +62,177 @@ class DocumentServiceError(Exception):
         super().__init__(message)
 
 
+class QdrantVectorStore(VectorStore):
+    """VectorStore backed by the Qdrant REST API."""
+
+    def __init__(self, request: Callable[..., Dict[str, Any]]):
+        # request(method, path, json_data=None) -> decoded body; raises DocumentServiceError.
+        self.request = request
+
+    @staticmethod
+    def _wait(wait: bool) -> str:
+        return "true" if wait else "false"
+
+    def collection_info(self, collection: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = self.request("GET", f"/collections/{collection}")
+        except DocumentServiceError as exc:
+            if exc.status_code == 404:
+                return None
+            raise
+        result = data.get("result") if isinstance(data, dict) else None
+        return result if isinstance(result, dict) else {}
+
+    def create_collection(
+        self,
+        collection: str,
+        *,
+        dim: int,
+        distance: str,
+        sparse_vectors: Optional[Dict[str, Any]] = None,
+        quantization_config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        body: Dict[str, Any] = {"vectors": {"size": dim, "distance": distance}}
+        if sparse_vectors:
+            body["sparse_vectors"] = sparse_vectors
+        if quantization_config:
+            body["quantization_config"] = quantization_config
+        try:
+            self.request("PUT", f"/collections/{collection}", json_data=body)
+        except DocumentServiceError as exc:
+            if exc.status_code != 409:
+                raise
+
+    def update_collection(self, collection: str, *, quantization_config: Any) -> None:
+        # Qdrant builds the quantized copy of existing vectors in the background.
+        self.request("PATCH", f"/collections/{collection}", json_data={"quantization_config": quantization_config})
+
+    def create_payload_index(self, collection: str, field: str, schema: str) -> None:
+        self.request(
+            "PUT",
+            f"/collections/{collection}/index?wait=true",
+            json_data={"field_name": field, "field_schema": schema},
+        )
+
+    def upsert(self, collection: str, points: List[Dict[str, Any]], *, wait: bool = True) -> None:
+        self.request("PUT", f"/collections/{collection}/points?wait={self._wait(wait)}", json_data={"points": points})
+
+    def set_payload(self, collection: str, point_ids: List[str], payload: Dict[str, Any], *, wait: bool = True) -> None:
+        self.request(
+            "POST",
+            f"/collections/{collection}/points/payload?wait={self._wait(wait)}",
+            json_data={"payload": payload, "points": point_ids},
+        )
+
+    def delete(self, collection: str, points_filter: Dict[str, Any], *, wait: bool = True) -> None:
+        self.request(
+            "POST",
+            f"/collections/{collection}/points/delete?wait={self._wait(wait)}",
+            json_data={"filter": points_filter},
+        )
+
+    def scroll(
+        self,
+        collection: str,
+        scroll_filter: Optional[Dict[str, Any]] = None,
+        *,
+        limit: int = 256,
+        offset: Any = None,
+        with_payload: Any = True,
+    ) -> Tuple[List[Dict[str, Any]], Any]:
+        payload: Dict[str, Any] = {
+            "limit": limit,
+            "with_payload": with_payload,
+            "with_vector": False,
+        }
+        if scroll_filter:
+            payload["filter"] = scroll_filter
+        if offset is not None:
+            payload["offset"] = offset
+        try:
+            data = self.request("POST", f"/collections/{collection}/points/scroll", json_data=payload)
+        except DocumentServiceError as exc:
+            if exc.status_code == 404:
+                return [], None
+            raise
+        result = data.get("result") or {}
+        return result.get("points") or [], result.get("next_page_offset")
+
+    def count(self, collection: str, count_filter: Optional[Dict[str, Any]] = None) -> int:
+        payload: Dict[str, Any] = {"exact": True}
+        if count_filter:
+            payload["filter"] = count_filter
+        data = self.request("POST", f"/collections/{collection}/points/count", json_data=payload)
+        return int((data.get("result") or {}).get("count") or 0)
+
+    def search(
+        self,
+        collection: str,
+        vector: List[float],
+        *,
+        limit: int,
+        query_filter: Optional[Dict[str, Any]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        payload: Dict[str, Any] = {
+            "vector": vector,
+            "limit": limit,
+            "with_payload": True,
+            "with_vector": False,
+        }
+        if query_filter:
+            payload["filter"] = query_filter
+        if search_params:
+            payload["params"] = search_params
+        try:
+            data = self.request("POST", f"/collections/{collection}/points/search", json_data=payload)
+        except DocumentServiceError as exc:
+            if exc.status_code == 404:
+                return []
+            raise
+        return data.get("result") or []
+
+    def fused_search(
+        self,
+        collection: str,
+        vector: List[float],
+        sparse_vector: Dict[str, List],
+        *,
+        sparse_name: str,
+        limit: int,
+        query_filter: Optional[Dict[str, Any]] = None,
+        fusion: str = "rrf",
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        # Dense and sparse candidates are fetched and fused server-side in one call.
+        prefetch_limit = max(limit * 4, 20)
+        prefetch: List[Dict[str, Any]] = [
+            {"query": vector, "limit": prefetch_limit},
+            {"query": sparse_vector, "using": sparse_name, "limit": prefetch_limit},
+        ]
+        if search_params:
+            # Quantization only applies to the dense branch.
+            prefetch[0]["params"] = search_params
+        if query_filter:
+            for branch in prefetch:
+                branch["filter"] = query_filter
+        payload = {
+            "prefetch": prefetch,
+            "query": {"fusion": fusion},
+            "limit": limit,
+            "with_payload": True,
+            "with_vector": False,
+        }
+        try:
+            data = self.request("POST", f"/collections/{collection}/points/query", json_data=payload)
+        except DocumentServiceError as exc:
+            if exc.status_code == 404:
+                return []
+            raise
+        result = data.get("result") or {}
+        return (result.get("points") if isinstance(result, dict) else result) or []
+
+
 class QdrantDocumentsService:
     def __init__(
         self,
@@ -31,6 +243,27 @@ class QdrantDocumentsService:
         bayleaf: BayleafClient,
         allowed_models: List[str],
         default_model: str,
+        embed_batch_size: int = 32,
+        upsert_batch_size: int = 64,
+        upsert_wait: bool = True,
+        upsert_confirm_timeout: float = 30.0,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        query_cache: Optional[QueryEmbeddingLRU] = None,
+        bulk_workers: int = 4,
+        pdf_extractor: Optional[PdfTextExtractor] = None,
+        spool_dir: Optional[str] = None,
+        transport: Optional[QdrantTransport] = None,
+        catalog: Optional[DocumentCatalog] = None,
+        retrieval_mode: str = "dense",
+        fusion: str = "rrf",
+        vector_store: Optional[VectorStore] = None,
+        quantization: str = "none",
+        quantization_always_ram: bool = True,
+        search_oversampling: float = 2.0,
+        search_rescore: bool = True,
+        chunk_max_tokens: int = 384,
+        chunk_overlap_tokens: int = 48,
+        model_registry: Optional[EmbeddingModelRegistry] = None,
     ):
         self.base = base_url.rstrip("/")
         self.collection_prefix = collection_prefix
@@ -41,9 +274,40 @@ class QdrantDocumentsService:
         if not self.allowed_models:
             raise RuntimeError("allowed_models must not be empty")
         self.default_model = default_model if default_model in self.allowed_models else self.allowed_models[0]
+        self.embed_batch_size = max(1, int(embed_batch_size))
+        self.upsert_batch_size = max(1, int(upsert_batch_size))
+        self.upsert_wait = upsert_wait
+        self.upsert_confirm_timeout = float(upsert_confirm_timeout)
+        self.embedding_cache = embedding_cache
+        self.bulk_workers = max(1, int(bulk_workers))
+        self.pdf_extractor = pdf_extractor
+        self.spool_dir = spool_dir or None
+        self.catalog = catalog
+        self.retrieval_mode = retrieval_mode if retrieval_mode in RETRIEVAL_MODES else "dense"
+        self.fusion = fusion if fusion in FUSION_METHODS else "rrf"
+        self.quantization = quantization if quantization in QUANTIZATION_MODES else "none"
+        self.quantization_always_ram = quantization_always_ram
+        self.search_oversampling = max(1.0, float(search_oversampling))
+        self.search_rescore = search_rescore
+        self.transport = transport if transport is not None else QdrantTransport(self.base, timeout=timeout)
+        # Late-bound so the store always goes through this instance's _request.
+        self.vector_store = vector_store or QdrantVectorStore(
+            lambda method, path, json_data=None: self._request(method, path, json_data=json_data)
+        )
+        self.query_cache = query_cache if query_cache is not None else QueryEmbeddingLRU()
+        self.chunk_max_tokens = max(8, int(chunk_max_tokens))
+        self.chunk_overlap_tokens = max(0, int(chunk_overlap_tokens))
         self.log = structlog.get_logger("qdrant_documents")
-        self._embedders: Dict[str, Any] = {}
+        self.models = model_registry or EmbeddingModelRegistry()
         self._model_dims: Dict[str, int] = {}
+        self._chunkers: Dict[str, StructuredChunker] = {}
+        self._ready_collections: Set[str] = set()
+        # Collections created with the named sparse vector; older ones stay dense-only.
+        self._sparse_collections: Set[str] = set()
+        self._collections_lock = threading.Lock()
+        # Query embeddings in flight; background migrations hold off while this is non-zero.
+        self._active_queries = 0
+        self._queries_idle = threading.Condition()
 
     def _request(
         self,
@@ -53,12 +317,7 @@ class QdrantDocumentsService:
         json_data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         try:
-            response = requests.request(
-                method=method,
-                url=f"{self.base}{path}",
-                json=json_data,
-                timeout=self.timeout,
-            )
+            response = self.transport.request(method, path, json_data=json_data)
         except requests.RequestException as exc:
             raise DocumentServiceError(503, "qdrant_unavailable", str(exc)) from exc
 
@@ -88,32 +347,36 @@ class QdrantDocumentsService:
         return f"{self.collection_prefix}_{safe_model}_{suffix}"
 
     def _get_embedder(self, model_used: str) -> Any:
-        embedder = self._embedders.get(model_used)
-        if embedder is not None:
-            return embedder
         try:
-            from sentence_transformers import SentenceTransformer
-        except Exception as exc:
-            raise DocumentServiceError(
-                500,
-                "embedding_dependency_missing",
-                "Install sentence-transformers to use local embedding models.",
-            ) from exc
+            return self.models.get(model_used)
+        except ModelLoadError as exc:
+            raise DocumentServiceError(500, exc.code, exc.detail) from exc
+        except EmbeddingWorkerError as exc:
+            # Worker pool timed out, died or is shutting down: transient, so 503.
+            raise DocumentServiceError(503, "embedding_worker_unavailable", str(exc)) from exc
+
+    @contextmanager
+    def _use_embedder(self, model_used: str) -> Iterator[Any]:
+        # Pins the model in the registry while encoding so it is not evicted mid-batch.
         try:
-            embedder = SentenceTransformer(model_used)
-        except Exception as exc:
-            raise DocumentServiceError(500, "embedding_model_load_failed", str(exc)) from exc
-        self._embedders[model_used] = embedder
-        return embedder
+            with self.models.use(model_used) as embedder:
+                yield embedder
+        except ModelLoadError as exc:
+            raise DocumentServiceError(500, exc.code, exc.detail) from exc
+        except EmbeddingWorkerError as exc:
+            raise DocumentServiceError(503, "embedding_worker_unavailable", str(exc)) from exc
 
     def _embed(self, text: str, model_used: str) -> List[float]:
-        embedder = self._get_embedder(model_used)
-        try:
-            vector = embedder.encode(text, normalize_embeddings=True)
-        except TypeError:
-            vector = embedder.encode(text)
-        except Exception as exc:
-            raise DocumentServiceError(500, "embedding_failed", str(exc)) from exc
+        # Single texts are queries and probes: they skip the on-disk cache, which is kept for chunks.
+        with self._use_embedder(model_used) as embedder:
+            try:
+                vector = embedder.encode(text, normalize_embeddings=True)
+            except TypeError:
+                vector = embedder.encode(text)
+            except EmbeddingWorkerError as exc:
+                raise DocumentServiceError(503, "embedding_worker_unavailable", str(exc)) from exc
+            except Exception as exc:
+                raise DocumentServiceError(500, "embedding_failed", str(exc)) from exc
 
         if hasattr(vector, "tolist"):
             vector = vector.tolist()
@@ -123,6 +386,100 @@ class QdrantDocumentsService:
             raise DocumentServiceError(500, "embedding_invalid_output")
         return [float(v) for v in vector]
 
+    def _embed_many(
+        self,
+        texts: List[str],
+        model_used: str,
+        batch_size: Optional[int] = None,
+    ) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.embedding_cache is None:
+            return self._encode_many(texts, model_used, batch_size)
+
+        keys = [text_key(text) for text in texts]
+        cached = self.embedding_cache.get_many(model_used, keys)
+        missing = [idx for idx in range(len(texts)) if idx not in cached]
+        computed: Optional[np.ndarray] = None
+        if missing:
+            computed = self._encode_many([texts[idx] for idx in missing], model_used, batch_size)
+            self.embedding_cache.put_many(model_used, [keys[idx] for idx in missing], computed)
+        dim = computed.shape[1] if computed is not None else len(next(iter(cached.values())))
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        for idx, vector in cached.items():
+            out[idx] = vector
+        if computed is not None:
+            out[missing] = computed
+        self.log.debug(
+            "embedding_cache_lookup",
+            model_used=model_used,
+            requested=len(texts),
+            hits=len(cached),
+            misses=len(missing),
+        )
+        return out
+
+    def _encode_many(
+        self,
+        texts: List[str],
+        model_used: str,
+        batch_size: Optional[int] = None,
+    ) -> np.ndarray:
+        size = max(1, int(batch_size or self.embed_batch_size))
+        out: Optional[np.ndarray] = None
+        with self._use_embedder(model_used) as embedder:
+            for start in range(0, len(texts), size):
+                batch = texts[start:start + size]
+                try:
+                    vectors = embedder.encode(
+                        batch,
+                        batch_size=size,
+                        normalize_embeddings=True,
+                        convert_to_numpy=True,
+                        show_progress_bar=False,
+                    )
+                except TypeError:
+                    vectors = embedder.encode(batch)
+                except EmbeddingWorkerError as exc:
+                    raise DocumentServiceError(503, "embedding_worker_unavailable", str(exc)) from exc
+                except Exception as exc:
+                    raise DocumentServiceError(500, "embedding_failed", str(exc)) from exc
+
+                try:
+                    matrix = np.asarray(vectors, dtype=np.float32)
+                except (TypeError, ValueError) as exc:
+                    raise DocumentServiceError(500, "embedding_invalid_output") from exc
+                if matrix.ndim == 1:
+                    matrix = matrix.reshape(1, -1)
+                if matrix.ndim != 2 or matrix.shape[0] != len(batch):
+                    raise DocumentServiceError(500, "embedding_invalid_output")
+                if out is None:
+                    out = np.empty((len(texts), matrix.shape[1]), dtype=np.float32)
+                elif matrix.shape[1] != out.shape[1]:
+                    raise DocumentServiceError(500, "embedding_invalid_output")
+                out[start:start + len(batch)] = matrix
+        return np.ascontiguousarray(out)
+
+    def _embed_query(self, query: str, model_used: str) -> Tuple[List[float], bool]:
+        cached = self.query_cache.get(model_used, query)
+        if cached is not None:
+            return cached, True
+        with self._queries_idle:
+            self._active_queries += 1
+        try:
+            vector = self._embed(query, model_used=model_used)
+        finally:
+            with self._queries_idle:
+                self._active_queries -= 1
+                if not self._active_queries:
+                    self._queries_idle.notify_all()
+        self.query_cache.put(model_used, query, vector)
+        return vector, False
+
+    def _wait_for_idle_queries(self, timeout: float = MIGRATION_YIELD_SECONDS) -> None:
+        with self._queries_idle:
+            self._queries_idle.wait_for(lambda: not self._active_queries, timeout=timeout)
+
     def _model_dim(self, model_used: str) -> int:
         cached = self._model_dims.get(model_used)
         if cached is not None:
@@ -131,39 +488,159 @@ class QdrantDocumentsService:
         self._model_dims[model_used] = dim
         return dim
 
+    def _collection_info(self, collection: str) -> Optional[Dict[str, Any]]:
+        return self.vector_store.collection_info(collection)
+
+    def _ensure_payload_indexes(self, collection: str, payload_schema: Dict[str, Any]) -> None:
+        for field, schema in PAYLOAD_INDEXES.items():
+            if field in payload_schema:
+                continue
+            try:
+                self.vector_store.create_payload_index(collection, field, schema)
+            except DocumentServiceError as exc:
+                # Filters still work without the index, just as full scans.
+                self.log.warning("qdrant_payload_index_failed", collection=collection, field=field, error=exc.details)
+
+    def _quantization_config(self) -> Optional[Dict[str, Any]]:
+        # scalar: int8 per dimension (4x smaller); binary: 1 bit per dimension (32x), best on 1024+ dims.
+        if self.quantization == "scalar":
+            return {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": self.quantization_always_ram}}
+        if self.quantization == "binary":
+            return {"binary": {"always_ram": self.quantization_always_ram}}
+        return None
+
+    def _search_params(self) -> Optional[Dict[str, Any]]:
+        # Fetch limit * oversampling candidates on quantized vectors, then rescore them on float32 originals.
+        if self.quantization == "none":
+            return None
+        return {"quantization": {"rescore": self.search_rescore, "oversampling": self.search_oversampling}}
+
+    def _migrate_quantization(self, collection: str, current: Optional[Dict[str, Any]]) -> None:
+        desired = self._quantization_config()
+        if current == desired or (desired is None and not current):
+            return
+        try:
+            # Qdrant drops an existing quantized copy when the config is "Disabled".
+            self.vector_store.update_collection(collection, quantization_config=desired or "Disabled")
+            self.log.info("collection_quantization_updated", collection=collection, quantization=self.quantization)
+        except DocumentServiceError as exc:
+            self.log.warning("collection_quantization_update_failed", collection=collection, error=str(exc))
+
     def _ensure_collection(self, model_used: str) -> str:
+        # Bootstraps each collection once per process: reads its vector size from the
+        # collection config (or creates it), then adds any missing payload indexes.
         collection = self._collection_name(model_used)
+        if collection in self._ready_collections:
+            return collection
+        with self._collections_lock:
+            if collection in self._ready_collections:
+                return collection
+            info = self._collection_info(collection)
+            if info is None:
+                self.vector_store.create_collection(
+                    collection,
+                    dim=self._model_dim(model_used),
+                    distance=self.distance,
+                    sparse_vectors={SPARSE_VECTOR_NAME: {"modifier": "idf"}},
+                    quantization_config=self._quantization_config(),
+                )
+                info = self._collection_info(collection) or {}
+            config = info.get("config") or {}
+            self._migrate_quantization(collection, config.get("quantization_config"))
+            params = config.get("params") or {}
+            vectors = params.get("vectors")
+            if isinstance(vectors, dict) and isinstance(vectors.get("size"), int):
+                self._model_dims.setdefault(model_used, vectors["size"])
+            if SPARSE_VECTOR_NAME in (params.get("sparse_vectors") or {}):
+                self._sparse_collections.add(collection)
+            self._ensure_payload_indexes(collection, info.get("payload_schema") or {})
+            self._ready_collections.add(collection)
+        return collection
+
+    def _retry_on_missing_collection(self, model_used: str, operation: Callable[[str], Any]) -> Any:
+        # A collection deleted or recreated outside this process 404s until it is bootstrapped again.
+        collection = self._ensure_collection(model_used)
         try:
-            self._request(
-                "PUT",
-                f"/collections/{collection}",
-                json_data={
-                    "vectors": {
-                        "size": self._model_dim(model_used),
-                        "distance": self.distance,
-                    }
-                },
-            )
+            return operation(collection)
         except DocumentServiceError as exc:
-            if exc.status_code != 409:
+            if exc.status_code != 404:
                 raise
-        return collection
+            self.log.warning("qdrant_collection_missing", collection=collection, model_used=model_used)
+            with self._collections_lock:
+                self._ready_collections.discard(collection)
+                self._sparse_collections.discard(collection)
+                self._model_dims.pop(model_used, None)
+            return operation(self._ensure_collection(model_used))
 
-    def _chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-        clean = " ".join(text.split())
-        if not clean:
-            return []
-        out: List[str] = []
-        start = 0
-        while start < len(clean):
-            end = min(len(clean), start + chunk_size)
-            out.append(clean[start:end])
-            if end >= len(clean):
-                break
-            start = max(0, end - overlap)
-        return out
+    def _chunking_signature(self) -> str:
+        return f"tokens:{self.chunk_max_tokens}:{self.chunk_overlap_tokens}"
+
+    def _token_counter(self, embedder: Any) -> TokenCounter:
+        tokenizer = getattr(embedder, "tokenizer", None)
+        if not callable(tokenizer):
+            return approximate_token_counts
 
-    def _extract_text(self, content: bytes, filename: str, mime_type: Optional[str]) -> Tuple[str, str]:
+        def _count(texts: List[str]) -> List[int]:
+            if not texts:
+                return []
+            encoded = tokenizer(texts, add_special_tokens=False, truncation=False)["input_ids"]
+            return [len(ids) for ids in encoded]
+
+        return _count
+
+    def _chunker(self, model_used: str) -> StructuredChunker:
+        chunker = self._chunkers.get(model_used)
+        if chunker is None:
+            embedder = self._get_embedder(model_used)
+            max_tokens = self.chunk_max_tokens
+            model_limit = getattr(embedder, "max_seq_length", None)
+            if isinstance(model_limit, int) and model_limit > 0:
+                # Leave room for the [CLS]/[SEP] tokens the model adds at encode time.
+                max_tokens = min(max_tokens, model_limit - 2)
+            chunker = StructuredChunker(
+                max_tokens=max_tokens,
+                overlap_tokens=self.chunk_overlap_tokens,
+                count_tokens=self._token_counter(embedder),
+            )
+            self._chunkers[model_used] = chunker
+        return chunker
+
+    def _chunk_text(self, text: str, model_used: str) -> List[str]:
+        return self._chunker(model_used).split(text)
+
+    def _spool(self, blocks: Iterable[bytes]) -> Tuple[str, str]:
+        # Write blocks to a temp file, hashing as they arrive; returns (path, sha256).
+        if self.spool_dir:
+            os.makedirs(self.spool_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="document-", dir=self.spool_dir)
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for block in blocks:
+                    if block:
+                        digest.update(block)
+                        out.write(block)
+        except BaseException:
+            self._discard_spool(path)
+            raise
+        return path, digest.hexdigest()
+
+    @staticmethod
+    def _discard_spool(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(SPOOL_CHUNK_BYTES), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _extract_text(self, path: str, filename: str, mime_type: Optional[str]) -> Tuple[str, str]:
         mime = (mime_type or "").lower()
         text = ""
         status = "indexed"
@@ -178,50 +655,160 @@ class QdrantDocumentsService:
                     "Install pypdf to extract text from PDF files.",
                 ) from exc
             try:
-                reader = PdfReader(io.BytesIO(content))
-                pages: List[str] = []
-                for page in reader.pages:
-                    page_text = page.extract_text() or ""
-                    if page_text.strip():
-                        pages.append(page_text)
+                if self.pdf_extractor is not None:
+                    page_texts = self.pdf_extractor.extract_pages(path)
+                else:
+                    page_texts = [page.extract_text() or "" for page in PdfReader(path).pages]
+                pages = [page_text for page_text in page_texts if page_text.strip()]
                 if pages:
                     text = "\n".join(pages)
                     return text, status
                 # Common for scanned PDFs without embedded text layer.
                 status = "indexed_pdf_no_text"
+            except PdfExtractionTimeout as exc:
+                raise DocumentServiceError(422, "pdf_text_extraction_timeout", str(exc)) from exc
             except Exception as exc:
                 raise DocumentServiceError(422, "pdf_text_extraction_failed", str(exc)) from exc
 
+        with open(path, "rb") as fh:
+            decoded = fh.read().decode("utf-8", errors="ignore")
         if mime.startswith("text/") or mime in {"application/json", "application/xml"}:
-            text = content.decode("utf-8", errors="ignore")
+            text = decoded
         else:
-            decoded = content.decode("utf-8", errors="ignore")
             if decoded.strip():
                 text = decoded
             else:
-                digest = hashlib.sha256(content).hexdigest()
+                digest = self._file_sha256(path)
                 text = f"binary document {filename} sha256 {digest}"
                 status = "indexed_metadata_only"
         return text, status
 
-    def _delete_document_points(self, collection: str, document_uuid: str) -> None:
-        self._request(
-            "POST",
-            f"/collections/{collection}/points/delete",
-            json_data={
-                "filter": {
-                    "must": [
-                        {
-                            "key": "document_uuid",
-                            "match": {"value": document_uuid},
-                        }
-                    ]
+    def _document_filter(self, document_uuid: str) -> Dict[str, Any]:
+        return {
+            "must": [
+                {
+                    "key": "document_uuid",
+                    "match": {"value": document_uuid},
                 }
-            },
+            ]
+        }
+
+    def _delete_document_tail(self, collection: str, document_uuid: str, chunk_count: int) -> None:
+        tail = self._document_filter(document_uuid)
+        tail["must"].append({"key": "chunk_index", "range": {"gte": chunk_count}})
+        self.vector_store.delete(collection, tail, wait=self.upsert_wait)
+
+    def _set_points_payload(self, collection: str, point_ids: List[str], payload: Dict[str, Any]) -> None:
+        for start in range(0, len(point_ids), 1024):
+            self.vector_store.set_payload(collection, point_ids[start:start + 1024], payload, wait=self.upsert_wait)
+
+    def _existing_chunk_hashes(self, collection: str, document_uuid: str) -> Dict[int, Optional[str]]:
+        hashes: Dict[int, Optional[str]] = {}
+        offset: Any = None
+        while True:
+            batch, offset = self._scroll_page(
+                collection,
+                self._document_filter(document_uuid),
+                offset=offset,
+                with_payload=["chunk_index", "chunk_sha256"],
+            )
+            for point in batch:
+                payload = point.get("payload") or {}
+                chunk_index = payload.get("chunk_index")
+                if isinstance(chunk_index, int):
+                    # Points written before chunk hashing have no chunk_sha256 and are always re-embedded.
+                    hashes[chunk_index] = payload.get("chunk_sha256")
+            if offset is None:
+                break
+        return hashes
+
+    def _upsert_points(self, collection: str, points: List[Dict[str, Any]]) -> None:
+        self.vector_store.upsert(collection, points, wait=self.upsert_wait)
+
+    def _count_points(self, collection: str, count_filter: Optional[Dict[str, Any]]) -> int:
+        return self.vector_store.count(collection, count_filter)
+
+    def _await_document_points(
+        self,
+        collection: str,
+        document_uuid: str,
+        indexed_at: str,
+        expected: int,
+    ) -> None:
+        current = self._document_filter(document_uuid)
+        current["must"].append({"key": "indexed_at", "match": {"value": indexed_at}})
+        stale = self._document_filter(document_uuid)
+        stale["must_not"] = [{"key": "indexed_at", "match": {"value": indexed_at}}]
+
+        deadline = time.monotonic() + self.upsert_confirm_timeout
+        delay = 0.05
+        while True:
+            applied = self._count_points(collection, current)
+            remaining = self._count_points(collection, stale)
+            if applied >= expected and remaining == 0:
+                return
+            if time.monotonic() >= deadline:
+                raise DocumentServiceError(
+                    504,
+                    "qdrant_upsert_unconfirmed",
+                    {
+                        "document_uuid": document_uuid,
+                        "expected_points": expected,
+                        "applied_points": applied,
+                        "stale_points": remaining,
+                    },
+                )
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    def _point_vector(self, collection: str, dense: List[float], text: str) -> Any:
+        if collection not in self._sparse_collections:
+            return dense
+        # "" is Qdrant's name for the unnamed default dense vector.
+        # BM25 length normalization against the chunker's target size, which most chunks fill.
+        return {"": dense, SPARSE_VECTOR_NAME: document_sparse_vector(text, avg_len=self.chunk_max_tokens)}
+
+    def _point_id(self, model_used: str, document_uuid: str, chunk_index: int) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{model_used}:{document_uuid}:{chunk_index}"))
+
+    def _document_payload(
+        self,
+        *,
+        document_uuid: str,
+        filename: str,
+        mime_type: Optional[str],
+        source_type: str,
+        bayleaf_document_uuid: Optional[str],
+        status: str,
+        indexed_at: str,
+        content_sha256: str,
+        model_used: str,
+        chunk_count: int,
+    ) -> Dict[str, Any]:
+        return {
+            "document_uuid": document_uuid,
+            "name": filename,
+            "description": None,
+            "mime_type": mime_type,
+            "source_type": source_type,
+            "is_bayleaf": source_type == "bayleaf",
+            "bayleaf_document_uuid": bayleaf_document_uuid,
+            "model_used": model_used,
+            "status": status,
+            "indexed_at": indexed_at,
+            "content_sha256": content_sha256,
+            "chunking": self._chunking_signature(),
+            "chunk_count": chunk_count,
+        }
+
+    def _index_payload(self, **fields: Any) -> Dict[str, Any]:
+        return self._retry_on_missing_collection(
+            fields["model_used"], lambda collection: self._write_document(collection, **fields)
         )
 
-    def _index_payload(
+    def _write_document(
         self,
+        collection: str,
         *,
         document_uuid: str,
         filename: str,
@@ -232,46 +819,83 @@ class QdrantDocumentsService:
         status: str,
         content_sha256: str,
         model_used: str,
+        progress: Optional[IndexProgress] = None,
     ) -> Dict[str, Any]:
-        collection = self._ensure_collection(model_used)
-        chunks = self._chunk_text(text)
+        chunks = self._chunk_text(text, model_used)
         if not chunks:
             chunks = [f"empty document {filename}"]
             status = "indexed_empty"
 
         indexed_at = datetime.now(timezone.utc).isoformat()
-        points: List[Dict[str, Any]] = []
         chunk_count = len(chunks)
-        for idx, chunk in enumerate(chunks):
-            point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{model_used}:{document_uuid}:{idx}"))
-            points.append(
+        chunk_hashes = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+        existing_hashes = self._existing_chunk_hashes(collection, document_uuid)
+        # Point ids are deterministic per (model, document, chunk index), so a chunk whose
+        # text is unchanged keeps its point and vector; only its document-level payload moves on.
+        reused = [idx for idx, digest in enumerate(chunk_hashes) if existing_hashes.get(idx) == digest]
+        reused_set = set(reused)
+        changed = [idx for idx in range(chunk_count) if idx not in reused_set]
+
+        document_payload = self._document_payload(
+            document_uuid=document_uuid,
+            filename=filename,
+            mime_type=mime_type,
+            source_type=source_type,
+            bayleaf_document_uuid=bayleaf_document_uuid,
+            status=status,
+            indexed_at=indexed_at,
+            content_sha256=content_sha256,
+            model_used=model_used,
+            chunk_count=chunk_count,
+        )
+
+        chunks_done = len(reused)
+        if progress:
+            progress(chunks_done, chunk_count)
+
+        # Embed and upsert changed chunks in fixed-size batches so request bodies and
+        # vector buffers stay bounded regardless of document size.
+        for start in range(0, len(changed), self.upsert_batch_size):
+            batch = changed[start:start + self.upsert_batch_size]
+            vectors = self._embed_many([chunks[idx] for idx in batch], model_used=model_used)
+            points = [
                 {
-                    "id": point_id,
-                    "vector": self._embed(chunk, model_used=model_used),
+                    "id": self._point_id(model_used, document_uuid, idx),
+                    "vector": self._point_vector(collection, vectors[offset].tolist(), chunks[idx]),
                     "payload": {
-                        "document_uuid": document_uuid,
-                        "name": filename,
-                        "description": None,
-                        "mime_type": mime_type,
-                        "source_type": source_type,
-                        "is_bayleaf": source_type == "bayleaf",
-                        "bayleaf_document_uuid": bayleaf_document_uuid,
-                        "model_used": model_used,
-                        "status": status,
-                        "indexed_at": indexed_at,
-                        "content_sha256": content_sha256,
+                        **document_payload,
                         "chunk_index": idx,
-                        "chunk_count": chunk_count,
-                        "text_chunk": chunk,
+                        "chunk_sha256": chunk_hashes[idx],
+                        "text_chunk": chunks[idx],
                     },
                 }
+                for offset, idx in enumerate(batch)
+            ]
+            self._upsert_points(collection, points)
+            chunks_done += len(batch)
+            if progress:
+                progress(chunks_done, chunk_count)
+
+        if reused:
+            self._set_points_payload(
+                collection,
+                [self._point_id(model_used, document_uuid, idx) for idx in reused],
+                document_payload,
             )
+        if any(idx >= chunk_count for idx in existing_hashes):
+            self._delete_document_tail(collection, document_uuid, chunk_count)
+        if not self.upsert_wait:
+            self._await_document_points(collection, document_uuid, indexed_at, chunk_count)
+        if self.catalog is not None:
+            self.catalog.safe_upsert(document_payload)
 
-        self._delete_document_points(collection, document_uuid)
-        self._request(
-            "PUT",
-            f"/collections/{collection}/points?wait=true",
-            json_data={"points": points},
+        self.log.info(
+            "document_indexed",
+            document_uuid=document_uuid,
+            model_used=model_used,
+            chunk_count=chunk_count,
+            embedded_chunks=len(changed),
+            reused_chunks=len(reused),
         )
 
         return {
@@ -286,19 +910,22 @@ class QdrantDocumentsService:
             "model_used": model_used,
         }
 
-    def _download_file(self, url: str) -> Tuple[bytes, str, Optional[str]]:
+    def _download_file(self, url: str) -> Tuple[str, str, Optional[str], str]:
+        # Returns (spool path, filename, content type, sha256); the caller removes the file.
         try:
-            r = requests.get(url, timeout=self.timeout)
-            r.raise_for_status()
+            with requests.get(url, timeout=self.timeout, stream=True) as r:
+                r.raise_for_status()
+                path, digest = self._spool(r.iter_content(chunk_size=SPOOL_CHUNK_BYTES))
+                headers = r.headers
         except requests.RequestException as exc:
             raise DocumentServiceError(502, "document_download_failed", str(exc)) from exc
 
         parsed = urlparse(url)
         filename = parsed.path.rsplit("/", 1)[-1] or "document.bin"
-        disposition = r.headers.get("content-disposition", "")
+        disposition = headers.get("content-disposition", "")
         if "filename=" in disposition:
             filename = disposition.split("filename=", 1)[1].strip().strip('"')
-        return r.content, filename, r.headers.get("content-type")
+        return path, filename, headers.get("content-type"), digest
 
     def _extract_download_url(self, data: Dict[str, Any]) -> Optional[str]:
         def _pick_url(payload: Dict[str, Any]) -> Optional[str]:
@@ -323,13 +950,16 @@ class QdrantDocumentsService:
 
         return None
 
-    def index_document(
+    def _prepare_bayleaf_document(
         self,
+        *,
         document_uuid: str,
         principal: Principal,
-        model_used: Optional[str] = None,
+        model_used: str,
+        force: bool,
     ) -> Dict[str, Any]:
-        model = self._resolve_model(model_used)
+        # Download and extraction half of index_document. Returns either the unchanged
+        # summary under "indexed" or the keyword arguments for _index_payload.
         data = self.bayleaf.document_download_url(
             document_uuid=document_uuid,
             principal=principal,
@@ -343,33 +973,161 @@ class QdrantDocumentsService:
         if not download_url:
             raise DocumentServiceError(502, "missing_download_url", data)
 
-        content, filename, mime_type = self._download_file(str(download_url))
-        text, status = self._extract_text(content, filename, mime_type)
-        digest = hashlib.sha256(content).hexdigest()
-        return self._index_payload(
+        path, filename, mime_type, digest = self._download_file(str(download_url))
+        try:
+            if not force:
+                unchanged = self._unchanged_index(
+                    document_uuid=document_uuid,
+                    model_used=model_used,
+                    content_sha256=digest,
+                )
+                if unchanged is not None:
+                    return {"indexed": unchanged}
+            text, status = self._extract_text(path, filename, mime_type)
+        finally:
+            self._discard_spool(path)
+        return {
+            "payload": {
+                "document_uuid": document_uuid,
+                "filename": filename,
+                "mime_type": mime_type,
+                "source_type": "bayleaf",
+                "bayleaf_document_uuid": document_uuid,
+                "text": text,
+                "status": status,
+                "content_sha256": digest,
+                "model_used": model_used,
+            }
+        }
+
+    def index_document(
+        self,
+        document_uuid: str,
+        principal: Principal,
+        model_used: Optional[str] = None,
+        force: bool = False,
+        progress: Optional[IndexProgress] = None,
+    ) -> Dict[str, Any]:
+        model = self._resolve_model(model_used)
+        prepared = self._prepare_bayleaf_document(
             document_uuid=document_uuid,
-            filename=filename,
-            mime_type=mime_type,
-            source_type="bayleaf",
-            bayleaf_document_uuid=document_uuid,
-            text=text,
-            status=status,
-            content_sha256=digest,
+            principal=principal,
             model_used=model,
+            force=force,
         )
+        if "indexed" in prepared:
+            return prepared["indexed"]
+        return self._index_payload(**prepared["payload"], progress=progress)
+
+    def index_documents_bulk(
+        self,
+        document_uuids: List[str],
+        principal: Principal,
+        model_used: Optional[str] = None,
+        force: bool = False,
+    ) -> List[Dict[str, Any]]:
+        model = self._resolve_model(model_used)
+        ordered = [doc_id for doc_id in dict.fromkeys(str(d).strip() for d in document_uuids) if doc_id]
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = iter(ordered)
+        in_flight: Dict[Future, str] = {}
+        started = time.monotonic()
+
+        # Downloads and text extraction run concurrently on the pool; embedding and
+        # upserts stay on this thread so every document shares one batched embedder.
+        # At most 2x workers prepared documents are held in memory at once.
+        with ThreadPoolExecutor(max_workers=self.bulk_workers, thread_name_prefix="bulk-index") as pool:
+
+            def _submit_next() -> None:
+                doc_id = next(pending, None)
+                if doc_id is not None:
+                    future = pool.submit(
+                        self._prepare_bayleaf_document,
+                        document_uuid=doc_id,
+                        principal=principal,
+                        model_used=model,
+                        force=force,
+                    )
+                    in_flight[future] = doc_id
+
+            for _ in range(self.bulk_workers * 2):
+                _submit_next()
+
+            while in_flight:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    doc_id = in_flight.pop(future)
+                    _submit_next()
+                    try:
+                        prepared = future.result()
+                        indexed = prepared.get("indexed") or self._index_payload(**prepared["payload"])
+                        results[doc_id] = {"document_uuid": doc_id, "ok": True, "document": indexed, "error": None}
+                    except DocumentServiceError as exc:
+                        results[doc_id] = {
+                            "document_uuid": doc_id,
+                            "ok": False,
+                            "document": None,
+                            "error": {"error": exc.message, "status_code": exc.status_code, "details": exc.details},
+                        }
+                    except Exception as exc:
+                        # e.g. a connection error for one document must not lose the others' results.
+                        self.log.warning("document_bulk_index_failed", document_uuid=doc_id, error=str(exc))
+                        results[doc_id] = {
+                            "document_uuid": doc_id,
+                            "ok": False,
+                            "document": None,
+                            "error": {"error": "document_index_failed", "status_code": 500, "details": str(exc)},
+                        }
+
+        out = [results[doc_id] for doc_id in ordered]
+        self.log.info(
+            "documents_bulk_indexed",
+            model_used=model,
+            requested=len(ordered),
+            indexed=sum(1 for r in out if r["ok"]),
+            failed=sum(1 for r in out if not r["ok"]),
+            elapsed_ms=int((time.monotonic() - started) * 1000),
+        )
+        return out
 
     def index_uploaded_document(
         self,
         *,
         filename: str,
-        content: bytes,
+        fileobj: BinaryIO,
+        mime_type: Optional[str],
+        model_used: Optional[str] = None,
+        progress: Optional[IndexProgress] = None,
+    ) -> Dict[str, Any]:
+        path, digest = self._spool(iter(lambda: fileobj.read(SPOOL_CHUNK_BYTES), b""))
+        try:
+            return self.index_uploaded_file(
+                filename=filename,
+                path=path,
+                mime_type=mime_type,
+                model_used=model_used,
+                progress=progress,
+                content_sha256=digest,
+            )
+        finally:
+            self._discard_spool(path)
+
+    def index_uploaded_file(
+        self,
+        *,
+        filename: str,
+        path: str,
         mime_type: Optional[str],
         model_used: Optional[str] = None,
+        progress: Optional[IndexProgress] = None,
+        content_sha256: Optional[str] = None,
+        document_uuid: Optional[str] = None,
     ) -> Dict[str, Any]:
+        # Background jobs pass the uuid chosen at submit time, so a rerun replaces its own points.
         model = self._resolve_model(model_used)
-        document_uuid = str(uuid.uuid4())
-        text, status = self._extract_text(content, filename, mime_type)
-        digest = hashlib.sha256(content).hexdigest()
+        document_uuid = document_uuid or str(uuid.uuid4())
+        text, status = self._extract_text(path, filename, mime_type)
+        digest = content_sha256 or self._file_sha256(path)
         return self._index_payload(
             document_uuid=document_uuid,
             filename=filename,
@@ -380,96 +1138,178 @@ class QdrantDocumentsService:
             status=status,
             content_sha256=digest,
             model_used=model,
+            progress=progress,
         )
 
+    def _scroll_page(
+        self,
+        collection: str,
+        scroll_filter: Optional[Dict[str, Any]] = None,
+        *,
+        limit: int = 256,
+        offset: Any = None,
+        with_payload: Any = True,
+    ) -> Tuple[List[Dict[str, Any]], Any]:
+        return self.vector_store.scroll(collection, scroll_filter, limit=limit, offset=offset, with_payload=with_payload)
+
     def _scroll_collection(
         self,
         collection: str,
         scroll_filter: Optional[Dict[str, Any]] = None,
+        *,
+        with_payload: Any = True,
     ) -> List[Dict[str, Any]]:
         points: List[Dict[str, Any]] = []
         offset: Any = None
         while True:
-            payload: Dict[str, Any] = {
-                "limit": 256,
-                "with_payload": True,
-                "with_vector": False,
-            }
-            if scroll_filter:
-                payload["filter"] = scroll_filter
-            if offset is not None:
-                payload["offset"] = offset
-            try:
-                data = self._request(
-                    "POST",
-                    f"/collections/{collection}/points/scroll",
-                    json_data=payload,
-                )
-            except DocumentServiceError as exc:
-                if exc.status_code == 404:
-                    return []
-                raise
-
-            result = data.get("result") or {}
-            batch = result.get("points") or []
+            batch, offset = self._scroll_page(collection, scroll_filter, offset=offset, with_payload=with_payload)
             points.extend(batch)
-            offset = result.get("next_page_offset")
             if offset is None:
                 break
         return points
 
-    def _find_latest_document_points(self, document_uuid: str) -> Tuple[str, List[Dict[str, Any]]]:
-        latest_model = ""
-        latest_points: List[Dict[str, Any]] = []
-        latest_ts = ""
-        for model in self.allowed_models:
+    def _document_summary(
+        self,
+        document_uuid: str,
+        payload: Dict[str, Any],
+        chunks: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "uuid": document_uuid,
+            "name": payload.get("name"),
+            "description": payload.get("description"),
+            "status": payload.get("status"),
+            "is_bayleaf": bool(payload.get("is_bayleaf")),
+            "source_type": payload.get("source_type"),
+            "indexed_at": payload.get("indexed_at"),
+            "chunks": payload.get("chunk_count") or chunks or 0,
+            "model_used": payload.get("model_used"),
+        }
+
+    def _unchanged_index(
+        self,
+        *,
+        document_uuid: str,
+        model_used: str,
+        content_sha256: str,
+    ) -> Optional[Dict[str, Any]]:
+        collection = self._collection_name(model_used)
+        points, _ = self._scroll_page(collection, self._document_filter(document_uuid), limit=1)
+        if not points:
+            return None
+        payload = (points[0] or {}).get("payload") or {}
+        if (
+            payload.get("content_sha256") != content_sha256
+            or payload.get("chunking") != self._chunking_signature()
+            or payload.get("model_used") != model_used
+        ):
+            return None
+        # Only trust an index whose last run completed: every chunk must carry the same indexed_at.
+        complete = self._document_filter(document_uuid)
+        complete["must"].append({"key": "indexed_at", "match": {"value": payload.get("indexed_at")}})
+        if self._count_points(collection, complete) != int(payload.get("chunk_count") or 0):
+            return None
+        self.log.info(
+            "document_index_unchanged",
+            document_uuid=document_uuid,
+            model_used=model_used,
+            content_sha256=content_sha256,
+        )
+        return self._document_summary(document_uuid, payload)
+
+    def _probe_document(self, document_uuid: str) -> Tuple[str, Dict[str, Any], int]:
+        # Newest index of a document across model collections as (model, payload, point count).
+        # Every collection is probed concurrently with a limit=1 scroll plus an exact count.
+        doc_filter = self._document_filter(document_uuid)
+
+        def _probe(model: str) -> Tuple[str, Optional[Dict[str, Any]], int]:
             collection = self._collection_name(model)
-            points = self._scroll_collection(
-                collection,
-                {
-                    "must": [
-                        {
-                            "key": "document_uuid",
-                            "match": {"value": document_uuid},
-                        }
-                    ]
-                },
-            )
+            points, _ = self._scroll_page(collection, doc_filter, limit=1, with_payload={"exclude": ["text_chunk"]})
             if not points:
+                return model, None, 0
+            return model, (points[0] or {}).get("payload") or {}, self._count_points(collection, doc_filter)
+
+        if len(self.allowed_models) == 1:
+            probes = [_probe(self.allowed_models[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(self.allowed_models), thread_name_prefix="qdrant-probe") as pool:
+                probes = list(pool.map(_probe, self.allowed_models))
+
+        latest: Optional[Tuple[str, Dict[str, Any], int]] = None
+        latest_ts = ""
+        for model, payload, count in probes:
+            if payload is None:
                 continue
-            ts = str(((points[0] or {}).get("payload") or {}).get("indexed_at", ""))
+            ts = str(payload.get("indexed_at", ""))
             if ts >= latest_ts:
                 latest_ts = ts
-                latest_model = model
-                latest_points = points
-        if not latest_points:
+                latest = (model, payload, count)
+        if latest is None:
             raise DocumentServiceError(404, "document_not_found")
-        return latest_model, latest_points
+        return latest
+
+    def _find_latest_document_points(self, document_uuid: str) -> Tuple[str, List[Dict[str, Any]]]:
+        model, _, _ = self._probe_document(document_uuid)
+        points = self._scroll_collection(self._collection_name(model), self._document_filter(document_uuid))
+        if not points:
+            raise DocumentServiceError(404, "document_not_found")
+        return model, points
+
+    def _latest_document_payloads(self, model: str) -> Dict[str, Dict[str, Any]]:
+        # Newest document-level payload per document in one model's collection.
+        latest: Dict[str, Dict[str, Any]] = {}
+        collection = self._collection_name(model)
+        for point in self._scroll_collection(collection, with_payload={"exclude": ["text_chunk"]}):
+            payload = point.get("payload") or {}
+            doc_uuid = payload.get("document_uuid")
+            if not doc_uuid:
+                continue
+            current = latest.get(doc_uuid)
+            if current is None or str(payload.get("indexed_at", "")) > str(current.get("indexed_at", "")):
+                latest[doc_uuid] = payload
+        return latest
+
+    def _read_catalog(self, read: Callable[[DocumentCatalog], Any]) -> Any:
+        # None means "scroll Qdrant instead": no catalog, not backfilled yet, or a failed read.
+        if self.catalog is None or not self.catalog.ready:
+            return None
+        try:
+            return read(self.catalog)
+        except SQLAlchemyError as exc:
+            self.log.warning("document_catalog_read_failed", error=str(exc))
+            return None
 
     def documents_available(self) -> List[Dict[str, Any]]:
+        listed = self._read_catalog(lambda catalog: catalog.list_latest(self.allowed_models))
+        if listed is not None:
+            return listed
         docs: Dict[str, Dict[str, Any]] = {}
         for model in self.allowed_models:
-            collection = self._collection_name(model)
-            for point in self._scroll_collection(collection):
-                payload = point.get("payload") or {}
-                doc_uuid = payload.get("document_uuid")
-                if not doc_uuid:
-                    continue
+            for doc_uuid, payload in self._latest_document_payloads(model).items():
                 current = docs.get(doc_uuid)
                 if current is None or str(payload.get("indexed_at", "")) > str(current.get("indexed_at", "")):
-                    docs[doc_uuid] = {
-                        "uuid": doc_uuid,
-                        "name": payload.get("name"),
-                        "description": payload.get("description"),
-                        "status": payload.get("status"),
-                        "is_bayleaf": bool(payload.get("is_bayleaf")),
-                        "source_type": payload.get("source_type"),
-                        "indexed_at": payload.get("indexed_at"),
-                        "chunks": payload.get("chunk_count") or 0,
-                        "model_used": payload.get("model_used"),
-                    }
+                    docs[doc_uuid] = self._document_summary(doc_uuid, payload)
         return sorted(docs.values(), key=lambda d: d.get("indexed_at") or "", reverse=True)
 
+    def rebuild_document_catalog(self) -> int:
+        if self.catalog is None:
+            return 0
+        payloads: List[Dict[str, Any]] = []
+        for model in self.allowed_models:
+            for payload in self._latest_document_payloads(model).values():
+                payloads.append({**payload, "model_used": payload.get("model_used") or model})
+        count = self.catalog.rebuild(payloads, self.allowed_models)
+        self.log.info("document_catalog_rebuilt", entries=count)
+        return count
+
+    def backfill_document_catalog(self) -> None:
+        # Startup: fill the catalog from Qdrant once, then let reads use it.
+        if self.catalog is None:
+            return
+        if not self.catalog.is_backfilled():
+            self.rebuild_document_catalog()
+        self.catalog.mark_ready()
+
     def _extract_document_uuids(self, payload: Any) -> Set[str]:
         collected: Set[str] = set()
         uuid_pattern = re.compile(
@@ -528,30 +1368,23 @@ class QdrantDocumentsService:
         return resolved
 
     def get_document(self, document_uuid: str) -> Dict[str, Any]:
-        _, points = self._find_latest_document_points(document_uuid=document_uuid)
-        payload = (points[0] or {}).get("payload") or {}
-        return {
-            "uuid": document_uuid,
-            "name": payload.get("name"),
-            "description": payload.get("description"),
-            "status": payload.get("status"),
-            "is_bayleaf": bool(payload.get("is_bayleaf")),
-            "source_type": payload.get("source_type"),
-            "indexed_at": payload.get("indexed_at"),
-            "chunks": payload.get("chunk_count") or len(points),
-            "model_used": payload.get("model_used"),
-        }
+        summary = self._read_catalog(lambda catalog: catalog.get_latest(document_uuid, self.allowed_models))
+        if summary is not None:
+            return summary
+        _, payload, count = self._probe_document(document_uuid)
+        return self._document_summary(document_uuid, payload, chunks=count)
 
     def reindex_document(
         self,
         document_uuid: str,
         principal: Principal,
         model_used: Optional[str] = None,
+        force: bool = False,
+        progress: Optional[IndexProgress] = None,
     ) -> Dict[str, Any]:
-        source_model, source_points = self._find_latest_document_points(document_uuid=document_uuid)
+        source_model, payload, _ = self._probe_document(document_uuid)
         target_model = self._resolve_model(model_used or source_model)
 
-        payload = (source_points[0] or {}).get("payload") or {}
         source_type = payload.get("source_type")
         bayleaf_document_uuid = payload.get("bayleaf_document_uuid") or payload.get("bayleaf_document_version_uuid")
         if source_type == "bayleaf" and bayleaf_document_uuid:
@@ -559,8 +1392,21 @@ class QdrantDocumentsService:
                 document_uuid=str(bayleaf_document_uuid),
                 principal=principal,
                 model_used=target_model,
+                force=force,
+                progress=progress,
+            )
+
+        if not force and payload.get("content_sha256"):
+            unchanged = self._unchanged_index(
+                document_uuid=document_uuid,
+                model_used=target_model,
+                content_sha256=str(payload.get("content_sha256")),
             )
+            if unchanged is not None:
+                return unchanged
 
+        # Uploaded documents are rebuilt from their stored chunks, so only this path reads them.
+        _, source_points = self._find_latest_document_points(document_uuid=document_uuid)
         sorted_points = sorted(source_points, key=lambda p: (p.get("payload") or {}).get("chunk_index", 0))
         text = "\n".join((p.get("payload") or {}).get("text_chunk", "") for p in sorted_points).strip()
         filename = payload.get("name") or f"{document_uuid}.txt"
@@ -577,6 +1423,7 @@ class QdrantDocumentsService:
             status=status,
             content_sha256=digest,
             model_used=target_model,
+            progress=progress,
         )
 
     def _query_collection(
@@ -586,22 +1433,26 @@ class QdrantDocumentsService:
         vector: List[float],
         limit: int,
         query_filter: Optional[Dict[str, Any]],
+        sparse_vector: Optional[Dict[str, List]] = None,
     ) -> List[Dict[str, Any]]:
-        payload: Dict[str, Any] = {
-            "vector": vector,
-            "limit": limit,
-            "with_payload": True,
-            "with_vector": False,
-        }
-        if query_filter:
-            payload["filter"] = query_filter
-        try:
-            data = self._request("POST", f"/collections/{collection}/points/search", json_data=payload)
-        except DocumentServiceError as exc:
-            if exc.status_code == 404:
-                return []
-            raise
-        return data.get("result") or []
+        if sparse_vector is not None:
+            return self.vector_store.fused_search(
+                collection,
+                vector,
+                sparse_vector,
+                sparse_name=SPARSE_VECTOR_NAME,
+                limit=limit,
+                query_filter=query_filter,
+                fusion=self.fusion,
+                search_params=self._search_params(),
+            )
+        return self.vector_store.search(
+            collection,
+            vector,
+            limit=limit,
+            query_filter=query_filter,
+            search_params=self._search_params(),
+        )
 
     def _build_query_filter(
         self,
@@ -640,61 +1491,429 @@ class QdrantDocumentsService:
         document_uuids: Optional[List[str]] = None,
         source_type: Optional[str] = None,
         is_bayleaf: Optional[bool] = None,
+        retrieval_mode: Optional[str] = None,
+        all_models: bool = False,
     ) -> Dict[str, Any]:
         if not query.strip():
             raise DocumentServiceError(400, "query_required")
         if top_k < 1 or top_k > 50:
             raise DocumentServiceError(400, "invalid_top_k", {"top_k": top_k, "min": 1, "max": 50})
+        requested_mode = retrieval_mode or self.retrieval_mode
+        if requested_mode not in RETRIEVAL_MODES:
+            raise DocumentServiceError(
+                400,
+                "invalid_retrieval_mode",
+                {"retrieval_mode": requested_mode, "allowed": list(RETRIEVAL_MODES)},
+            )
 
-        model = self._resolve_model(model_used)
-        collection = self._ensure_collection(model)
         query_filter = self._build_query_filter(
             document_uuid=document_uuid,
             document_uuids=document_uuids,
             source_type=source_type,
             is_bayleaf=is_bayleaf,
         )
-        vector = self._embed(query, model_used=model)
+        if all_models:
+            return self._query_all_models(
+                query=query,
+                top_k=top_k,
+                query_filter=query_filter,
+                requested_mode=requested_mode,
+            )
+
+        model = self._resolve_model(model_used)
+        branch = self._search_model(
+            query=query,
+            model=model,
+            limit=top_k,
+            query_filter=query_filter,
+            requested_mode=requested_mode,
+        )
+        chunks = [self._retrieved_chunk(item.get("score"), item.get("payload") or {}) for item in branch["matches"]]
+        mode = branch["retrieval_mode"]
+
+        return {
+            "query": query,
+            "top_k": top_k,
+            "model_used": model,
+            "chunks": chunks,
+            "trace": {
+                "trace_id": f"retr_{uuid.uuid4().hex[:12]}",
+                "retrieved_at": datetime.now(timezone.utc).isoformat(),
+                "collection": branch["collection"],
+                "model_used": model,
+                "query_filter": query_filter,
+                "requested_top_k": top_k,
+                "returned_chunks": len(chunks),
+                "query_embedding_cache": branch["query_embedding_cache"],
+                "retrieval_mode": mode,
+                "requested_retrieval_mode": requested_mode,
+                "fusion": self.fusion if mode == "hybrid" else None,
+                "quantization": self.quantization,
+            },
+        }
+
+    def _search_model(
+        self,
+        *,
+        query: str,
+        model: str,
+        limit: int,
+        query_filter: Optional[Dict[str, Any]],
+        requested_mode: str,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        collection = self._ensure_collection(model)
+        vector, query_cache_hit = self._embed_query(query, model)
+        embedded = time.perf_counter()
+        # Collections created before sparse vectors existed fall back to dense search.
+        mode = "hybrid" if requested_mode == "hybrid" and collection in self._sparse_collections else "dense"
+        sparse_vector = query_sparse_vector(query) if mode == "hybrid" else None
+        if sparse_vector is not None and not sparse_vector["indices"]:
+            mode, sparse_vector = "dense", None
         matches = self._query_collection(
             collection=collection,
             vector=vector,
-            limit=top_k,
+            limit=limit,
             query_filter=query_filter,
+            sparse_vector=sparse_vector,
         )
+        return {
+            "matches": matches,
+            "collection": collection,
+            "retrieval_mode": mode,
+            "query_embedding_cache": "hit" if query_cache_hit else "miss",
+            "embed_ms": round((embedded - started) * 1000, 2),
+            "search_ms": round((time.perf_counter() - embedded) * 1000, 2),
+        }
 
-        trace_id = f"retr_{uuid.uuid4().hex[:12]}"
-        retrieved_at = datetime.now(timezone.utc).isoformat()
-        chunks: List[Dict[str, Any]] = []
-        for item in matches:
-            payload = item.get("payload") or {}
-            chunks.append(
-                {
-                    "score": item.get("score"),
-                    "document_uuid": payload.get("document_uuid"),
-                    "name": payload.get("name"),
-                    "description": payload.get("description"),
-                    "chunk_index": payload.get("chunk_index"),
-                    "chunk_count": payload.get("chunk_count"),
-                    "text_chunk": payload.get("text_chunk"),
-                    "model_used": payload.get("model_used"),
-                    "source_type": payload.get("source_type"),
-                    "is_bayleaf": payload.get("is_bayleaf"),
-                    "indexed_at": payload.get("indexed_at"),
-                }
+    def _retrieved_chunk(self, score: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "score": score,
+            "document_uuid": payload.get("document_uuid"),
+            "name": payload.get("name"),
+            "description": payload.get("description"),
+            "chunk_index": payload.get("chunk_index"),
+            "chunk_count": payload.get("chunk_count"),
+            "text_chunk": payload.get("text_chunk"),
+            "model_used": payload.get("model_used"),
+            "source_type": payload.get("source_type"),
+            "is_bayleaf": payload.get("is_bayleaf"),
+            "indexed_at": payload.get("indexed_at"),
+        }
+
+    def _query_all_models(
+        self,
+        *,
+        query: str,
+        top_k: int,
+        query_filter: Optional[Dict[str, Any]],
+        requested_mode: str,
+    ) -> Dict[str, Any]:
+        # Scores from different embedding models are not comparable, so branches are
+        # merged by rank (RRF). A chunk with the same text in several models is counted
+        # once per model and keeps the payload of the model that ranked it highest.
+        started = time.perf_counter()
+
+        def _branch(model: str) -> Dict[str, Any]:
+            return self._search_model(
+                query=query,
+                model=model,
+                limit=top_k,
+                query_filter=query_filter,
+                requested_mode=requested_mode,
             )
 
+        branches: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, DocumentServiceError] = {}
+        with ThreadPoolExecutor(max_workers=len(self.allowed_models), thread_name_prefix="query-fanout") as pool:
+            futures = {model: pool.submit(_branch, model) for model in self.allowed_models}
+            for model, future in futures.items():
+                try:
+                    branches[model] = future.result()
+                except DocumentServiceError as exc:
+                    errors[model] = exc
+        if not branches:
+            raise next(iter(errors.values()))
+
+        fused: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for model, branch in branches.items():
+            for rank, item in enumerate(branch["matches"]):
+                payload = item.get("payload") or {}
+                # Chunk boundaries differ per model (tokenizer, max_seq_length), so the same
+                # chunk_index can hold different text; only identical text is fused.
+                text_hash = payload.get("chunk_sha256") or hashlib.sha256(
+                    str(payload.get("text_chunk") or "").encode("utf-8")
+                ).hexdigest()
+                key = (payload.get("document_uuid"), text_hash)
+                entry = fused.setdefault(key, {"score": 0.0, "rank": rank, "payload": payload})
+                entry["score"] += 1.0 / (RRF_K + rank + 1)
+                if rank < entry["rank"]:
+                    entry["rank"], entry["payload"] = rank, payload
+        ranked = sorted(fused.values(), key=lambda entry: -entry["score"])[:top_k]
+        chunks = [self._retrieved_chunk(entry["score"], entry["payload"]) for entry in ranked]
+
+        models_trace: Dict[str, Dict[str, Any]] = {}
+        for model in self.allowed_models:
+            if model in branches:
+                branch = branches[model]
+                models_trace[model] = {
+                    "collection": branch["collection"],
+                    "retrieval_mode": branch["retrieval_mode"],
+                    "query_embedding_cache": branch["query_embedding_cache"],
+                    "returned_chunks": len(branch["matches"]),
+                    "embed_ms": branch["embed_ms"],
+                    "search_ms": branch["search_ms"],
+                }
+            else:
+                models_trace[model] = {"error": errors[model].message, "status_code": errors[model].status_code}
         return {
             "query": query,
             "top_k": top_k,
-            "model_used": model,
+            "model_used": ALL_MODELS,
             "chunks": chunks,
             "trace": {
-                "trace_id": trace_id,
-                "retrieved_at": retrieved_at,
-                "collection": collection,
-                "model_used": model,
+                "trace_id": f"retr_{uuid.uuid4().hex[:12]}",
+                "retrieved_at": datetime.now(timezone.utc).isoformat(),
+                "model_used": ALL_MODELS,
                 "query_filter": query_filter,
                 "requested_top_k": top_k,
                 "returned_chunks": len(chunks),
+                "requested_retrieval_mode": requested_mode,
+                "fusion": self.fusion if requested_mode == "hybrid" else None,
+                "model_fusion": "rrf",
+                "quantization": self.quantization,
+                "models": models_trace,
+                "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        }
+
+    def quantization_recall(self, queries: List[str], model_used: Optional[str] = None, top_k: int = 10) -> Dict[str, Any]:
+        """
+        recall@k of the configured dense search against exact float32 search.
+
+        Both runs use the same query embeddings, so the score isolates what
+        quantization (plus HNSW) loses relative to brute-force full precision.
+        """
+        queries = [q for q in queries if q.strip()]
+        if not queries:
+            raise DocumentServiceError(400, "queries_required")
+        model = self._resolve_model(model_used)
+        collection = self._ensure_collection(model)
+        exact_params = {"exact": True, "quantization": {"ignore": True}}
+        recalls: List[float] = []
+        elapsed = {"configured": 0.0, "exact": 0.0}
+        for query in queries:
+            vector, _ = self._embed_query(query, model)
+            started = time.perf_counter()
+            configured = self.vector_store.search(collection, vector, limit=top_k, search_params=self._search_params())
+            elapsed["configured"] += time.perf_counter() - started
+            started = time.perf_counter()
+            exact = self.vector_store.search(collection, vector, limit=top_k, search_params=exact_params)
+            elapsed["exact"] += time.perf_counter() - started
+            truth = {point.get("id") for point in exact}
+            if truth:
+                recalls.append(len(truth & {point.get("id") for point in configured}) / len(truth))
+        return {
+            "model_used": model,
+            "collection": collection,
+            "quantization": self.quantization,
+            "oversampling": self.search_oversampling,
+            "rescore": self.search_rescore,
+            "top_k": top_k,
+            "queries": len(recalls),
+            "recall_at_k": sum(recalls) / len(recalls) if recalls else None,
+            "min_recall_at_k": min(recalls) if recalls else None,
+            "avg_latency_ms": {
+                key: round(total * 1000 / len(queries), 2) for key, total in elapsed.items()
             },
         }
+
+    def migrate_collection(
+        self,
+        *,
+        source_model: str,
+        target_model: Optional[str] = None,
+        batch_size: int = 256,
+        max_points_per_second: float = 0.0,
+        yield_to_queries: bool = True,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress: Optional[IndexProgress] = None,
+    ) -> Dict[str, Any]:
+        """
+        Copies every chunk in ``source_model``'s collection to ``target_model``'s
+        by re-embedding the stored ``text_chunk``. Nothing is downloaded or extracted.
+
+        The source is scrolled page by page in point-id order. After each page,
+        ``on_checkpoint`` receives the next scroll offset and the counters. Passing
+        that dict back as ``checkpoint`` resumes after the last finished page.
+        Target point ids are deterministic, so a replayed page overwrites its own points.
+        Documents the target already holds with the same content or a newer
+        ``indexed_at`` are left alone; otherwise the target's points past the
+        source ``chunk_count`` are deleted so no stale tail survives.
+        """
+        source = self._resolve_model(source_model)
+        target = self._resolve_model(target_model)
+        if source == target:
+            raise DocumentServiceError(400, "migration_same_model", {"model_used": source})
+        source_collection = self._collection_name(source)
+        if self._collection_info(source_collection) is None:
+            raise DocumentServiceError(404, "collection_not_found", {"collection": source_collection})
+        target_collection = self._ensure_collection(target)
+
+        state: Dict[str, Any] = {
+            "offset": None,
+            "migrated": 0,
+            "skipped": 0,
+            "unchanged": 0,
+            "documents": 0,
+            **(checkpoint or {}),
+        }
+        total = self._count_points(source_collection, None)
+        page_size = max(1, int(batch_size))
+        started = time.monotonic()
+        resumed_at = state["migrated"]
+        if progress:
+            progress(state["migrated"], total)
+        # document_uuid -> copy it; decided once per run from the target's state before any write.
+        copy_document: Dict[str, bool] = {}
+
+        while True:
+            points, next_offset = self._scroll_page(source_collection, limit=page_size, offset=state["offset"])
+            payloads = []
+            for point in points:
+                payload = point.get("payload") or {}
+                text = payload.get("text_chunk")
+                if not isinstance(text, str) or not text.strip() or None in (
+                    payload.get("document_uuid"),
+                    payload.get("chunk_index"),
+                ):
+                    state["skipped"] += 1
+                    continue
+                document_uuid = str(payload["document_uuid"])
+                if document_uuid not in copy_document:
+                    copy_document[document_uuid] = self._migration_replaces(target_collection, payload)
+                if not copy_document[document_uuid]:
+                    state["unchanged"] += 1
+                    continue
+                payloads.append({**payload, "model_used": target, "migrated_from": source})
+
+            if payloads:
+                if yield_to_queries:
+                    self._wait_for_idle_queries()
+                vectors = self._embed_many([p["text_chunk"] for p in payloads], model_used=target)
+
+                def _upsert_page(collection: str) -> None:
+                    for start in range(0, len(payloads), self.upsert_batch_size):
+                        batch = payloads[start:start + self.upsert_batch_size]
+                        self._upsert_points(
+                            collection,
+                            [
+                                {
+                                    "id": self._point_id(target, p["document_uuid"], int(p["chunk_index"])),
+                                    "vector": self._point_vector(collection, vectors[start + offset].tolist(), p["text_chunk"]),
+                                    "payload": p,
+                                }
+                                for offset, p in enumerate(batch)
+                            ],
+                        )
+
+                self._retry_on_missing_collection(target, _upsert_page)
+                first_chunks = [p for p in payloads if int(p["chunk_index"]) == 0]
+                state["documents"] += len(first_chunks)
+                if self.catalog is not None:
+                    for payload in first_chunks:
+                        self.catalog.safe_upsert(payload)
+
+            state["migrated"] += len(payloads)
+            state["offset"] = next_offset
+            if on_checkpoint:
+                on_checkpoint(dict(state))
+            if progress:
+                progress(min(state["migrated"] + state["unchanged"], total), total)
+            if next_offset is None:
+                break
+            if max_points_per_second > 0:
+                ahead = (state["migrated"] - resumed_at) / max_points_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        elapsed = time.monotonic() - started
+        self.log.info(
+            "collection_migrated",
+            source_model=source,
+            target_model=target,
+            chunks=state["migrated"],
+            skipped=state["skipped"],
+            unchanged=state["unchanged"],
+            elapsed_seconds=round(elapsed, 1),
+        )
+        return {
+            "source_model": source,
+            "model_used": target,
+            "source_collection": source_collection,
+            "target_collection": target_collection,
+            "chunks": state["migrated"],
+            "documents": state["documents"],
+            "skipped": state["skipped"],
+            "unchanged": state["unchanged"],
+            "elapsed_seconds": round(elapsed, 1),
+        }
+
+    def _migration_replaces(self, collection: str, source: Dict[str, Any]) -> bool:
+        # False when the target already holds this document with the same content or a newer
+        # index; when it holds an older one, its tail past the source chunk_count is dropped.
+        document_uuid = str(source["document_uuid"])
+        points, _ = self._scroll_page(
+            collection, self._document_filter(document_uuid), limit=1, with_payload={"exclude": ["text_chunk"]}
+        )
+        if not points:
+            return True
+        current = (points[0] or {}).get("payload") or {}
+        source_indexed_at = str(source.get("indexed_at") or "")
+        current_indexed_at = str(current.get("indexed_at") or "")
+        if current_indexed_at > source_indexed_at:
+            return False
+        complete = self._document_filter(document_uuid)
+        complete["must"].append({"key": "indexed_at", "match": {"value": current.get("indexed_at")}})
+        if self._count_points(collection, complete) == int(current.get("chunk_count") or 0) and (
+            current_indexed_at == source_indexed_at
+            or (current.get("content_sha256") and current.get("content_sha256") == source.get("content_sha256"))
+        ):
+            return False
+        if isinstance(source.get("chunk_count"), int):
+            self._delete_document_tail(collection, document_uuid, source["chunk_count"])
+        return True
+
+    def sample_chunks(self, model_used: Optional[str] = None, limit: int = 500) -> List[str]:
+        # Indexed chunk texts of one model, for parity checks and benchmarks on the real corpus.
+        model = self._resolve_model(model_used)
+        points, _ = self._scroll_page(self._ensure_collection(model), limit=limit, with_payload=["text_chunk"])
+        return [text for text in (str((p.get("payload") or {}).get("text_chunk") or "") for p in points) if text.strip()]
+
+    def warm_up(self, models: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Loads each model, runs one encode and bootstraps its collection, so the
+        first real query or index request does not pay for any of it.
+        """
+        report: Dict[str, Any] = {}
+        for name in models or [self.default_model]:
+            model = self._resolve_model(name)
+            started = time.perf_counter()
+            self._get_embedder(model)
+            loaded = time.perf_counter()
+            # Straight to the encoder: an embedding cache hit would skip the warm-up.
+            matrix = self._encode_many(["warm-up query"], model)
+            self._model_dims.setdefault(model, int(matrix.shape[1]))
+            self._chunk_text("Warm-up.\n\nTokenizer pass.", model)
+            encoded = time.perf_counter()
+            collection = self._ensure_collection(model)
+            done = time.perf_counter()
+            report[model] = {
+                "collection": collection,
+                "load_ms": round((loaded - started) * 1000, 1),
+                "encode_ms": round((encoded - loaded) * 1000, 1),
+                "collection_ms": round((done - encoded) * 1000, 1),
+            }
+            self.log.info("embedding_model_warmed", model_used=model, **report[model])
+        return report
@@ -0,0 +1,63 @@
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class QdrantTransport:
+    """
+    Keep-alive HTTP session shared by every QdrantDocumentsService call.
+
+    Connection errors and 429/502/503/504 responses are retried with jittered
+    exponential backoff. Every request the service sends is idempotent: searches,
+    scrolls and counts are reads, upserts use deterministic point ids, and deletes
+    and payload updates are by id or filter. That makes it safe to retry POST too.
+    Timeouts are chosen per operation: searches sit on the chat hot path and get a
+    tighter budget than upserts or collection management.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: float = 20.0,
+        connect_timeout: float = 3.0,
+        search_timeout: Optional[float] = None,
+        pool_size: int = 16,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        backoff_jitter: float = 0.2,
+    ):
+        self.base = base_url.rstrip("/")
+        self.connect_timeout = float(connect_timeout)
+        self.timeouts: Dict[str, float] = {
+            "search": float(search_timeout or timeout),
+            "default": float(timeout),
+        }
+        retry = Retry(
+            total=max(0, int(max_retries)),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"}),
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_size)), max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _operation(self, path: str) -> str:
+        endpoint = path.split("?", 1)[0].rsplit("/", 1)[-1]
+        return "search" if endpoint in {"search", "query"} else "default"
+
+    def request(self, method: str, path: str, *, json_data: Optional[Dict[str, Any]] = None) -> requests.Response:
+        timeout = (self.connect_timeout, self.timeouts[self._operation(path)])
+        return self.session.request(method=method, url=f"{self.base}{path}", json=json_data, timeout=timeout)
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from .embedding_cache import text_key
+
+
+class RerankerUnavailable(Exception):
+    pass
+
+
+class CrossEncoderReranker:
+    """
+    Reorders retrieved chunks by a locally loaded cross-encoder and keeps the top N.
+
+    All uncached (query, chunk) pairs of one call are scored in a single batched
+    ``predict``. Scores are kept in an in-process LRU keyed by the whitespace-normalized
+    query, the chunk reference and a digest of the chunk text, so a reindexed chunk is
+    scored again instead of reusing a stale score.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        top_n: int = 6,
+        batch_size: int = 32,
+        cache_size: int = 4096,
+        max_chars: int = 1400,
+        device: Optional[str] = None,
+    ):
+        self.model_name = model_name
+        self.top_n = max(1, int(top_n))
+        self.batch_size = max(1, int(batch_size))
+        self.cache_size = max(0, int(cache_size))
+        self.max_chars = max(1, int(max_chars))
+        self.device = device or None
+        self.log = structlog.get_logger("reranker")
+        self._model: Any = None
+        self._model_lock = threading.Lock()
+        self._scores: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+        self._scores_lock = threading.Lock()
+
+    def _get_model(self) -> Any:
+        if self._model is not None:
+            return self._model
+        with self._model_lock:
+            if self._model is None:
+                try:
+                    from sentence_transformers import CrossEncoder
+                except Exception as exc:
+                    raise RerankerUnavailable("Install sentence-transformers to use the cross-encoder reranker.") from exc
+                try:
+                    self._model = CrossEncoder(self.model_name, device=self.device)
+                except Exception as exc:
+                    raise RerankerUnavailable(str(exc)) from exc
+                self.log.info("reranker_model_loaded", model=self.model_name, device=self.device)
+            return self._model
+
+    def warm_up(self) -> None:
+        self._get_model().predict([("warm-up query", "warm-up passage")], show_progress_bar=False)
+
+    def _cached(self, key: Tuple[str, str, str]) -> Optional[float]:
+        with self._scores_lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def _remember(self, scored: Dict[Tuple[str, str, str], float]) -> None:
+        if not self.cache_size:
+            return
+        with self._scores_lock:
+            for key, score in scored.items():
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+
+    def rerank(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        *,
+        chunk_ref: Callable[[Dict[str, Any], int], str],
+        top_n: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        started = time.perf_counter()
+        normalized = " ".join(query.split())
+        texts = [str(chunk.get("text_chunk") or "")[:self.max_chars] for chunk in chunks]
+        keys = [(normalized, chunk_ref(chunk, idx), text_key(text)) for idx, (chunk, text) in enumerate(zip(chunks, texts))]
+
+        scores: List[Optional[float]] = [self._cached(key) for key in keys]
+        missing = [idx for idx, score in enumerate(scores) if score is None]
+        if missing:
+            model = self._get_model()
+            predicted = model.predict(
+                [(query, texts[idx]) for idx in missing],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            fresh = {keys[idx]: float(value) for idx, value in zip(missing, predicted)}
+            self._remember(fresh)
+            for idx in missing:
+                scores[idx] = fresh[keys[idx]]
+
+        order = sorted(range(len(chunks)), key=lambda idx: -scores[idx])[:top_n or self.top_n]
+        ranked = [{**chunks[idx], "rerank_score": scores[idx]} for idx in order]
+        return ranked, {
+            "model": self.model_name,
+            "candidates": len(chunks),
+            "kept": len(ranked),
+            "scored": len(missing),
+            "cache_hits": len(chunks) - len(missing),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
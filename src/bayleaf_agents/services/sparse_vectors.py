@@ -0,0 +1,46 @@
+import re
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Dict, List
+
+# Keeps lab tokens whole: "2_2s", "ldl-c", "3.5", "mg/dl", "r-4s".
+_TOKEN_RE = re.compile(r"\w+(?:[._/-]\w+)*", re.UNICODE)
+
+SPARSE_VECTOR_NAME = "bm25"
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower())
+
+
+def _term_index(token: str) -> int:
+    # Hashed vocabulary: no shared dictionary to persist, collisions are rare at 2^32.
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def _as_sparse(weights: Dict[int, float]) -> Dict[str, List]:
+    indices = sorted(weights)
+    return {"indices": indices, "values": [float(weights[idx]) for idx in indices]}
+
+
+def document_sparse_vector(text: str, *, k1: float = 1.2, b: float = 0.75, avg_len: float = 150.0) -> Dict[str, List]:
+    """
+    BM25 term-frequency component for one chunk.
+
+    The collection's sparse vector is created with ``modifier: idf``, so Qdrant
+    applies the IDF factor at query time from its own corpus statistics.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return {"indices": [], "values": []}
+    length_norm = k1 * (1 - b + b * len(tokens) / avg_len)
+    weights: Dict[int, float] = {}
+    for token, tf in Counter(tokens).items():
+        idx = _term_index(token)
+        weights[idx] = weights.get(idx, 0.0) + tf * (k1 + 1) / (tf + length_norm)
+    return _as_sparse(weights)
+
+
+def query_sparse_vector(text: str) -> Dict[str, List]:
+    return _as_sparse({_term_index(token): 1.0 for token in set(tokenize(text))})
@@ -0,0 +1,585 @@
+import fcntl
+import json
+import math
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Points, filters, payload selectors and collection info all use Qdrant's REST
+# shapes, so QdrantDocumentsService builds them once and any backend accepts them.
+Point = Dict[str, Any]
+Filter = Optional[Dict[str, Any]]
+
+RRF_K = 60
+
+# LocalVectorStore rewrites points.json once its change log is this long (or as long as the collection).
+LOG_COMPACT_MIN_ENTRIES = 1000
+
+_RANGE_OPS = {
+    "gt": lambda value, bound: value > bound,
+    "gte": lambda value, bound: value >= bound,
+    "lt": lambda value, bound: value < bound,
+    "lte": lambda value, bound: value <= bound,
+}
+
+
+class VectorStore(ABC):
+    """Storage operations QdrantDocumentsService needs from a vector database."""
+
+    @abstractmethod
+    def collection_info(self, collection: str) -> Optional[Dict[str, Any]]:
+        # {"config": {"params": {"vectors": {...}, "sparse_vectors": {...}}}, "payload_schema": {...}} or None
+        ...
+
+    @abstractmethod
+    def create_collection(
+        self,
+        collection: str,
+        *,
+        dim: int,
+        distance: str,
+        sparse_vectors: Optional[Dict[str, Any]] = None,
+        quantization_config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def update_collection(self, collection: str, *, quantization_config: Any) -> None:
+        ...
+
+    @abstractmethod
+    def create_payload_index(self, collection: str, field: str, schema: str) -> None:
+        ...
+
+    @abstractmethod
+    def upsert(self, collection: str, points: List[Point], *, wait: bool = True) -> None:
+        ...
+
+    @abstractmethod
+    def set_payload(self, collection: str, point_ids: List[str], payload: Dict[str, Any], *, wait: bool = True) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, collection: str, points_filter: Dict[str, Any], *, wait: bool = True) -> None:
+        ...
+
+    @abstractmethod
+    def scroll(
+        self,
+        collection: str,
+        scroll_filter: Filter = None,
+        *,
+        limit: int = 256,
+        offset: Any = None,
+        with_payload: Any = True,
+    ) -> Tuple[List[Point], Any]:
+        ...
+
+    @abstractmethod
+    def count(self, collection: str, count_filter: Filter = None) -> int:
+        ...
+
+    @abstractmethod
+    def search(
+        self,
+        collection: str,
+        vector: List[float],
+        *,
+        limit: int,
+        query_filter: Filter = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Point]:
+        ...
+
+    @abstractmethod
+    def fused_search(
+        self,
+        collection: str,
+        vector: List[float],
+        sparse_vector: Dict[str, List],
+        *,
+        sparse_name: str,
+        limit: int,
+        query_filter: Filter = None,
+        fusion: str = "rrf",
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Point]:
+        ...
+
+
+def _condition_matches(payload: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+    if any(key in condition for key in ("must", "should", "must_not")):
+        return filter_matches(payload, condition)
+    value = payload.get(condition.get("key", ""))
+    values = value if isinstance(value, list) else [value]
+    match = condition.get("match")
+    if isinstance(match, dict):
+        if "value" in match:
+            return match["value"] in values
+        if "any" in match:
+            return any(v in match["any"] for v in values)
+        if "except" in match:
+            return all(v not in match["except"] for v in values)
+    bounds = condition.get("range")
+    if isinstance(bounds, dict):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+        return all(_RANGE_OPS[op](value, bound) for op, bound in bounds.items() if op in _RANGE_OPS and bound is not None)
+    if "is_null" in condition:
+        return payload.get(condition["is_null"].get("key", "")) is None
+    return False
+
+
+def filter_matches(payload: Dict[str, Any], points_filter: Filter) -> bool:
+    # Qdrant semantics: every must, no must_not, and at least one should when should is given.
+    if not points_filter:
+        return True
+    if not all(_condition_matches(payload, c) for c in points_filter.get("must") or []):
+        return False
+    if any(_condition_matches(payload, c) for c in points_filter.get("must_not") or []):
+        return False
+    should = points_filter.get("should") or []
+    return not should or any(_condition_matches(payload, c) for c in should)
+
+
+def select_payload(payload: Dict[str, Any], with_payload: Any) -> Optional[Dict[str, Any]]:
+    if with_payload is True:
+        return dict(payload)
+    if not with_payload:
+        return None
+    if isinstance(with_payload, list):
+        return {key: payload[key] for key in with_payload if key in payload}
+    if isinstance(with_payload, dict) and "include" in with_payload:
+        return {key: payload[key] for key in with_payload["include"] if key in payload}
+    if isinstance(with_payload, dict) and "exclude" in with_payload:
+        return {key: value for key, value in payload.items() if key not in with_payload["exclude"]}
+    return dict(payload)
+
+
+class _LocalCollection:
+    # points.json is a snapshot; points.log holds one JSON line per change since then,
+    # so each write appends only what it touched instead of rewriting every point.
+    def __init__(self, directory: str, meta: Dict[str, Any]):
+        self.directory = directory
+        self.meta = meta
+        self.dim = int(meta["dim"])
+        self.lock = threading.RLock()
+        self.points: Dict[str, Dict[str, Any]] = {}
+        points_path = os.path.join(directory, "points.json")
+        if os.path.exists(points_path):
+            with open(points_path, "r", encoding="utf-8") as fh:
+                self.points = json.load(fh)
+        self.log_entries = self._replay_log()
+        capacity = max([1024] + [entry["row"] + 1 for entry in self.points.values()])
+        self.vectors = self._open_vectors(capacity)
+        used = {entry["row"] for entry in self.points.values()}
+        self.free_rows = sorted(set(range(self.vectors.shape[0])) - used, reverse=True)
+        # Derived, in-memory only: ids sorted for scrolls, ids per document for filters,
+        # and per sparse vector name how many points contain each index (for IDF).
+        self._sorted_ids: Optional[List[str]] = None
+        self.by_document: Dict[str, Set[str]] = {}
+        self.doc_freq: Dict[str, Counter] = {}
+        for pid, entry in self.points.items():
+            self._index(pid, entry, 1)
+
+    def _replay_log(self) -> int:
+        path = os.path.join(self.directory, "points.log")
+        if not os.path.exists(path):
+            return 0
+        entries = 0
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    break  # torn last line from a crash mid-write
+                if change["op"] == "put":
+                    self.points[change["id"]] = change["entry"]
+                elif change["op"] == "payload":
+                    for pid in change["ids"]:
+                        if pid in self.points:
+                            self.points[pid]["payload"].update(change["payload"])
+                elif change["op"] == "delete":
+                    for pid in change["ids"]:
+                        self.points.pop(pid, None)
+                entries += 1
+        return entries
+
+    def _index(self, pid: str, entry: Dict[str, Any], sign: int) -> None:
+        doc = entry["payload"].get("document_uuid")
+        if doc is not None:
+            members = self.by_document.setdefault(str(doc), set())
+            if sign > 0:
+                members.add(pid)
+            else:
+                members.discard(pid)
+        for name, sparse in entry["sparse"].items():
+            counts = self.doc_freq.setdefault(name, Counter())
+            for idx in sparse.get("indices") or []:
+                counts[idx] += sign
+
+    def put(self, pid: str, entry: Dict[str, Any]) -> None:
+        previous = self.points.get(pid)
+        if previous is not None:
+            self._index(pid, previous, -1)
+        else:
+            self._sorted_ids = None
+        self.points[pid] = entry
+        self._index(pid, entry, 1)
+
+    def update_payload(self, pid: str, payload: Dict[str, Any]) -> None:
+        entry = self.points[pid]
+        self._index(pid, entry, -1)
+        entry["payload"].update(payload)
+        self._index(pid, entry, 1)
+
+    def remove(self, pid: str) -> Dict[str, Any]:
+        entry = self.points.pop(pid)
+        self._index(pid, entry, -1)
+        self._sorted_ids = None
+        return entry
+
+    def _open_vectors(self, capacity: int) -> np.memmap:
+        path = os.path.join(self.directory, "vectors.f32")
+        existing = os.path.getsize(path) // (4 * self.dim) if os.path.exists(path) else 0
+        if existing >= capacity:
+            return np.memmap(path, dtype=np.float32, mode="r+", shape=(existing, self.dim))
+        grown = np.memmap(path + ".tmp", dtype=np.float32, mode="w+", shape=(capacity, self.dim))
+        if existing:
+            grown[:existing] = np.memmap(path, dtype=np.float32, mode="r", shape=(existing, self.dim))
+        grown.flush()
+        del grown
+        os.replace(path + ".tmp", path)
+        return np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _write_json(self, name: str, data: Any) -> None:
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(path + ".tmp", path)
+
+    def save(self) -> None:
+        self.vectors.flush()
+        self._write_json("points.json", self.points)
+        self._write_json("meta.json", self.meta)
+        log_path = os.path.join(self.directory, "points.log")
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self.log_entries = 0
+
+    def append(self, changes: Iterable[Dict[str, Any]]) -> None:
+        # Vectors first, so a logged point never refers to an unwritten row.
+        self.vectors.flush()
+        lines = [json.dumps(change) + "\n" for change in changes]
+        with open(os.path.join(self.directory, "points.log"), "a", encoding="utf-8") as fh:
+            fh.writelines(lines)
+        self.log_entries += len(lines)
+        if self.log_entries > max(LOG_COMPACT_MIN_ENTRIES, len(self.points)):
+            self.save()
+
+    def allocate_row(self) -> int:
+        if not self.free_rows:
+            capacity = self.vectors.shape[0]
+            self.vectors.flush()
+            self.vectors = self._open_vectors(capacity * 2)
+            self.free_rows = list(range(capacity * 2 - 1, capacity - 1, -1))
+        return self.free_rows.pop()
+
+    def prepare_vector(self, vector: List[float]) -> np.ndarray:
+        arr = np.asarray(vector, dtype=np.float32)
+        if self.meta.get("distance", "Cosine") == "Cosine":
+            norm = float(np.linalg.norm(arr))
+            if norm > 0:
+                arr = arr / norm
+        return arr
+
+    def sorted_ids(self) -> List[str]:
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.points)
+        return self._sorted_ids
+
+    def _document_candidates(self, points_filter: Filter) -> Optional[Set[str]]:
+        # Narrows a filter with a must condition on document_uuid to that document's points.
+        for condition in (points_filter or {}).get("must") or []:
+            if condition.get("key") != "document_uuid" or not isinstance(condition.get("match"), dict):
+                continue
+            match = condition["match"]
+            values = [match["value"]] if "value" in match else match.get("any")
+            if values is not None:
+                return set().union(*(self.by_document.get(str(v), set()) for v in values))
+        return None
+
+    def matching(self, points_filter: Filter) -> List[str]:
+        if not points_filter:
+            return list(self.sorted_ids())
+        candidates = self._document_candidates(points_filter)
+        ids = sorted(candidates) if candidates is not None else self.sorted_ids()
+        return [pid for pid in ids if filter_matches(self.points[pid]["payload"], points_filter)]
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded single-node backend: no server, one directory per collection.
+
+    Vectors live in a memory-mapped float32 matrix (``vectors.f32``) and payloads,
+    row assignments and sparse vectors in a JSON snapshot (``points.json``) plus an
+    append-only change log (``points.log``) that is folded into the snapshot once it
+    grows as large as the collection. Search is
+    vectorized brute force over the rows that pass the filter, which is fast enough
+    for the few thousand chunks of a single-node or CI deployment. Hybrid queries
+    fuse dense and BM25-IDF-weighted sparse rankings locally with RRF or DBSF.
+    Quantization settings are recorded but every search scores the float32 vectors
+    exactly, so ``search_params`` have nothing to tune here.
+
+    The snapshot and log are owned by one process: the directory is locked
+    (``flock``) on open, and a second process opening it fails instead of
+    interleaving writes. Run a single API worker with this backend.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._collections: Dict[str, _LocalCollection] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, ".lock"), "a+")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as exc:
+            self._lock_file.close()
+            raise RuntimeError(
+                f"local vector store {directory} is in use by another process; it supports a single process only"
+            ) from exc
+
+    def close(self) -> None:
+        with self._lock:
+            for col in self._collections.values():
+                with col.lock:
+                    col.vectors.flush()
+            self._collections.clear()
+        self._lock_file.close()
+
+    def _missing(self, collection: str) -> Exception:
+        # Same error QdrantVectorStore raises for a 404, so callers handle both backends alike.
+        from .qdrant_documents import DocumentServiceError
+
+        return DocumentServiceError(404, "qdrant_request_failed", {"collection": collection, "error": "Not found"})
+
+    def _path(self, collection: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]+", "-", collection))
+
+    def _get(self, collection: str) -> Optional[_LocalCollection]:
+        with self._lock:
+            loaded = self._collections.get(collection)
+            if loaded is not None:
+                return loaded
+            meta_path = os.path.join(self._path(collection), "meta.json")
+            if not os.path.exists(meta_path):
+                return None
+            with open(meta_path, "r", encoding="utf-8") as fh:
+                loaded = _LocalCollection(self._path(collection), json.load(fh))
+            self._collections[collection] = loaded
+            return loaded
+
+    def collection_info(self, collection: str) -> Optional[Dict[str, Any]]:
+        col = self._get(collection)
+        if col is None:
+            return None
+        return {
+            "points_count": len(col.points),
+            "config": {
+                "params": {
+                    "vectors": {"size": col.dim, "distance": col.meta.get("distance")},
+                    "sparse_vectors": dict(col.meta.get("sparse_vectors") or {}),
+                },
+                "quantization_config": col.meta.get("quantization_config"),
+            },
+            "payload_schema": dict(col.meta.get("payload_schema") or {}),
+        }
+
+    def create_collection(
+        self,
+        collection: str,
+        *,
+        dim: int,
+        distance: str,
+        sparse_vectors: Optional[Dict[str, Any]] = None,
+        quantization_config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if self._get(collection) is not None:
+            return
+        os.makedirs(self._path(collection), exist_ok=True)
+        meta = {
+            "dim": int(dim),
+            "distance": distance,
+            "sparse_vectors": sparse_vectors or {},
+            "quantization_config": quantization_config,
+            "payload_schema": {},
+        }
+        col = _LocalCollection(self._path(collection), meta)
+        col.save()
+        with self._lock:
+            self._collections[collection] = col
+
+    def update_collection(self, collection: str, *, quantization_config: Any) -> None:
+        col = self._get(collection)
+        if col is None:
+            return
+        with col.lock:
+            col.meta["quantization_config"] = None if quantization_config == "Disabled" else quantization_config
+            col._write_json("meta.json", col.meta)
+
+    def create_payload_index(self, collection: str, field: str, schema: str) -> None:
+        # Filters are evaluated in Python either way; recorded so collection_info matches Qdrant.
+        col = self._get(collection)
+        if col is None:
+            return
+        with col.lock:
+            col.meta.setdefault("payload_schema", {})[field] = {"data_type": schema}
+            col._write_json("meta.json", col.meta)
+
+    def upsert(self, collection: str, points: List[Point], *, wait: bool = True) -> None:
+        col = self._get(collection)
+        if col is None:
+            raise self._missing(collection)
+        with col.lock:
+            for point in points:
+                pid = str(point["id"])
+                vector = point.get("vector")
+                named = vector if isinstance(vector, dict) else {"": vector}
+                entry = col.points.get(pid)
+                row = entry["row"] if entry else col.allocate_row()
+                col.vectors[row] = col.prepare_vector(named[""])
+                sparse = {name: value for name, value in named.items() if name and isinstance(value, dict)}
+                col.put(pid, {"row": row, "payload": dict(point.get("payload") or {}), "sparse": sparse})
+            col.append({"op": "put", "id": str(point["id"]), "entry": col.points[str(point["id"])]} for point in points)
+
+    def set_payload(self, collection: str, point_ids: List[str], payload: Dict[str, Any], *, wait: bool = True) -> None:
+        col = self._get(collection)
+        if col is None:
+            raise self._missing(collection)
+        with col.lock:
+            ids = [str(pid) for pid in point_ids if str(pid) in col.points]
+            for pid in ids:
+                col.update_payload(pid, payload)
+            if ids:
+                col.append([{"op": "payload", "ids": ids, "payload": payload}])
+
+    def delete(self, collection: str, points_filter: Dict[str, Any], *, wait: bool = True) -> None:
+        col = self._get(collection)
+        if col is None:
+            return
+        with col.lock:
+            ids = col.matching(points_filter)
+            for pid in ids:
+                col.free_rows.append(col.remove(pid)["row"])
+            if ids:
+                col.append([{"op": "delete", "ids": ids}])
+
+    def scroll(
+        self,
+        collection: str,
+        scroll_filter: Filter = None,
+        *,
+        limit: int = 256,
+        offset: Any = None,
+        with_payload: Any = True,
+    ) -> Tuple[List[Point], Any]:
+        col = self._get(collection)
+        if col is None:
+            return [], None
+        with col.lock:
+            ids = [pid for pid in col.matching(scroll_filter) if offset is None or pid >= str(offset)]
+            page = [{"id": pid, "payload": select_payload(col.points[pid]["payload"], with_payload)} for pid in ids[:limit]]
+            return page, (ids[limit] if len(ids) > limit else None)
+
+    def count(self, collection: str, count_filter: Filter = None) -> int:
+        col = self._get(collection)
+        if col is None:
+            return 0
+        with col.lock:
+            return len(col.matching(count_filter))
+
+    def _dense_scores(self, col: _LocalCollection, ids: List[str], vector: List[float]) -> np.ndarray:
+        rows = np.array([col.points[pid]["row"] for pid in ids], dtype=np.int64)
+        matrix = np.asarray(col.vectors[rows])
+        query = col.prepare_vector(vector)
+        if col.meta.get("distance") == "Euclid":
+            return -np.linalg.norm(matrix - query, axis=1)
+        return matrix @ query
+
+    def _sparse_scores(self, col: _LocalCollection, ids: List[str], sparse_vector: Dict[str, List], name: str) -> np.ndarray:
+        # IDF over the whole collection, as Qdrant's idf modifier does.
+        total = len(col.points)
+        query = dict(zip(sparse_vector.get("indices") or [], sparse_vector.get("values") or []))
+        doc_freq = col.doc_freq.get(name) or Counter()
+        idf = {idx: math.log((total - doc_freq[idx] + 0.5) / (doc_freq[idx] + 0.5) + 1) for idx in query}
+        scores = np.zeros(len(ids), dtype=np.float32)
+        for pos, pid in enumerate(ids):
+            sparse = col.points[pid]["sparse"].get(name) or {}
+            for idx, value in zip(sparse.get("indices") or [], sparse.get("values") or []):
+                if idx in query:
+                    scores[pos] += query[idx] * value * idf[idx]
+        return scores
+
+    def _hits(self, col: _LocalCollection, ids: List[str], scores: np.ndarray, limit: int) -> List[Point]:
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [{"id": ids[i], "score": float(scores[i]), "payload": dict(col.points[ids[i]]["payload"])} for i in order]
+
+    def search(
+        self,
+        collection: str,
+        vector: List[float],
+        *,
+        limit: int,
+        query_filter: Filter = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Point]:
+        col = self._get(collection)
+        if col is None:
+            return []
+        with col.lock:
+            ids = col.matching(query_filter)
+            if not ids:
+                return []
+            return self._hits(col, ids, self._dense_scores(col, ids, vector), limit)
+
+    def fused_search(
+        self,
+        collection: str,
+        vector: List[float],
+        sparse_vector: Dict[str, List],
+        *,
+        sparse_name: str,
+        limit: int,
+        query_filter: Filter = None,
+        fusion: str = "rrf",
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Point]:
+        col = self._get(collection)
+        if col is None:
+            return []
+        with col.lock:
+            ids = col.matching(query_filter)
+            if not ids:
+                return []
+            dense = self._dense_scores(col, ids, vector)
+            sparse = self._sparse_scores(col, ids, sparse_vector, sparse_name)
+            if fusion == "dbsf":
+                fused = np.zeros(len(ids), dtype=np.float32)
+                for scores in (dense, sparse):
+                    # Distribution-based score fusion: normalize by mean +/- 3 std, then sum.
+                    low, high = scores.mean() - 3 * scores.std(), scores.mean() + 3 * scores.std()
+                    if high > low:
+                        fused += np.clip((scores - low) / (high - low), 0, 1)
+            else:
+                fused = np.zeros(len(ids), dtype=np.float32)
+                for scores, eligible in ((dense, np.ones(len(ids), dtype=bool)), (sparse, sparse > 0)):
+                    ranks = np.empty(len(ids), dtype=np.int64)
+                    ranks[np.argsort(-scores, kind="stable")] = np.arange(len(ids))
+                    fused += np.where(eligible, 1.0 / (RRF_K + ranks + 1), 0.0)
+            return self._hits(col, ids, fused, limit)
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import structlog
+
+DISABLED, PENDING, WARMING, READY, RETRYING = "disabled", "pending", "warming", "ready", "retrying"
+
+
+class StartupWarmup:
+    """
+    Runs the startup warm-up in a background thread and tracks readiness.
+
+    ``run`` returns a report (per model timings) on success. Failures, e.g. Qdrant
+    not reachable yet, are retried every ``retry_seconds`` until the warm-up
+    succeeds or the app shuts down; readiness is only reported after a success.
+    A disabled warm-up is ready immediately.
+    """
+
+    def __init__(self, run: Callable[[], Dict[str, Any]], *, enabled: bool = True, retry_seconds: float = 10.0):
+        self.run = run
+        self.enabled = enabled
+        self.retry_seconds = max(0.1, float(retry_seconds))
+        self.log = structlog.get_logger("startup_warmup")
+        self._status = PENDING if enabled else DISABLED
+        self._attempts = 0
+        self._error: Optional[str] = None
+        self._report: Dict[str, Any] = {}
+        self._started_at: Optional[float] = None
+        self._elapsed: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._status in (READY, DISABLED)
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name="startup-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                self._status = WARMING
+                self._attempts += 1
+            try:
+                report = self.run()
+            except Exception as exc:
+                with self._lock:
+                    self._status = RETRYING
+                    self._error = str(exc)
+                self.log.warning("startup_warmup_failed", attempt=self._attempts, error=str(exc))
+                self._stop.wait(self.retry_seconds)
+                continue
+            with self._lock:
+                self._status = READY
+                self._error = None
+                self._report = report
+                self._elapsed = time.perf_counter() - (self._started_at or time.perf_counter())
+            self.log.info("startup_warmup_ready", attempts=self._attempts, elapsed_seconds=round(self._elapsed, 2))
+            return
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "status": self._status,
+                "ready": self.ready,
+                "attempts": self._attempts,
+                "error": self._error,
+                "elapsed_seconds": round(self._elapsed, 3) if self._elapsed is not None else None,
+                "warmup": self._report,
+            }
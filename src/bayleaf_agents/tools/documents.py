@@ -52,6 +52,8 @@ class DocumentsToolset:
         is_bayleaf: Optional[bool] = None,
         doc_key: Optional[str] = None,
         principal: Optional[Principal] = None,
+        retrieval_mode: Optional[str] = None,
+        all_models: bool = False,
     ) -> Dict[str, Any]:
         if doc_key:
             scoped_uuids = self.documents_service.document_uuids_for_doc_key(
@@ -116,6 +118,8 @@ class DocumentsToolset:
                 document_uuids=effective_document_uuids,
                 source_type=source_type,
                 is_bayleaf=is_bayleaf,
+                retrieval_mode=retrieval_mode,
+                all_models=all_models,
             )
 
         return self.documents_service.query_documents(
@@ -126,6 +130,8 @@ class DocumentsToolset:
             document_uuids=document_uuids,
             source_type=source_type,
             is_bayleaf=is_bayleaf,
+            retrieval_mode=retrieval_mode,
+            all_models=all_models,
         )
 
     def documents_available(
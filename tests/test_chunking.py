@@ -0,0 +1,62 @@
+from bayleaf_agents.services.chunking import StructuredChunker, approximate_token_counts
+
+SOP = """PROCEDIMENTO OPERACIONAL PADRÃO
+
+1. Objetivo
+Este procedimento descreve a coleta de sangue venoso.
+O paciente deve estar em jejum de 8 horas.
+
+2. Valores de referência
+Analito | Valor | Unidade
+LDL-c | < 130 | mg/dL
+HDL-c | > 40 | mg/dL
+"""
+
+
+class CountingTokenizer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += 1
+        return approximate_token_counts(texts)
+
+
+def test_sections_and_tables_stay_whole_when_they_fit():
+    chunks = StructuredChunker(max_tokens=40, overlap_tokens=0).split(SOP)
+
+    assert chunks[0].startswith("PROCEDIMENTO OPERACIONAL PADRÃO\n\n1. Objetivo\n\nEste procedimento")
+    # PDF line breaks inside a paragraph are re-flowed; table rows are kept verbatim.
+    assert "venoso. O paciente" in chunks[0]
+    assert chunks[1] == "2. Valores de referência\n\nAnalito | Valor | Unidade\nLDL-c | < 130 | mg/dL\nHDL-c | > 40 | mg/dL"
+
+
+def test_long_paragraph_splits_on_sentences_within_budget_with_token_overlap():
+    text = " ".join(f"Frase {i} sobre controle interno." for i in range(30))
+    chunker = StructuredChunker(max_tokens=30, overlap_tokens=6)
+
+    chunks = chunker.split(text)
+
+    assert len(chunks) > 1
+    assert all(max(approximate_token_counts([c])) <= 30 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+    # Each chunk starts with the last sentence of the previous one.
+    assert chunks[1].startswith(chunks[0].rsplit(". ", 1)[-1])
+
+
+def test_oversized_sentence_is_cut_by_words():
+    text = " ".join(f"palavra{i}" for i in range(100))
+
+    chunks = StructuredChunker(max_tokens=20, overlap_tokens=0).split(text)
+
+    assert " ".join(chunks).split() == text.split()
+    assert all(len(c.split()) <= 20 for c in chunks)
+
+
+def test_document_is_tokenized_in_few_batched_calls():
+    tokenizer = CountingTokenizer()
+    text = "\n\n".join(f"Paragrafo {i}. " + "Texto curto. " * 3 for i in range(200))
+
+    StructuredChunker(max_tokens=64, overlap_tokens=8, count_tokens=tokenizer).split(text)
+
+    assert tokenizer.calls == 1
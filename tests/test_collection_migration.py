@@ -0,0 +1,189 @@
+import io
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from bayleaf_agents.models import Base, IndexingJob, IndexingJobStatus
+from bayleaf_agents.services.indexing_jobs import IndexingJobRunner
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+from bayleaf_agents.services.vector_store import LocalVectorStore
+
+SOURCE = "model-a"
+TARGET = "model-b"
+
+
+class LengthEmbedder:
+    def __init__(self, offset):
+        self.offset = offset
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        _ = kwargs
+        if isinstance(texts, str):
+            return np.array([len(texts), self.offset], dtype=np.float32)
+        self.calls.append(list(texts))
+        return np.array([[len(t), self.offset] for t in texts], dtype=np.float32)
+
+
+def _service(directory):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.invalid",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[SOURCE, TARGET],
+        default_model=SOURCE,
+        vector_store=LocalVectorStore(str(directory)),
+    )
+    service.models.put(SOURCE, LengthEmbedder(1.0))
+    service.models.put(TARGET, LengthEmbedder(2.0))
+    for name in ("a", "b", "c"):
+        service.index_uploaded_document(
+            filename=f"{name}.txt",
+            fileobj=io.BytesIO(f"Document {name} about fasting lipid panels.".encode("utf-8")),
+            mime_type="text/plain",
+        )
+    return service
+
+
+def _session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _target_points(service):
+    points, _ = service._scroll_page(service._collection_name(TARGET), limit=100, offset=None)
+    return points
+
+
+def test_migration_reembeds_stored_chunks_into_target_collection(tmp_path):
+    service = _service(tmp_path)
+    checkpoints = []
+
+    result = service.migrate_collection(source_model=SOURCE, target_model=TARGET, batch_size=2, on_checkpoint=checkpoints.append)
+
+    points = _target_points(service)
+    assert result["chunks"] == len(points) == 3
+    assert result["documents"] == 3
+    assert {p["payload"]["model_used"] for p in points} == {TARGET}
+    assert {p["payload"]["migrated_from"] for p in points} == {SOURCE}
+    assert [c["migrated"] for c in checkpoints] == [2, 3]
+    assert checkpoints[-1]["offset"] is None
+    assert sum(len(call) for call in service.models.get(TARGET).calls) == 3
+
+
+def test_migration_resumes_after_checkpoint_and_rejects_same_model(tmp_path):
+    service = _service(tmp_path)
+    checkpoints = []
+    service.migrate_collection(source_model=SOURCE, target_model=TARGET, batch_size=2, on_checkpoint=checkpoints.append)
+    embedder = service.models.get(TARGET)
+    embedder.calls.clear()
+
+    result = service.migrate_collection(source_model=SOURCE, target_model=TARGET, batch_size=2, checkpoint=checkpoints[0])
+
+    # Only the last page is replayed, and its document is already current in the target.
+    assert result["chunks"] == 2
+    assert result["unchanged"] == 1
+    assert embedder.calls == []
+    assert len(_target_points(service)) == 3
+    with pytest.raises(DocumentServiceError) as exc:
+        service.migrate_collection(source_model=SOURCE, target_model=SOURCE)
+    assert exc.value.message == "migration_same_model"
+
+
+def test_migration_keeps_newer_target_documents_and_drops_stale_tails(tmp_path):
+    service = _service(tmp_path)
+    source_points, _ = service._scroll_page(service._collection_name(SOURCE), limit=100, offset=None)
+    newer, older, _ = sorted(p["payload"]["document_uuid"] for p in source_points)
+    collection = service._ensure_collection(TARGET)
+
+    def _target_point(document_uuid, chunk_index, indexed_at, chunk_count, text):
+        return {
+            "id": service._point_id(TARGET, document_uuid, chunk_index),
+            "vector": [1.0, 2.0],
+            "payload": {
+                "document_uuid": document_uuid,
+                "chunk_index": chunk_index,
+                "chunk_count": chunk_count,
+                "indexed_at": indexed_at,
+                "content_sha256": "target",
+                "model_used": TARGET,
+                "text_chunk": text,
+            },
+        }
+
+    service._upsert_points(
+        collection,
+        [_target_point(newer, 0, "9999-01-01T00:00:00+00:00", 1, "reindexed after the source")]
+        + [_target_point(older, idx, "2000-01-01T00:00:00+00:00", 3, f"old chunk {idx}") for idx in range(3)],
+    )
+
+    result = service.migrate_collection(source_model=SOURCE, target_model=TARGET, batch_size=2)
+
+    by_document = {}
+    for point in _target_points(service):
+        by_document.setdefault(point["payload"]["document_uuid"], []).append(point["payload"])
+    assert [p["text_chunk"] for p in by_document[newer]] == ["reindexed after the source"]
+    assert [(p["chunk_index"], p.get("migrated_from")) for p in by_document[older]] == [(0, SOURCE)]
+    assert result["chunks"] == 2
+    assert result["unchanged"] == 1
+
+
+def test_migrate_job_runs_in_background_and_resumes_after_restart(tmp_path):
+    service = _service(tmp_path / "store")
+    session_factory = _session_factory()
+    runner = IndexingJobRunner(service, session_factory, spool_dir=str(tmp_path))
+
+    job = runner.submit_migrate(source_model=SOURCE, target_model=TARGET, batch_size=2)
+    done = runner.wait(job["id"], timeout=5)
+    assert done["kind"] == "migrate"
+    assert done["status"] == "succeeded"
+    assert done["chunks_embedded"] == 3
+    assert done["result"]["model_used"] == TARGET
+
+    # A migration cut short by a restart resumes from its saved checkpoint.
+    db = session_factory()
+    db.add(
+        IndexingJob(
+            id="job-migrate",
+            kind="migrate",
+            status=IndexingJobStatus.running,
+            model_used=TARGET,
+            params={"source_model": SOURCE, "batch_size": 2, "checkpoint": {"offset": None, "migrated": 3}},
+        )
+    )
+    db.commit()
+    db.close()
+    assert runner.resume_pending() == 1
+    assert runner.wait("job-migrate", timeout=5)["status"] == "succeeded"
+
+    with pytest.raises(DocumentServiceError):
+        runner.submit_migrate(source_model=TARGET, target_model=TARGET)
+
+
+def test_interrupted_migration_is_retryable(tmp_path):
+    service = _service(tmp_path / "store")
+    runner = IndexingJobRunner(service, _session_factory(), spool_dir=str(tmp_path))
+    original = service._embed_many
+
+    def _embed_and_interrupt(texts, **kwargs):
+        for job_id in list(runner._futures):
+            runner.interrupt(job_id)
+        return original(texts, **kwargs)
+
+    service._embed_many = _embed_and_interrupt
+    job_id = runner.submit_migrate(source_model=SOURCE, target_model=TARGET, batch_size=2)["id"]
+    stopped = runner.wait(job_id, timeout=5)
+    assert stopped["status"] == "interrupted"
+    assert stopped["chunks_embedded"] == 2
+
+    service._embed_many = original
+    assert runner.retry(job_id, None)["chunks_embedded"] == 2
+    resumed = runner.wait(job_id, timeout=5)
+    assert resumed["status"] == "succeeded"
+    assert resumed["result"]["chunks"] == 3
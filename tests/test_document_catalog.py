@@ -0,0 +1,149 @@
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from bayleaf_agents.models import Base
+from bayleaf_agents.services.document_catalog import DocumentCatalog
+from bayleaf_agents.services.qdrant_documents import QdrantDocumentsService
+
+
+def _catalog() -> DocumentCatalog:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return DocumentCatalog(sessionmaker(bind=engine, autoflush=False, autocommit=False))
+
+
+def _payload(document_uuid, model, indexed_at, chunk_count=3, **extra):
+    return {
+        "document_uuid": document_uuid,
+        "name": f"{document_uuid}.pdf",
+        "description": None,
+        "mime_type": "application/pdf",
+        "source_type": "bayleaf",
+        "is_bayleaf": True,
+        "bayleaf_document_uuid": document_uuid,
+        "model_used": model,
+        "status": "indexed",
+        "indexed_at": indexed_at,
+        "content_sha256": "abc",
+        "chunking": "chars:1000:200",
+        "chunk_count": chunk_count,
+        **extra,
+    }
+
+
+def _service(catalog):
+    return QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=None,
+        allowed_models=["model-a", "model-b"],
+        default_model="model-a",
+        catalog=catalog,
+    )
+
+
+def test_catalog_lists_newest_entry_per_document_without_scrolling_qdrant(monkeypatch):
+    catalog = _catalog()
+    catalog.upsert(_payload("doc-1", "model-a", "2026-10-01T00:00:00+00:00"))
+    catalog.upsert(_payload("doc-1", "model-b", "2026-10-03T00:00:00+00:00", chunk_count=5))
+    catalog.upsert(_payload("doc-2", "model-a", "2026-10-02T00:00:00+00:00"))
+    catalog.upsert(_payload("doc-2", "model-a", "2026-10-04T00:00:00+00:00", status="indexed_pdf_no_text"))
+    catalog.upsert(_payload("doc-3", "retired-model", "2026-10-05T00:00:00+00:00"))
+    catalog.mark_ready()
+    service = _service(catalog)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("catalog reads must not scroll Qdrant")
+
+    monkeypatch.setattr(service, "_scroll_page", fail)
+
+    docs = service.documents_available()
+
+    assert [(d["uuid"], d["model_used"], d["chunks"]) for d in docs] == [
+        ("doc-2", "model-a", 3),
+        ("doc-1", "model-b", 5),
+    ]
+    assert docs[0]["status"] == "indexed_pdf_no_text"
+    assert service.get_document("doc-1")["model_used"] == "model-b"
+
+
+def test_rebuild_catalog_from_qdrant_skips_chunk_text(monkeypatch):
+    catalog = _catalog()
+    catalog.upsert(_payload("stale", "model-a", "2026-01-01T00:00:00+00:00"))
+    service = _service(catalog)
+    seen_payload_selectors = []
+
+    def fake_scroll_page(collection, scroll_filter=None, *, limit=256, offset=None, with_payload=True):
+        seen_payload_selectors.append(with_payload)
+        if collection == service._collection_name("model-a"):
+            return [
+                {"payload": _payload("doc-1", "model-a", "2026-10-01T00:00:00+00:00", chunk_index=0)},
+                {"payload": _payload("doc-1", "model-a", "2026-10-01T00:00:00+00:00", chunk_index=1)},
+            ], None
+        return [], None
+
+    monkeypatch.setattr(service, "_scroll_page", fake_scroll_page)
+
+    assert service.rebuild_document_catalog() == 1
+    assert seen_payload_selectors == [{"exclude": ["text_chunk"]}] * 2
+    assert [d["uuid"] for d in catalog.list_latest(["model-a", "model-b"])] == ["doc-1"]
+    assert catalog.is_backfilled()
+
+
+def _qdrant_scroll(service):
+    def fake_scroll_page(collection, scroll_filter=None, *, limit=256, offset=None, with_payload=True):
+        if collection == service._collection_name("model-a"):
+            return [{"payload": _payload("doc-q", "model-a", "2026-10-01T00:00:00+00:00", chunk_index=0)}], None
+        return [], None
+
+    return fake_scroll_page
+
+
+def test_reads_fall_back_to_qdrant_until_the_catalog_is_backfilled(monkeypatch):
+    catalog = _catalog()
+    # A document indexed while the backfill is still pending must not hide the rest.
+    catalog.upsert(_payload("doc-new", "model-a", "2026-10-02T00:00:00+00:00"))
+    service = _service(catalog)
+    monkeypatch.setattr(service, "_scroll_page", _qdrant_scroll(service))
+
+    assert [d["uuid"] for d in service.documents_available()] == ["doc-q"]
+
+    def unreachable(*args, **kwargs):
+        raise RuntimeError("qdrant unreachable")
+
+    monkeypatch.setattr(service, "_latest_document_payloads", unreachable)
+    try:
+        service.backfill_document_catalog()
+    except RuntimeError:
+        pass
+    assert not catalog.ready
+
+    monkeypatch.undo()
+    monkeypatch.setattr(service, "_scroll_page", _qdrant_scroll(service))
+    service.backfill_document_catalog()
+    assert catalog.ready
+    assert catalog.is_backfilled()
+    # Qdrant is the source of truth: the rebuild replaces rows written before it.
+    assert [d["uuid"] for d in service.documents_available()] == ["doc-q"]
+
+
+def test_catalog_read_errors_fall_back_to_qdrant(monkeypatch):
+    catalog = _catalog()
+    catalog.mark_ready()
+    service = _service(catalog)
+    monkeypatch.setattr(service, "_scroll_page", _qdrant_scroll(service))
+
+    def broken(*args, **kwargs):
+        raise OperationalError("SELECT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(catalog, "list_latest", broken)
+
+    assert [d["uuid"] for d in service.documents_available()] == ["doc-q"]
@@ -1,5 +1,11 @@
+import hashlib
+import io
+import os
+import tempfile
 import types
 
+import requests
+
 from bayleaf_agents.auth.deps import Principal
 from bayleaf_agents.services.qdrant_documents import QdrantDocumentsService
 from bayleaf_agents.tools.bayleaf import BayleafClient
@@ -16,6 +22,17 @@ def _principal() -> Principal:
     )
 
 
+def _fake_download(content, filename="doc.pdf", mime_type="application/pdf"):
+    def _download(url):
+        _ = url
+        fd, path = tempfile.mkstemp(prefix="document-")
+        with os.fdopen(fd, "wb") as out:
+            out.write(content)
+        return path, filename, mime_type, hashlib.sha256(content).hexdigest()
+
+    return _download
+
+
 def _service(*, bayleaf):
     return QdrantDocumentsService(
         base_url="http://qdrant.test",
@@ -57,8 +74,9 @@ def test_service_index_document_calls_new_bayleaf_method(monkeypatch):
     bayleaf = StubBayleaf()
     service = _service(bayleaf=bayleaf)
 
-    monkeypatch.setattr(service, "_download_file", lambda url: (b"file-content", "doc.pdf", "application/pdf"))
-    monkeypatch.setattr(service, "_extract_text", lambda content, filename, mime: ("hello world", "indexed"))
+    monkeypatch.setattr(service, "_download_file", _fake_download(b"file-content"))
+    monkeypatch.setattr(service, "_extract_text", lambda path, filename, mime: ("hello world", "indexed"))
+    monkeypatch.setattr(service, "_unchanged_index", lambda **kwargs: None)
     monkeypatch.setattr(service, "_index_payload", lambda **kwargs: kwargs)
 
     principal = _principal()
@@ -79,23 +97,20 @@ def test_reindex_bayleaf_document_accepts_legacy_payload_key(monkeypatch):
 
     monkeypatch.setattr(
         service,
-        "_find_latest_document_points",
+        "_probe_document",
         lambda document_uuid: (
             "sentence-transformers/all-MiniLM-L6-v2",
-            [
-                {
-                    "payload": {
-                        "source_type": "bayleaf",
-                        "bayleaf_document_version_uuid": "legacy-doc-uuid",
-                    }
-                }
-            ],
+            {
+                "source_type": "bayleaf",
+                "bayleaf_document_version_uuid": "legacy-doc-uuid",
+            },
+            1,
         ),
     )
 
     captured = {}
 
-    def fake_index_document(*, document_uuid, principal, model_used=None):
+    def fake_index_document(*, document_uuid, principal, model_used=None, force=False, progress=None):
         captured["document_uuid"] = document_uuid
         captured["principal"] = principal
         captured["model_used"] = model_used
@@ -173,3 +188,471 @@ def test_extract_document_uuids_ignores_reference_when_id_is_not_uuid():
     )
 
     assert out == set()
+
+
+class FakeEmbedder:
+    def __init__(self, dim=4):
+        self.dim = dim
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        _ = kwargs
+        import numpy as np
+
+        if isinstance(texts, str):
+            return np.full(self.dim, float(len(texts)), dtype=np.float64)
+        self.batches.append(list(texts))
+        return np.array([[float(len(t))] * self.dim for t in texts], dtype=np.float64)
+
+
+def test_embed_many_batches_chunks_into_float32_matrix():
+    service = _service(bayleaf=object())
+    service.embed_batch_size = 2
+    embedder = FakeEmbedder()
+    service.models.put("sentence-transformers/all-MiniLM-L6-v2", embedder)
+
+    out = service._embed_many(["a", "bb", "ccc"], model_used="sentence-transformers/all-MiniLM-L6-v2")
+
+    assert out.dtype.name == "float32"
+    assert out.shape == (3, 4)
+    assert out.flags["C_CONTIGUOUS"]
+    assert embedder.batches == [["a", "bb"], ["ccc"]]
+    assert out[2].tolist() == [3.0, 3.0, 3.0, 3.0]
+
+
+def test_index_payload_embeds_chunks_in_batches(monkeypatch):
+    service = _service(bayleaf=object())
+    service.embed_batch_size = 8
+    embedder = FakeEmbedder()
+    service.models.put("sentence-transformers/all-MiniLM-L6-v2", embedder)
+    # Upsert batching is under test here, not chunking.
+    monkeypatch.setattr(service, "_chunk_text", lambda text, model_used: ["x" * 1000, "x" * 1000, "x" * 900])
+    requests_sent = []
+    monkeypatch.setattr(
+        service,
+        "_request",
+        lambda method, path, json_data=None: requests_sent.append((method, path, json_data)) or {"result": {}},
+    )
+
+    out = service._index_payload(
+        document_uuid="doc-1",
+        filename="doc.txt",
+        mime_type="text/plain",
+        source_type="uploaded",
+        bayleaf_document_uuid=None,
+        text="x" * 2500,
+        status="indexed",
+        content_sha256="abc",
+        model_used="sentence-transformers/all-MiniLM-L6-v2",
+    )
+
+    assert out["chunks"] == 3
+    assert embedder.batches == [["x" * 1000, "x" * 1000, "x" * 900]]
+    upserts = [body for method, path, body in requests_sent if method == "PUT" and "/points" in path]
+    assert [p["vector"] for p in upserts[0]["points"]][2] == [900.0] * 4
+
+
+def test_index_payload_streams_bounded_upserts_and_confirms_without_wait(monkeypatch):
+    service = _service(bayleaf=object())
+    service.upsert_batch_size = 2
+    service.upsert_wait = False
+    embedder = FakeEmbedder()
+    service.models.put("sentence-transformers/all-MiniLM-L6-v2", embedder)
+    # Upsert batching is under test here, not chunking.
+    monkeypatch.setattr(service, "_chunk_text", lambda text, model_used: ["x" * 1000, "x" * 1000, "x" * 900])
+    requests_sent = []
+
+    def fake_request(method, path, json_data=None):
+        requests_sent.append((method, path, json_data))
+        if path.endswith("/points/count"):
+            stale = "must_not" in (json_data.get("filter") or {})
+            return {"result": {"count": 0 if stale else 3}}
+        return {"result": {}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    service._index_payload(
+        document_uuid="doc-1",
+        filename="doc.txt",
+        mime_type="text/plain",
+        source_type="uploaded",
+        bayleaf_document_uuid=None,
+        text="x" * 2500,
+        status="indexed",
+        content_sha256="abc",
+        model_used="sentence-transformers/all-MiniLM-L6-v2",
+    )
+
+    upserts = [(path, body) for method, path, body in requests_sent if method == "PUT" and "/points" in path]
+    assert [len(body["points"]) for _, body in upserts] == [2, 1]
+    assert all(path.endswith("?wait=false") for path, _ in upserts)
+    assert embedder.batches == [["x" * 1000, "x" * 1000], ["x" * 900]]
+    assert any(path.endswith("/points/count") for _, path, _ in requests_sent)
+
+
+def _indexed_point(**overrides):
+    payload = {
+        "document_uuid": "doc-abc",
+        "name": "doc.pdf",
+        "status": "indexed",
+        "is_bayleaf": True,
+        "source_type": "bayleaf",
+        "indexed_at": "2026-03-05T00:00:00+00:00",
+        "model_used": "sentence-transformers/all-MiniLM-L6-v2",
+        "content_sha256": hashlib.sha256(b"file-content").hexdigest(),
+        "chunking": "tokens:384:48",
+        "chunk_count": 2,
+    }
+    payload.update(overrides)
+    return {"id": "p-0", "payload": payload}
+
+
+def _stub_bayleaf_download():
+    class StubBayleaf:
+        def document_download_url(self, *, document_uuid, principal):
+            _ = (document_uuid, principal)
+            return {"download_url": "https://files.test/doc.pdf"}
+
+    return StubBayleaf()
+
+
+def test_index_document_skips_embedding_when_content_hash_unchanged(monkeypatch):
+    service = _service(bayleaf=_stub_bayleaf_download())
+    monkeypatch.setattr(service, "_download_file", _fake_download(b"file-content"))
+    monkeypatch.setattr(service, "_scroll_page", lambda collection, scroll_filter=None, **kw: ([_indexed_point()], None))
+    monkeypatch.setattr(service, "_count_points", lambda collection, count_filter: 2)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged document must not be re-extracted or re-embedded")
+
+    monkeypatch.setattr(service, "_extract_text", fail)
+    monkeypatch.setattr(service, "_index_payload", fail)
+
+    out = service.index_document(document_uuid="doc-abc", principal=_principal())
+
+    assert out["uuid"] == "doc-abc"
+    assert out["chunks"] == 2
+    assert out["indexed_at"] == "2026-03-05T00:00:00+00:00"
+
+
+def test_index_document_reindexes_when_chunking_changed_or_forced(monkeypatch):
+    service = _service(bayleaf=_stub_bayleaf_download())
+    monkeypatch.setattr(service, "_download_file", _fake_download(b"file-content"))
+    monkeypatch.setattr(service, "_extract_text", lambda path, filename, mime: ("hello world", "indexed"))
+    monkeypatch.setattr(service, "_count_points", lambda collection, count_filter: 2)
+    monkeypatch.setattr(service, "_index_payload", lambda **kwargs: {"reindexed": True})
+
+    monkeypatch.setattr(
+        service,
+        "_scroll_page",
+        lambda collection, scroll_filter=None, **kw: ([_indexed_point(chunking="chars:500:50")], None),
+    )
+    assert service.index_document(document_uuid="doc-abc", principal=_principal()) == {"reindexed": True}
+
+    monkeypatch.setattr(service, "_scroll_page", lambda collection, scroll_filter=None, **kw: ([_indexed_point()], None))
+    assert service.index_document(document_uuid="doc-abc", principal=_principal(), force=True) == {"reindexed": True}
+
+
+def test_index_payload_reembeds_only_changed_chunks_and_deletes_stale_tail(monkeypatch):
+    service = _service(bayleaf=object())
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+    embedder = FakeEmbedder()
+    service.models.put(model, embedder)
+    monkeypatch.setattr(service, "_chunk_text", lambda text, model_used: ["alpha", "beta", "gamma-new"])
+    existing = [
+        {"payload": {"chunk_index": 0, "chunk_sha256": hashlib.sha256(b"alpha").hexdigest()}},
+        {"payload": {"chunk_index": 1, "chunk_sha256": hashlib.sha256(b"beta").hexdigest()}},
+        {"payload": {"chunk_index": 2, "chunk_sha256": hashlib.sha256(b"gamma").hexdigest()}},
+        {"payload": {"chunk_index": 3, "chunk_sha256": hashlib.sha256(b"delta").hexdigest()}},
+    ]
+    requests_sent = []
+
+    def fake_request(method, path, json_data=None):
+        requests_sent.append((method, path.split("?")[0], json_data))
+        if path.endswith("/points/scroll"):
+            return {"result": {"points": existing, "next_page_offset": None}}
+        return {"result": {}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    out = service._index_payload(
+        document_uuid="doc-1",
+        filename="doc.txt",
+        mime_type="text/plain",
+        source_type="uploaded",
+        bayleaf_document_uuid=None,
+        text="ignored",
+        status="indexed",
+        content_sha256="new-digest",
+        model_used=model,
+    )
+
+    assert out["chunks"] == 3
+    assert embedder.batches == [["gamma-new"]]
+    upserts = [body for method, path, body in requests_sent if method == "PUT" and path.endswith("/points")]
+    assert [p["id"] for p in upserts[0]["points"]] == [service._point_id(model, "doc-1", 2)]
+    payload_updates = [body for _, path, body in requests_sent if path.endswith("/points/payload")]
+    assert payload_updates[0]["points"] == [service._point_id(model, "doc-1", 0), service._point_id(model, "doc-1", 1)]
+    assert payload_updates[0]["payload"]["content_sha256"] == "new-digest"
+    assert "text_chunk" not in payload_updates[0]["payload"]
+    deletes = [body for _, path, body in requests_sent if path.endswith("/points/delete")]
+    assert deletes == [
+        {
+            "filter": {
+                "must": [
+                    {"key": "document_uuid", "match": {"value": "doc-1"}},
+                    {"key": "chunk_index", "range": {"gte": 3}},
+                ]
+            }
+        }
+    ]
+
+
+def test_index_documents_bulk_reports_per_document_results(monkeypatch):
+    from bayleaf_agents.services.qdrant_documents import DocumentServiceError
+
+    class StubBayleaf:
+        def document_download_url(self, *, document_uuid, principal):
+            _ = principal
+            if document_uuid == "doc-bad":
+                return {"error": "request_failed", "status_code": 404}
+            if document_uuid == "doc-down":
+                raise requests.ConnectionError("bayleaf unreachable")
+            return {"download_url": f"https://files.test/{document_uuid}.txt"}
+
+    service = _service(bayleaf=StubBayleaf())
+    service.bulk_workers = 2
+    monkeypatch.setattr(
+        service,
+        "_download_file",
+        lambda url: _fake_download(url.encode(), url.rsplit("/", 1)[-1], "text/plain")(url),
+    )
+    monkeypatch.setattr(service, "_unchanged_index", lambda **kwargs: None)
+    monkeypatch.setattr(service, "_extract_text", lambda path, filename, mime: (open(path).read(), "indexed"))
+    indexed = []
+
+    def fake_index_payload(**kwargs):
+        indexed.append(kwargs["document_uuid"])
+        if kwargs["document_uuid"] == "doc-3":
+            raise DocumentServiceError(503, "qdrant_unavailable")
+        return {"uuid": kwargs["document_uuid"], "chunks": 1}
+
+    monkeypatch.setattr(service, "_index_payload", fake_index_payload)
+
+    out = service.index_documents_bulk(["doc-1", "doc-bad", "doc-2", "doc-1", "doc-3", "doc-down"], principal=_principal())
+
+    assert [r["document_uuid"] for r in out] == ["doc-1", "doc-bad", "doc-2", "doc-3", "doc-down"]
+    assert [r["ok"] for r in out] == [True, False, True, False, False]
+    assert out[1]["error"]["error"] == "download_url_request_failed"
+    assert out[3]["error"]["status_code"] == 503
+    assert out[4]["error"]["error"] == "document_index_failed"
+    assert sorted(indexed) == ["doc-1", "doc-2", "doc-3"]
+
+
+def test_download_and_upload_are_streamed_through_a_spool_file(monkeypatch, tmp_path):
+    blocks = [b"first block ", b"second block"]
+
+    class StreamingResponse:
+        headers = {"content-type": "text/plain", "content-disposition": 'attachment; filename="notes.txt"'}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            assert chunk_size == 1024 * 1024
+            yield from blocks
+
+        @property
+        def content(self):
+            raise AssertionError("download must not be buffered in memory")
+
+    def fake_get(url, timeout, stream):
+        assert stream is True
+        return StreamingResponse()
+
+    monkeypatch.setattr("bayleaf_agents.services.qdrant_documents.requests.get", fake_get)
+    service = _service(bayleaf=_stub_bayleaf_download())
+    service.spool_dir = str(tmp_path)
+
+    path, filename, mime_type, digest = service._download_file("https://files.test/x")
+    with open(path, "rb") as fh:
+        assert fh.read() == b"first block second block"
+    assert (filename, mime_type) == ("notes.txt", "text/plain")
+    assert digest == hashlib.sha256(b"first block second block").hexdigest()
+    os.remove(path)
+
+    captured = {}
+    monkeypatch.setattr(service, "_index_payload", lambda **kwargs: captured.update(kwargs) or {"ok": True})
+    service.index_uploaded_document(filename="a.txt", fileobj=io.BytesIO(b"uploaded text"), mime_type="text/plain")
+
+    assert captured["text"] == "uploaded text"
+    assert captured["content_sha256"] == hashlib.sha256(b"uploaded text").hexdigest()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ensure_collection_bootstraps_once_with_payload_indexes(monkeypatch):
+    service = _service(bayleaf=object())
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+    requests_sent = []
+
+    def fake_request(method, path, json_data=None):
+        requests_sent.append((method, path, json_data))
+        return {
+            "result": {
+                "config": {"params": {"vectors": {"size": 384, "distance": "Cosine"}}},
+                "payload_schema": {"document_uuid": {"data_type": "keyword"}},
+            }
+        }
+
+    def fail(*args, **kwargs):
+        raise AssertionError("existing collections must not trigger a dim probe")
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    monkeypatch.setattr(service, "_embed", fail)
+
+    assert service._ensure_collection(model) == service._collection_name(model)
+    service._ensure_collection(model)
+
+    assert requests_sent[0][0] == "GET"
+    indexed = {body["field_name"]: body["field_schema"] for method, path, body in requests_sent if "/index" in path}
+    assert indexed == {
+        "source_type": "keyword",
+        "model_used": "keyword",
+        "is_bayleaf": "bool",
+        "chunk_index": "integer",
+    }
+    assert len(requests_sent) == 5
+    assert service._model_dims[model] == 384
+
+
+def test_ensure_collection_creates_missing_collection(monkeypatch):
+    from bayleaf_agents.services.qdrant_documents import DocumentServiceError
+
+    service = _service(bayleaf=object())
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+    service.models.put(model, FakeEmbedder())
+    created = []
+
+    def fake_request(method, path, json_data=None):
+        if method == "GET":
+            if not created:
+                raise DocumentServiceError(404, "qdrant_request_failed")
+            return {"result": {"config": {"params": created[0]}}}
+        if "/index" not in path:
+            created.append(json_data)
+        return {"result": {}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    service._ensure_collection(model)
+
+    assert created == [
+        {
+            "vectors": {"size": 4, "distance": "Cosine"},
+            "sparse_vectors": {"bm25": {"modifier": "idf"}},
+        }
+    ]
+    assert service._collection_name(model) in service._sparse_collections
+
+
+def test_collection_deleted_outside_the_process_is_bootstrapped_again(monkeypatch):
+    from bayleaf_agents.services.qdrant_documents import DocumentServiceError
+
+    service = _service(bayleaf=object())
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+    service.models.put(model, FakeEmbedder())
+    service.upsert_wait = True
+    bootstraps = []
+    upserts = []
+
+    def fake_request(method, path, json_data=None):
+        if method == "GET":
+            bootstraps.append(path)
+            return {"result": {"config": {"params": {"vectors": {"size": 4, "distance": "Cosine"}}}, "payload_schema": {}}}
+        if path.endswith("/points?wait=true"):
+            upserts.append(json_data)
+            if len(upserts) == 1:
+                raise DocumentServiceError(404, "qdrant_request_failed", {"status": {"error": "Not found"}})
+        return {"result": {"points": [], "next_page_offset": None, "count": 0}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    out = service._index_payload(
+        document_uuid="doc-1",
+        filename="doc.txt",
+        mime_type="text/plain",
+        source_type="uploaded",
+        bayleaf_document_uuid=None,
+        text="LDL above 3.5 needs a fasting lipid panel.",
+        status="indexed",
+        content_sha256="abc",
+        model_used=model,
+    )
+
+    assert out["chunks"] == 1
+    assert len(upserts) == 2
+    # The cached collection was dropped and bootstrapped again after the 404.
+    assert len(bootstraps) == 2
+
+
+def test_get_document_probes_every_model_collection_with_limit_one(monkeypatch):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=["model-e5", "model-bge"],
+        default_model="model-e5",
+    )
+    newest = {"model-e5": "2026-10-01T00:00:00+00:00", "model-bge": "2026-10-02T00:00:00+00:00"}
+    scrolls = []
+
+    def fake_request(method, path, json_data=None):
+        model = "model-e5" if path.startswith(f"/collections/{service._collection_name('model-e5')}/") else "model-bge"
+        if path.endswith("/points/scroll"):
+            scrolls.append((model, json_data["limit"], json_data["with_payload"]))
+            payload = {"document_uuid": "doc-1", "model_used": model, "indexed_at": newest[model]}
+            return {"result": {"points": [{"payload": payload}], "next_page_offset": "more"}}
+        if path.endswith("/points/count"):
+            return {"result": {"count": 1200 if model == "model-bge" else 800}}
+        raise AssertionError(path)
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    out = service.get_document("doc-1")
+
+    assert out["model_used"] == "model-bge"
+    assert out["chunks"] == 1200
+    assert sorted(scrolls) == [
+        ("model-bge", 1, {"exclude": ["text_chunk"]}),
+        ("model-e5", 1, {"exclude": ["text_chunk"]}),
+    ]
+
+
+def test_chunker_sizes_chunks_with_the_model_tokenizer_and_sequence_limit():
+    service = _service(bayleaf=object())
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+
+    class TokenizingEmbedder(FakeEmbedder):
+        max_seq_length = 34
+
+        def tokenizer(self, texts, add_special_tokens=True, truncation=True):
+            assert add_special_tokens is False and truncation is False
+            # Two "subword" tokens per whitespace word.
+            return {"input_ids": [[0] * (2 * len(text.split())) for text in texts]}
+
+    service.models.put(model, TokenizingEmbedder())
+    text = " ".join(f"Sentence {i} here." for i in range(20))
+
+    chunks = service._chunk_text(text, model)
+
+    assert service._chunker(model).max_tokens == 32
+    assert all(2 * len(chunk.split()) <= 32 for chunk in chunks)
+    assert service._chunking_signature() == "tokens:384:48"
@@ -0,0 +1,108 @@
+import numpy as np
+
+from bayleaf_agents.services.embedding_cache import EmbeddingCache, QueryEmbeddingLRU, text_key
+from bayleaf_agents.services.qdrant_documents import QdrantDocumentsService
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        _ = kwargs
+        self.encoded.extend(texts)
+        return np.array([[float(len(t)), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+
+def test_cache_round_trip_persists_across_instances(tmp_path):
+    keys = [text_key("alpha"), text_key("beta")]
+    matrix = np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    EmbeddingCache(str(tmp_path)).put_many("model-a", keys, matrix)
+
+    reopened = EmbeddingCache(str(tmp_path))
+    found = reopened.get_many("model-a", [text_key("beta"), text_key("missing"), text_key("alpha")])
+
+    assert sorted(found) == [0, 2]
+    assert found[0].tolist() == [3.0, 4.0]
+    assert found[2].tolist() == [1.0, 2.0]
+    assert reopened.get_many("model-b", keys) == {}
+
+
+def test_cache_evicts_least_recently_used_when_full(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=2)
+    cache.put_many("m", [text_key("a")], np.array([[1.0]], dtype=np.float32))
+    cache.put_many("m", [text_key("b")], np.array([[2.0]], dtype=np.float32))
+    cache.get_many("m", [text_key("a")])
+    cache.put_many("m", [text_key("c")], np.array([[3.0]], dtype=np.float32))
+
+    found = cache.get_many("m", [text_key("a"), text_key("b"), text_key("c")])
+
+    assert sorted(found) == [0, 2]
+    assert found[2].tolist() == [3.0]
+
+
+def test_embed_many_only_encodes_cache_misses(tmp_path):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=["m"],
+        default_model="m",
+        embedding_cache=EmbeddingCache(str(tmp_path)),
+    )
+    embedder = CountingEmbedder()
+    service.models.put("m", embedder)
+
+    first = service._embed_many(["one", "three"], model_used="m")
+    second = service._embed_many(["three", "four", "one"], model_used="m")
+
+    assert embedder.encoded == ["one", "three", "four"]
+    assert second.tolist() == [first[1].tolist(), [4.0, 1.0, 0.0], first[0].tolist()]
+    # Query embeddings stay out of the on-disk cache.
+    service._embed("five", model_used="m")
+    assert service.embedding_cache.get_many("m", [text_key("five")]) == {}
+
+
+def test_query_lru_normalizes_whitespace_and_counts_hits(monkeypatch):
+    lru = QueryEmbeddingLRU(max_entries=2, ttl_seconds=60)
+    lru.put("m", "valores  de\nreferência", [0.1, 0.2])
+
+    assert lru.get("m", " valores de referência ") == [0.1, 0.2]
+    assert lru.get("other-model", "valores de referência") is None
+    assert lru.stats()["hits"] == 1
+    assert lru.stats()["misses"] == 1
+
+    lru.put("m", "b", [1.0])
+    lru.put("m", "c", [2.0])
+    assert lru.get("m", "valores de referência") is None
+
+    clock = [1000.0]
+    monkeypatch.setattr("bayleaf_agents.services.embedding_cache.time.monotonic", lambda: clock[0])
+    lru.put("m", "d", [3.0])
+    clock[0] += 61
+    assert lru.get("m", "d") is None
+
+
+def test_query_documents_reuses_query_vector(monkeypatch):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=["m"],
+        default_model="m",
+    )
+    embedded = []
+    monkeypatch.setattr(service, "_ensure_collection", lambda model: "documents_m")
+    monkeypatch.setattr(service, "_embed", lambda text, model_used: embedded.append(text) or [1.0, 0.0])
+    monkeypatch.setattr(service, "_query_collection", lambda **kwargs: [])
+
+    first = service.query_documents(query="LDL cut-off", top_k=3)
+    second = service.query_documents(query="LDL  cut-off", top_k=10, document_uuids=["doc-1"])
+
+    assert embedded == ["LDL cut-off"]
+    assert first["trace"]["query_embedding_cache"] == "miss"
+    assert second["trace"]["query_embedding_cache"] == "hit"
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from bayleaf_agents.services.embedding_models import EmbeddingModelRegistry, ModelLoadError, parse_model_threads
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+
+MB = 1024 * 1024
+
+
+class FakeTensor:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def numel(self):
+        return self.nbytes
+
+    def element_size(self):
+        return 1
+
+
+class FakeModel:
+    def __init__(self, name, nbytes):
+        self.name = name
+        self._tensor = FakeTensor(nbytes)
+
+    def parameters(self):
+        return [self._tensor]
+
+    def buffers(self):
+        return []
+
+
+def test_concurrent_first_requests_share_a_single_load():
+    calls = []
+
+    def slow_loader(name):
+        calls.append(name)
+        time.sleep(0.05)
+        return FakeModel(name, MB)
+
+    registry = EmbeddingModelRegistry(loader=slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("bge-m3"))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["bge-m3"]
+    assert len({id(model) for model in results}) == 1
+    stats = registry.stats()["models"]["bge-m3"]
+    assert stats["loads"] == 1 and stats["hits"] == 5
+    assert stats["memory_mb"] == 1.0 and stats["last_load_seconds"] >= 0.05
+
+
+def test_budget_evicts_least_recently_used_idle_model():
+    registry = EmbeddingModelRegistry(memory_budget_mb=2.5, loader=lambda name: FakeModel(name, MB))
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b is now least recently used
+
+    registry.get("c")
+
+    assert sorted(registry.loaded()) == ["a", "c"]
+    assert registry.stats()["models"]["b"]["evictions"] == 1
+
+
+def test_model_in_use_is_never_evicted():
+    registry = EmbeddingModelRegistry(memory_budget_mb=1.5, loader=lambda name: FakeModel(name, MB))
+
+    with registry.use("a"):
+        registry.get("b")
+        assert sorted(registry.loaded()) == ["a", "b"]
+        assert registry.evict("a") is False
+
+    registry.get("c")
+    assert "c" in registry.loaded()
+    assert registry.stats()["memory_used_mb"] <= 2.0
+
+
+def test_encode_with_thread_override_runs_alone():
+    registry = EmbeddingModelRegistry(model_threads={"big": 4}, loader=lambda name: FakeModel(name, MB))
+    registry._set_threads = lambda threads: None
+    events = []
+
+    def encode_big():
+        with registry.use("big"):
+            events.append("big")
+
+    with registry.use("small"):
+        worker = threading.Thread(target=encode_big)
+        worker.start()
+        worker.join(timeout=0.2)
+        # torch threads are process-global, so "big" cannot start while "small" is encoding.
+        assert worker.is_alive()
+        events.append("small done")
+    worker.join(timeout=5)
+
+    assert events == ["small done", "big"]
+
+
+def test_parse_model_threads():
+    assert parse_model_threads("BAAI/bge-m3=4, intfloat/multilingual-e5-base=2,bad,=3") == {
+        "BAAI/bge-m3": 4,
+        "intfloat/multilingual-e5-base": 2,
+    }
+
+
+def test_service_reports_model_load_errors_as_document_errors():
+    def failing_loader(name):
+        raise ModelLoadError("embedding_model_load_failed", f"cannot load {name}")
+
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=["m"],
+        default_model="m",
+        model_registry=EmbeddingModelRegistry(loader=failing_loader),
+    )
+
+    with pytest.raises(DocumentServiceError) as exc:
+        service._embed_many(["text"], model_used="m")
+
+    assert exc.value.status_code == 500
+    assert exc.value.message == "embedding_model_load_failed"
@@ -0,0 +1,175 @@
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from bayleaf_agents.services.embedding_models import EmbeddingModelRegistry, ModelLoadError
+from bayleaf_agents.services.embedding_worker import EmbeddingWorkerError, EmbeddingWorkerPool
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+
+MODEL = "model-a"
+
+
+class LengthEmbedder:
+    # Runs inside the worker process; the vector encodes the text so callers can check routing.
+    max_seq_length = 128
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        _ = kwargs
+        matrix = np.array([[len(text), text.count("a"), 1.0] for text in texts], dtype=np.float32)
+        if normalize_embeddings:
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix
+
+
+class SizedEmbedder:
+    # Reports 1 MB of weights and which load (per worker process) produced it.
+    _loads = itertools.count(1)
+
+    def __init__(self):
+        self.load = next(self._loads)
+        self.weights = np.zeros(1024 * 1024, dtype=np.uint8)
+
+    def parameters(self):
+        return [SizedTensor(self.weights.nbytes)]
+
+    def buffers(self):
+        return []
+
+    def encode(self, texts, **kwargs):
+        _ = kwargs
+        return np.array([[self.load] for _ in texts], dtype=np.float32)
+
+
+class SizedTensor:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def numel(self):
+        return self.nbytes
+
+    def element_size(self):
+        return 1
+
+
+class CrashingEmbedder:
+    def encode(self, texts, **kwargs):
+        if texts != ["dim probe"]:
+            os._exit(3)
+        return np.zeros((1, 3), dtype=np.float32)
+
+
+def fake_loader(name):
+    if name == "broken":
+        raise ModelLoadError("embedding_model_load_failed", "no such model")
+    if name == "crash":
+        return CrashingEmbedder()
+    if name.startswith("sized"):
+        return SizedEmbedder()
+    return LengthEmbedder()
+
+
+@pytest.fixture
+def pool():
+    pool = EmbeddingWorkerPool(workers=1, max_batch=64, max_wait_ms=50, timeout=30, loader=f"{__name__}:fake_loader")
+    yield pool
+    pool.shutdown()
+
+
+def test_concurrent_requests_are_micro_batched_and_routed_back(pool):
+    pool.start()
+    pool.embedder(MODEL)  # warm the worker so the timing below is about batching only
+    texts = ["a" * n for n in range(1, 9)]
+    results = {}
+    barrier = threading.Barrier(len(texts))
+
+    def _call(text):
+        barrier.wait()
+        results[text] = pool.encode(MODEL, [text], normalize=False)
+
+    threads = [threading.Thread(target=_call, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for text, matrix in results.items():
+        assert matrix.tolist() == [[len(text), len(text), 1.0]]
+    stats = pool.stats()
+    assert stats["requests"] == len(texts)
+    assert stats["batches"] < len(texts)
+    assert stats["max_batch_requests"] > 1
+
+
+def test_service_encodes_through_worker_proxies(pool):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.invalid",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL, "broken"],
+        default_model=MODEL,
+        model_registry=EmbeddingModelRegistry(loader=pool.embedder),
+    )
+
+    vector = service._embed("aaa", MODEL)
+    matrix = service._embed_many(["a", "bb"], MODEL)
+
+    assert np.allclose(vector, np.array([3, 3, 1]) / np.sqrt(19))
+    assert matrix.shape == (2, 3)
+    assert service._model_dim(MODEL) == 3
+    assert service._get_embedder(MODEL).max_seq_length == 128
+    with pytest.raises(DocumentServiceError) as exc:
+        service._embed("x", "broken")
+    assert exc.value.message == "embedding_model_load_failed"
+
+
+def test_workers_keep_models_under_the_memory_budget():
+    pool = EmbeddingWorkerPool(
+        workers=1, max_wait_ms=0, timeout=30, memory_budget_mb=1.5, loader=f"{__name__}:fake_loader"
+    )
+    try:
+        loads = [pool.encode(name, ["x"])[0][0] for name in ("sized-a", "sized-b", "sized-a")]
+    finally:
+        pool.shutdown()
+
+    # Only one 1 MB model fits, so going back to sized-a loads it again.
+    assert loads == [1.0, 2.0, 3.0]
+
+
+def test_requests_held_by_a_dead_worker_fail_without_waiting_for_the_timeout(pool):
+    pool.embedder("crash")
+    started = time.monotonic()
+
+    with pytest.raises(EmbeddingWorkerError):
+        pool.encode("crash", ["boom"])
+
+    assert time.monotonic() - started < 10
+    assert pool.stats()["restarts"] == 1
+    assert pool.encode(MODEL, ["aa"], normalize=False).tolist() == [[2, 2, 1.0]]
+
+
+def test_worker_failures_surface_as_service_unavailable(pool):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.invalid",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL, "crash"],
+        default_model=MODEL,
+        model_registry=EmbeddingModelRegistry(loader=pool.embedder),
+    )
+
+    with pytest.raises(DocumentServiceError) as died:
+        service._embed_many(["boom"], "crash")
+    pool.shutdown()
+    with pytest.raises(DocumentServiceError) as closed:
+        service._get_embedder(MODEL)
+
+    assert (died.value.status_code, died.value.message) == (503, "embedding_worker_unavailable")
+    assert (closed.value.status_code, closed.value.message) == (503, "embedding_worker_unavailable")
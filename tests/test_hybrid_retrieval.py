@@ -0,0 +1,125 @@
+from bayleaf_agents.services.qdrant_documents import QdrantDocumentsService
+from bayleaf_agents.services.sparse_vectors import document_sparse_vector, query_sparse_vector, tokenize
+
+MODEL = "model-a"
+
+
+def _service():
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL],
+        default_model=MODEL,
+        retrieval_mode="hybrid",
+    )
+    service._embed_query = lambda query, model: ([0.1, 0.2], False)
+    return service
+
+
+def test_tokenize_keeps_lab_codes_and_values_whole():
+    assert tokenize("Regra 2_2s e R-4s: LDL-c > 3.5 mg/dL") == ["regra", "2_2s", "e", "r-4s", "ldl-c", "3.5", "mg/dl"]
+
+
+def test_document_sparse_vector_saturates_repeated_terms():
+    vector = document_sparse_vector("ldl ldl ldl ldl hdl")
+    by_term = dict(zip(vector["indices"], vector["values"]))
+    ldl, hdl = by_term[query_sparse_vector("ldl")["indices"][0]], by_term[query_sparse_vector("hdl")["indices"][0]]
+
+    assert vector["indices"] == sorted(vector["indices"])
+    assert hdl < ldl < 4 * hdl
+
+
+def test_hybrid_query_fuses_dense_and_sparse_in_one_call(monkeypatch):
+    service = _service()
+    collection = service._collection_name(MODEL)
+    service._ready_collections.add(collection)
+    service._sparse_collections.add(collection)
+    sent = []
+
+    def fake_request(method, path, json_data=None):
+        sent.append((method, path, json_data))
+        return {"result": {"points": [{"score": 0.5, "payload": {"document_uuid": "doc-1", "text_chunk": "2_2s"}}]}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    out = service.query_documents(query="regra 2_2s", top_k=3, document_uuids=["doc-1", "doc-2"])
+
+    assert len(sent) == 1
+    method, path, body = sent[0]
+    assert path == f"/collections/{collection}/points/query"
+    assert body["query"] == {"fusion": "rrf"}
+    assert body["limit"] == 3
+    dense, sparse = body["prefetch"]
+    assert dense["query"] == [0.1, 0.2] and "using" not in dense
+    assert sparse["using"] == "bm25" and sparse["query"] == query_sparse_vector("regra 2_2s")
+    assert dense["filter"] == sparse["filter"] == out["trace"]["query_filter"]
+    assert out["chunks"][0]["document_uuid"] == "doc-1"
+    assert out["trace"]["retrieval_mode"] == "hybrid"
+
+
+def test_dense_is_the_default_retrieval_mode():
+    from bayleaf_agents.config import settings
+
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL],
+        default_model=MODEL,
+    )
+
+    assert service.retrieval_mode == "dense"
+    assert settings.RETRIEVAL_MODE == "dense"
+
+
+def test_collections_without_sparse_vectors_fall_back_to_dense(monkeypatch):
+    service = _service()
+    service._ready_collections.add(service._collection_name(MODEL))
+    paths = []
+    monkeypatch.setattr(service, "_request", lambda method, path, json_data=None: paths.append(path) or {"result": []})
+
+    out = service.query_documents(query="ldl", top_k=3)
+
+    assert paths == [f"/collections/{service._collection_name(MODEL)}/points/search"]
+    assert out["trace"]["retrieval_mode"] == "dense"
+    assert out["trace"]["requested_retrieval_mode"] == "hybrid"
+
+
+def test_index_payload_writes_named_dense_and_sparse_vectors(monkeypatch):
+    import numpy as np
+
+    service = _service()
+    collection = service._collection_name(MODEL)
+    service._ready_collections.add(collection)
+    service._sparse_collections.add(collection)
+    service.models.put(MODEL, object())  # no tokenizer: chunk sizes are approximated
+    monkeypatch.setattr(service, "_embed_many", lambda texts, model_used: np.ones((len(texts), 2), dtype=np.float32))
+    upserts = []
+
+    def fake_request(method, path, json_data=None):
+        if method == "PUT" and "/points" in path:
+            upserts.extend(json_data["points"])
+        return {"result": {}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    service._index_payload(
+        document_uuid="doc-1",
+        filename="sop.txt",
+        mime_type="text/plain",
+        source_type="uploaded",
+        bayleaf_document_uuid=None,
+        text="Westgard 1_3s rejeita a corrida",
+        status="indexed",
+        content_sha256="abc",
+        model_used=MODEL,
+    )
+
+    assert upserts[0]["vector"][""] == [1.0, 1.0]
+    expected = document_sparse_vector("Westgard 1_3s rejeita a corrida", avg_len=service.chunk_max_tokens)
+    assert upserts[0]["vector"]["bm25"] == expected
@@ -0,0 +1,298 @@
+import base64
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from bayleaf_agents.app import create_app
+from bayleaf_agents.auth.deps import Principal
+from bayleaf_agents.models import Base, IndexingJob, IndexingJobStatus
+from bayleaf_agents.routers import documents as documents_router
+from bayleaf_agents.services.indexing_jobs import IndexingJobRunner
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError
+
+
+def _session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _principal() -> Principal:
+    return Principal(
+        user_id="user-1",
+        sub="user-1",
+        scopes=["chat.send"],
+        patient_id=None,
+        raw={},
+        raw_token="token",
+    )
+
+
+class StubDocumentsService:
+    def __init__(self):
+        self.calls = []
+        self.upload_uuids = []
+        self.upload_errors = []
+
+    def index_document(self, *, document_uuid, principal, model_used=None, force=False, progress=None):
+        self.calls.append(("index", document_uuid, principal.raw_token, force))
+        progress(0, 3)
+        progress(3, 3)
+        return {
+            "uuid": document_uuid,
+            "name": "doc.pdf",
+            "status": "indexed",
+            "is_bayleaf": True,
+            "chunks": 3,
+            "source_type": "bayleaf",
+            "indexed_at": "2026-10-16T00:00:00+00:00",
+            "model_used": "m",
+        }
+
+    def index_uploaded_file(self, *, filename, path, mime_type, model_used=None, progress=None, document_uuid=None):
+        with open(path, "rb") as fh:
+            self.calls.append(("upload", filename, fh.read(), mime_type))
+        self.upload_uuids.append(document_uuid)
+        if self.upload_errors:
+            raise self.upload_errors.pop(0)
+        return {
+            "uuid": document_uuid,
+            "name": filename,
+            "status": "indexed",
+            "is_bayleaf": False,
+            "chunks": 1,
+            "source_type": "uploaded",
+            "indexed_at": "2026-10-16T00:00:00+00:00",
+            "model_used": "m",
+        }
+
+    def reindex_document(self, **kwargs):
+        raise DocumentServiceError(404, "document_not_found")
+
+
+def _wait(runner, job_id):
+    future = runner._futures.get(job_id)
+    if future is not None:
+        future.result(timeout=5)
+    return runner.get(job_id)
+
+
+def test_index_job_runs_in_background_and_records_progress(tmp_path):
+    service = StubDocumentsService()
+    runner = IndexingJobRunner(service, _session_factory(), spool_dir=str(tmp_path))
+
+    job = runner.submit_index(document_uuid="doc-1", principal=_principal(), force=True)
+    done = _wait(runner, job["id"])
+
+    assert job["status"] == "queued"
+    assert done["status"] == "succeeded"
+    assert done["chunks_embedded"] == 3
+    assert done["chunks_total"] == 3
+    assert done["result"]["uuid"] == "doc-1"
+    assert service.calls == [("index", "doc-1", "token", True)]
+
+
+def test_failed_job_keeps_error_and_upload_is_spooled(tmp_path):
+    service = StubDocumentsService()
+    runner = IndexingJobRunner(service, _session_factory(), spool_dir=str(tmp_path))
+
+    failed = _wait(runner, runner.submit_reindex(document_uuid="doc-x", principal=_principal())["id"])
+    assert failed["status"] == "failed"
+    assert failed["error"]["error"] == "document_not_found"
+
+    class Upload:
+        def __init__(self):
+            self.chunks = [b"hello ", b"world", b""]
+
+        def read(self, size):
+            return self.chunks.pop(0)
+
+    uploaded = _wait(runner, runner.submit_upload(filename="a.txt", fileobj=Upload(), mime_type="text/plain")["id"])
+    assert uploaded["status"] == "succeeded"
+    assert service.calls[-1] == ("upload", "a.txt", b"hello world", "text/plain")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_resume_requeues_uploads_and_interrupts_token_bound_jobs(tmp_path):
+    session_factory = _session_factory()
+    spool = tmp_path / "upload-1"
+    spool.write_bytes(b"content")
+    db = session_factory()
+    db.add(
+        IndexingJob(
+            id="job-index",
+            kind="index",
+            status=IndexingJobStatus.running,
+            params={},
+            owner_id="user-1",
+            document_uuid="doc-1",
+        )
+    )
+    db.add(
+        IndexingJob(
+            id="job-upload",
+            kind="upload",
+            status=IndexingJobStatus.queued,
+            params={"filename": "a.txt", "mime_type": "text/plain", "spool_path": str(spool)},
+        )
+    )
+    db.commit()
+    db.close()
+
+    service = StubDocumentsService()
+    runner = IndexingJobRunner(service, session_factory, spool_dir=str(tmp_path))
+    assert runner.resume_pending() == 1
+
+    assert _wait(runner, "job-upload")["status"] == "succeeded"
+    interrupted = runner.get("job-index")
+    assert interrupted["status"] == "interrupted"
+
+    retried = runner.retry("job-index", _principal())
+    assert retried["status"] == "queued"
+    assert _wait(runner, "job-index")["status"] == "succeeded"
+
+
+class Upload:
+    def __init__(self, content=b"hello"):
+        self.chunks = [content, b""]
+
+    def read(self, size):
+        return self.chunks.pop(0)
+
+
+def test_retried_upload_keeps_its_document_uuid_and_permanent_failures_drop_the_spool(tmp_path):
+    service = StubDocumentsService()
+    runner = IndexingJobRunner(service, _session_factory(), spool_dir=str(tmp_path))
+
+    service.upload_errors.append(DocumentServiceError(503, "qdrant_unavailable"))
+    job = runner.submit_upload(filename="a.txt", fileobj=Upload(), mime_type="text/plain")
+    assert _wait(runner, job["id"])["status"] == "failed"
+    runner.retry(job["id"], None)
+    done = _wait(runner, job["id"])
+
+    assert done["status"] == "succeeded"
+    assert service.upload_uuids == [job["document_uuid"], job["document_uuid"]]
+    assert done["document_uuid"] == job["document_uuid"]
+
+    service.upload_errors.append(DocumentServiceError(422, "pdf_text_extraction_failed"))
+    rejected = runner.submit_upload(filename="b.pdf", fileobj=Upload(), mime_type="application/pdf")
+    assert _wait(runner, rejected["id"])["status"] == "failed"
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(DocumentServiceError) as exc:
+        runner.retry(rejected["id"], None)
+    assert exc.value.message == "indexing_job_upload_expired"
+
+
+def test_spool_sweep_removes_expired_uploads_not_needed_by_active_jobs(tmp_path):
+    session_factory = _session_factory()
+    runner = IndexingJobRunner(StubDocumentsService(), session_factory, spool_dir=str(tmp_path), spool_retention_hours=1)
+    old = time.time() - 2 * 3600
+    for name in ("upload-failed", "upload-queued", "upload-fresh"):
+        (tmp_path / name).write_bytes(b"x")
+    for name in ("upload-failed", "upload-queued"):
+        os.utime(tmp_path / name, (old, old))
+    db = session_factory()
+    db.add(
+        IndexingJob(
+            id="job-queued",
+            kind="upload",
+            status=IndexingJobStatus.queued,
+            params={"spool_path": str(tmp_path / "upload-queued")},
+        )
+    )
+    db.commit()
+    db.close()
+
+    assert runner.sweep_spool() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["upload-fresh", "upload-queued"]
+
+
+def test_jobs_are_only_visible_to_their_owner(tmp_path):
+    runner = IndexingJobRunner(StubDocumentsService(), _session_factory(), spool_dir=str(tmp_path))
+    job = runner.submit_reindex(document_uuid="doc-x", principal=_principal())
+    _wait(runner, job["id"])
+    stranger = Principal(user_id="user-2", sub="user-2", scopes=[], patient_id=None, raw={}, raw_token="t")
+
+    assert runner.get(job["id"], _principal())["status"] == "failed"
+    assert runner.get(job["id"], stranger) is None
+    assert runner.retry(job["id"], stranger) is None
+    assert runner.get(job["id"])["status"] == "failed"
+
+
+def test_index_job_endpoints_enqueue_and_report_status(monkeypatch, tmp_path):
+    runner = IndexingJobRunner(StubDocumentsService(), _session_factory(), spool_dir=str(tmp_path))
+    monkeypatch.setattr(documents_router, "get_indexing_jobs", lambda: runner)
+    client = TestClient(create_app())
+    token = base64.urlsafe_b64encode(json.dumps({"user_id": "user-1"}).encode()).decode().rstrip("=")
+    headers = {"Authorization": f"Bearer header.{token}.signature"}
+
+    created = client.post("/agents/documents/index/jobs", json={"document_uuid": "doc-1"}, headers=headers)
+    assert created.status_code == 202
+    job_id = created.json()["id"]
+    _wait(runner, job_id)
+
+    status = client.get(f"/agents/documents/jobs/{job_id}", headers=headers)
+    assert status.status_code == 200
+    assert status.json()["status"] == "succeeded"
+    assert status.json()["result"]["chunks"] == 3
+    assert client.get("/agents/documents/jobs/missing", headers=headers).status_code == 404
+
+
+def test_resume_only_takes_over_jobs_with_expired_leases(tmp_path):
+    session_factory = _session_factory()
+    now = datetime.utcnow()
+    db = session_factory()
+    for job_id, lease in (("job-live", now + timedelta(minutes=1)), ("job-dead", now - timedelta(seconds=1))):
+        db.add(
+            IndexingJob(
+                id=job_id,
+                kind="index",
+                status=IndexingJobStatus.running,
+                params={},
+                worker_id="other-process",
+                lease_expires_at=lease,
+            )
+        )
+    db.commit()
+    db.close()
+
+    runner = IndexingJobRunner(StubDocumentsService(), session_factory, spool_dir=str(tmp_path))
+    runner.resume_pending()
+
+    assert runner.get("job-live")["status"] == "running"
+    assert runner.get("job-dead")["status"] == "interrupted"
+    # A second process starting up later finds nothing left to take over.
+    other = IndexingJobRunner(StubDocumentsService(), session_factory, spool_dir=str(tmp_path))
+    assert other.resume_pending() == 0
+    assert other.get("job-live")["status"] == "running"
+
+
+def test_jobs_run_once_and_a_lost_lease_keeps_the_new_owner_state(tmp_path):
+    session_factory = _session_factory()
+    service = StubDocumentsService()
+    runner = IndexingJobRunner(service, session_factory, spool_dir=str(tmp_path))
+    other = IndexingJobRunner(service, session_factory, spool_dir=str(tmp_path))
+
+    job = runner.submit_index(document_uuid="doc-1", principal=_principal())
+    _wait(runner, job["id"])
+    # Another process cannot start a job it does not hold.
+    other._run_job(job["id"])
+    assert [call[0] for call in service.calls] == ["index"]
+
+    db = session_factory()
+    db.add(IndexingJob(id="job-taken", kind="index", status=IndexingJobStatus.running, params={}, worker_id="new-owner"))
+    db.commit()
+    db.close()
+    runner._finish("job-taken", status=IndexingJobStatus.failed)
+    assert runner.get("job-taken")["status"] == "running"
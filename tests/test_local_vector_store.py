@@ -0,0 +1,156 @@
+import io
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+from bayleaf_agents.services.sparse_vectors import tokenize
+from bayleaf_agents.services.vector_store import LocalVectorStore, filter_matches
+
+MODEL = "model-a"
+
+
+class BagOfWordsEmbedder:
+    # Deterministic stand-in for a sentence model: hashed token counts.
+    dim = 32
+
+    def _vector(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            vector[zlib.crc32(token.encode("utf-8")) % self.dim] += 1.0
+        return vector
+
+    def encode(self, texts, **kwargs):
+        _ = kwargs
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.stack([self._vector(t) for t in texts])
+
+
+def _service(directory):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.invalid",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL],
+        default_model=MODEL,
+        vector_store=LocalVectorStore(str(directory)),
+        retrieval_mode="hybrid",
+    )
+    service.models.put(MODEL, BagOfWordsEmbedder())
+    return service
+
+
+def _upload(service, name, text):
+    return service.index_uploaded_document(
+        filename=name,
+        fileobj=io.BytesIO(text.encode("utf-8")),
+        mime_type="text/plain",
+    )
+
+
+def test_local_store_indexes_and_queries_without_qdrant(tmp_path):
+    service = _service(tmp_path)
+    lipids = _upload(service, "lipids.txt", "LDL-c above 3.5 mg/dL requires a fasting lipid panel.")
+    glucose = _upload(service, "glucose.txt", "Fasting glucose and HbA1c monitoring for diabetes.")
+
+    result = service.query_documents(query="ldl-c lipid panel", top_k=2)
+
+    assert result["trace"]["retrieval_mode"] == "hybrid"
+    assert result["chunks"][0]["document_uuid"] == lipids["uuid"]
+
+    filtered = service.query_documents(query="ldl-c lipid panel", top_k=5, document_uuids=[glucose["uuid"]])
+    assert {c["document_uuid"] for c in filtered["chunks"]} == {glucose["uuid"]}
+
+    dense = service.query_documents(query="glucose diabetes", top_k=1, retrieval_mode="dense")
+    assert dense["trace"]["retrieval_mode"] == "dense"
+    assert dense["chunks"][0]["document_uuid"] == glucose["uuid"]
+
+    assert {d["uuid"] for d in service.documents_available()} == {lipids["uuid"], glucose["uuid"]}
+    assert service.get_document(lipids["uuid"])["chunks"] == 1
+
+
+def test_local_store_persists_across_reopen(tmp_path):
+    service = _service(tmp_path)
+    doc = _upload(service, "lipids.txt", "LDL-c above 3.5 mg/dL requires a fasting lipid panel.")
+    service.vector_store.close()
+
+    reopened = _service(tmp_path)
+    result = reopened.query_documents(query="lipid panel", top_k=1)
+
+    assert result["chunks"][0]["document_uuid"] == doc["uuid"]
+    assert result["chunks"][0]["text_chunk"].startswith("LDL-c")
+
+
+def test_local_store_delete_by_range_and_scroll_pages(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    store.create_collection("docs", dim=2, distance="Cosine")
+    store.upsert(
+        "docs",
+        [
+            {"id": f"p{i}", "vector": [1.0, float(i)], "payload": {"document_uuid": "d1", "chunk_index": i}}
+            for i in range(5)
+        ],
+    )
+
+    store.delete(
+        "docs",
+        {"must": [{"key": "document_uuid", "match": {"value": "d1"}}, {"key": "chunk_index", "range": {"gte": 2}}]},
+    )
+    first, offset = store.scroll("docs", limit=1)
+    rest, end = store.scroll("docs", limit=10, offset=offset)
+
+    assert store.count("docs") == 2
+    assert [p["payload"]["chunk_index"] for p in first + rest] == [0, 1]
+    assert end is None
+
+
+def test_filter_matches_supports_any_except_and_must_not():
+    payload = {"source_type": "uploaded", "is_bayleaf": False, "chunk_index": 3}
+
+    assert filter_matches(payload, {"must": [{"key": "source_type", "match": {"any": ["uploaded", "bayleaf"]}}]})
+    assert not filter_matches(payload, {"must_not": [{"key": "is_bayleaf", "match": {"value": False}}]})
+    assert filter_matches(payload, {"must": [{"key": "source_type", "match": {"except": ["bayleaf"]}}]})
+    assert not filter_matches(payload, {"should": [{"key": "chunk_index", "range": {"lt": 3}}]})
+
+
+def test_local_store_appends_changes_and_replays_them_on_reopen(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    store.create_collection("docs", dim=2, distance="Cosine")
+    sparse = {"bm25": {"indices": [7], "values": [1.0]}}
+    for i in range(3):
+        point = {"id": f"p{i}", "vector": {"": [1.0, float(i)], **sparse}, "payload": {"document_uuid": f"d{i}"}}
+        store.upsert("docs", [point])
+    store.set_payload("docs", ["p1"], {"status": "stale"})
+    store.delete("docs", {"must": [{"key": "document_uuid", "match": {"value": "d2"}}]})
+
+    directory = tmp_path / "docs"
+    with open(directory / "points.json", encoding="utf-8") as fh:
+        assert json.load(fh) == {}  # writes only appended to the log
+    assert len((directory / "points.log").read_text().splitlines()) == 5
+    assert store._get("docs").doc_freq["bm25"][7] == 2
+    store.close()
+
+    reopened = LocalVectorStore(str(tmp_path))
+    points, _ = reopened.scroll("docs")
+    assert [(p["id"], p["payload"].get("status")) for p in points] == [("p0", None), ("p1", "stale")]
+    assert reopened._get("docs").doc_freq["bm25"][7] == 2
+    only_d1 = {"must": [{"key": "document_uuid", "match": {"any": ["d1"]}}]}
+    hits = reopened.search("docs", [1.0, 1.0], limit=5, query_filter=only_d1)
+    assert [h["id"] for h in hits] == ["p1"]
+
+
+def test_local_store_reports_missing_collections_like_qdrant_and_is_single_process(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    with pytest.raises(DocumentServiceError) as exc:
+        store.upsert("missing", [{"id": "p", "vector": [1.0], "payload": {}}])
+    assert exc.value.status_code == 404
+
+    with pytest.raises(RuntimeError):
+        LocalVectorStore(str(tmp_path))
+    store.close()
+    LocalVectorStore(str(tmp_path)).close()
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+
+MODELS = ["model-e5", "model-bge"]
+
+
+def _service():
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=MODELS,
+        default_model=MODELS[0],
+        retrieval_mode="dense",
+    )
+    for model in MODELS:
+        service._ready_collections.add(service._collection_name(model))
+    service._embed_query = lambda query, model: ([0.1, 0.2], False)
+    return service
+
+
+def _hit(document_uuid, chunk_index, model, text="x"):
+    return {
+        "score": 0.9,
+        "payload": {"document_uuid": document_uuid, "chunk_index": chunk_index, "model_used": model, "text_chunk": text},
+    }
+
+
+def test_all_models_query_searches_collections_concurrently_and_fuses_by_rank(monkeypatch):
+    service = _service()
+    by_collection = {
+        service._collection_name("model-e5"): [_hit("doc-a", 0, "model-e5"), _hit("doc-shared", 1, "model-e5")],
+        service._collection_name("model-bge"): [_hit("doc-shared", 1, "model-bge"), _hit("doc-b", 0, "model-bge")],
+    }
+    # Both branches must be in flight at the same time to get past the barrier.
+    barrier = threading.Barrier(len(MODELS), timeout=5)
+
+    def fake_request(method, path, json_data=None):
+        barrier.wait()
+        return {"result": by_collection[path.split("/")[2]]}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    result = service.query_documents(query="ldl", top_k=3, all_models=True)
+
+    assert result["model_used"] == "all"
+    assert [(c["document_uuid"], c["model_used"]) for c in result["chunks"]] == [
+        ("doc-shared", "model-bge"),
+        ("doc-a", "model-e5"),
+        ("doc-b", "model-bge"),
+    ]
+    assert set(result["trace"]["models"]) == set(MODELS)
+    assert all("search_ms" in branch for branch in result["trace"]["models"].values())
+
+
+def test_all_models_query_fuses_on_chunk_text_not_chunk_index(monkeypatch):
+    service = _service()
+    # Each model chunks the document differently: chunk 0 only matches across models when its text does.
+    by_collection = {
+        service._collection_name("model-e5"): [_hit("doc-a", 0, "model-e5", "fasting"), _hit("doc-a", 1, "model-e5", "ldl")],
+        service._collection_name("model-bge"): [
+            _hit("doc-a", 0, "model-bge", "fasting and ldl"),
+            _hit("doc-a", 3, "model-bge", "ldl"),
+        ],
+    }
+
+    def fake_request(method, path, json_data=None):
+        return {"result": by_collection[path.split("/")[2]]}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+
+    result = service.query_documents(query="ldl", top_k=5, all_models=True)
+
+    assert sorted(c["text_chunk"] for c in result["chunks"]) == ["fasting", "fasting and ldl", "ldl"]
+
+
+def test_all_models_query_reports_failed_branch_and_keeps_the_rest(monkeypatch):
+    service = _service()
+    failing = service._collection_name("model-bge")
+
+    def fake_request(method, path, json_data=None):
+        if failing in path:
+            raise DocumentServiceError(503, "qdrant_unavailable")
+        return {"result": [_hit("doc-a", 0, "model-e5")]}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    result = service.query_documents(query="ldl", top_k=3, all_models=True)
+
+    assert [c["document_uuid"] for c in result["chunks"]] == ["doc-a"]
+    assert result["trace"]["models"]["model-bge"] == {"error": "qdrant_unavailable", "status_code": 503}
+
+
+def test_all_models_query_raises_when_every_branch_fails(monkeypatch):
+    service = _service()
+
+    def fake_request(method, path, json_data=None):
+        raise DocumentServiceError(503, "qdrant_unavailable")
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    with pytest.raises(DocumentServiceError):
+        service.query_documents(query="ldl", top_k=3, all_models=True)
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from bayleaf_agents.services.embedding_models import (
+    EmbeddingModelRegistry,
+    ModelLoadError,
+    load_embedding_model,
+    parse_embedding_models,
+    split_model_spec,
+)
+from bayleaf_agents.services.onnx_embedder import OnnxEmbedder, compare_embedders
+
+
+class FakeInput:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeSession:
+    # Token state = [token id, position]; lets the test check pooling by hand.
+    def __init__(self, inputs=("input_ids", "attention_mask", "token_type_ids")):
+        self.inputs = inputs
+        self.feeds = []
+
+    def get_inputs(self):
+        return [FakeInput(name) for name in self.inputs]
+
+    def run(self, output_names, feed):
+        _ = output_names
+        self.feeds.append(feed)
+        ids = feed["input_ids"].astype(np.float32)
+        positions = np.broadcast_to(np.arange(ids.shape[1], dtype=np.float32), ids.shape)
+        return [np.stack([ids, positions], axis=-1)]
+
+
+class FakeTokenizer:
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        _ = (padding, truncation, return_tensors)
+        rows = [[len(word) for word in text.split()][:max_length] for text in texts]
+        width = max(len(row) for row in rows)
+        ids = np.array([row + [0] * (width - len(row)) for row in rows])
+        mask = np.array([[1] * len(row) + [0] * (width - len(row)) for row in rows])
+        return {"input_ids": ids, "attention_mask": mask}
+
+
+def test_model_specs_keep_plain_names_and_backends():
+    assert split_model_spec("intfloat/multilingual-e5-base@ONNX-int8") == ("intfloat/multilingual-e5-base", "onnx-int8")
+    assert split_model_spec(" BAAI/bge-m3 ") == ("BAAI/bge-m3", "torch")
+    names, specs = parse_embedding_models("intfloat/multilingual-e5-base@onnx-int8, BAAI/bge-m3,")
+    assert names == ["intfloat/multilingual-e5-base", "BAAI/bge-m3"]
+    assert specs["intfloat/multilingual-e5-base"] == "intfloat/multilingual-e5-base@onnx-int8"
+
+
+def test_mean_pooling_ignores_padding_and_batches():
+    session = FakeSession()
+    embedder = OnnxEmbedder(session, FakeTokenizer(), pooling="mean", max_seq_length=8)
+
+    matrix = embedder.encode(["aa bbbb", "c"], batch_size=1)
+
+    assert matrix.tolist() == [[3.0, 0.5], [1.0, 0.0]]
+    assert len(session.feeds) == 2
+    # The tokenizer has no token_type_ids, but the exported graph takes them.
+    assert session.feeds[0]["token_type_ids"].tolist() == [[0, 0]]
+
+
+def test_cls_pooling_with_export_normalization():
+    embedder = OnnxEmbedder(FakeSession(("input_ids", "attention_mask")), FakeTokenizer(), pooling="cls", normalize=True)
+
+    vector = embedder.encode("abc de")
+
+    assert vector.shape == (2,)
+    assert np.allclose(vector, [1.0, 0.0])
+
+
+def test_unsupported_pooling_and_backend_are_load_errors():
+    with pytest.raises(ModelLoadError):
+        OnnxEmbedder(FakeSession(), FakeTokenizer(), pooling="max")
+    with pytest.raises(ModelLoadError) as exc:
+        load_embedding_model("model-a@tensorrt")
+    assert exc.value.code == "embedding_backend_unknown"
+
+
+def test_registry_loads_by_spec_but_keys_by_model_name():
+    seen = []
+    registry = EmbeddingModelRegistry(
+        model_specs={"model-a": "model-a@onnx-int8"},
+        loader=lambda spec: seen.append(spec) or object(),
+    )
+
+    registry.get("model-a")
+
+    assert seen == ["model-a@onnx-int8"]
+    assert registry.stats()["models"]["model-a"]["backend"] == "onnx-int8"
+
+
+class ScaledEmbedder:
+    def __init__(self, noise):
+        self.noise = noise
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True):
+        _ = batch_size
+        matrix = np.array([[len(text), 1.0 + self.noise * idx] for idx, text in enumerate(texts)], dtype=np.float32)
+        if normalize_embeddings:
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix
+
+
+def test_compare_embedders_reports_parity_and_throughput():
+    texts = ["ldl", "hdl cholesterol", "fasting glucose", "hba1c"]
+
+    report = compare_embedders(ScaledEmbedder(0.0), ScaledEmbedder(0.5), texts, batch_sizes=(1, 2))
+
+    assert report["texts"] == 4
+    assert report["cosine_min"] < report["cosine_mean"] <= 1.0
+    assert report["worst"][0]["cosine"] == report["cosine_min"]
+    assert set(report["throughput"]) == {"batch_1", "batch_2"}
@@ -0,0 +1,86 @@
+import pytest
+
+from bayleaf_agents.services.pdf_extraction import PdfExtractionTimeout, PdfTextExtractor
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+
+
+def _pdf_with_pages(count: int) -> bytes:
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for idx in range(count):
+        stream = f"BT /F1 12 Tf 72 720 Td (page {idx} text) Tj ET".encode()
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream.decode()}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {count} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+@pytest.fixture
+def extractor():
+    ext = PdfTextExtractor(max_workers=2, pages_per_task=3, timeout=60)
+    yield ext
+    ext.shutdown()
+
+
+def test_extract_pages_splits_ranges_and_keeps_page_order(extractor):
+    pages = extractor.extract_pages(_pdf_with_pages(8))
+
+    assert [p.strip() for p in pages] == [f"page {idx} text" for idx in range(8)]
+
+
+def test_extract_pages_reads_from_path(extractor, tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(_pdf_with_pages(2))
+
+    assert [p.strip() for p in extractor.extract_pages(str(path))] == ["page 0 text", "page 1 text"]
+
+
+def test_extract_pages_timeout_recycles_pool():
+    ext = PdfTextExtractor(max_workers=1, timeout=0.001)
+    try:
+        with pytest.raises(PdfExtractionTimeout):
+            ext.extract_pages(_pdf_with_pages(1))
+        assert ext._pool is None
+
+        ext.timeout = 60
+        assert [p.strip() for p in ext.extract_pages(_pdf_with_pages(1))] == ["page 0 text"]
+    finally:
+        ext.shutdown()
+
+
+def test_service_maps_extraction_timeout_to_422():
+    class TimingOut:
+        def extract_pages(self, source):
+            raise PdfExtractionTimeout("PDF text extraction exceeded 1s")
+
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=5,
+        bayleaf=None,
+        allowed_models=["model-a"],
+        default_model="model-a",
+        pdf_extractor=TimingOut(),
+    )
+
+    with pytest.raises(DocumentServiceError) as exc:
+        service._extract_text("/spool/scan.pdf", "scan.pdf", "application/pdf")
+
+    assert exc.value.status_code == 422
+    assert exc.value.message == "pdf_text_extraction_timeout"
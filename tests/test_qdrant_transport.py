@@ -0,0 +1,67 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bayleaf_agents.services.qdrant_transport import QdrantTransport
+
+
+@pytest.fixture
+def flaky_qdrant():
+    state = {"requests": 0, "ports": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("content-length") or 0))
+            state["requests"] += 1
+            state["ports"].add(self.client_address[1])
+            status = 503 if state["requests"] == 1 else 200
+            body = json.dumps({"status": "ok", "result": {"count": state["requests"]}}).encode()
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_transport_retries_5xx_and_reuses_connections(flaky_qdrant):
+    base_url, state = flaky_qdrant
+    transport = QdrantTransport(base_url, max_retries=2, backoff_factor=0, backoff_jitter=0)
+
+    first = transport.request("POST", "/collections/c/points/count", json_data={"exact": True})
+    second = transport.request("POST", "/collections/c/points/count", json_data={"exact": True})
+    transport.close()
+
+    assert first.status_code == 200
+    assert first.json()["result"]["count"] == 2
+    assert second.json()["result"]["count"] == 3
+    assert len(state["ports"]) == 1
+
+
+def test_transport_uses_search_timeout_for_search_and_query(monkeypatch):
+    transport = QdrantTransport("http://qdrant.test", timeout=20, connect_timeout=2, search_timeout=4)
+    seen = []
+    monkeypatch.setattr(transport.session, "request", lambda **kwargs: seen.append((kwargs["url"], kwargs["timeout"])))
+
+    transport.request("POST", "/collections/c/points/search", json_data={})
+    transport.request("POST", "/collections/c/points/query", json_data={})
+    transport.request("PUT", "/collections/c/points?wait=true", json_data={})
+
+    assert seen == [
+        ("http://qdrant.test/collections/c/points/search", (2.0, 4.0)),
+        ("http://qdrant.test/collections/c/points/query", (2.0, 4.0)),
+        ("http://qdrant.test/collections/c/points?wait=true", (2.0, 20.0)),
+    ]
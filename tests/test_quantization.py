@@ -0,0 +1,169 @@
+from bayleaf_agents.services.qdrant_documents import DocumentServiceError, QdrantDocumentsService
+from bayleaf_agents.services.vector_store import LocalVectorStore
+
+MODEL = "model-a"
+SCALAR = {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}}
+
+
+def _service(**kwargs):
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.test",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL],
+        default_model=MODEL,
+        **kwargs,
+    )
+    service._model_dims[MODEL] = 4
+    service._embed_query = lambda query, model: ([0.1, 0.2, 0.3, 0.4], False)
+    return service
+
+
+def _existing_collection(quantization_config):
+    return {
+        "result": {
+            "config": {
+                "params": {"vectors": {"size": 4, "distance": "Cosine"}, "sparse_vectors": {"bm25": {}}},
+                "quantization_config": quantization_config,
+            },
+            "payload_schema": {
+                field: {}
+                for field in ("document_uuid", "source_type", "model_used", "is_bayleaf", "chunk_index")
+            },
+        }
+    }
+
+
+def test_new_collection_is_created_with_scalar_quantization(monkeypatch):
+    service = _service(quantization="scalar")
+    created = []
+
+    def fake_request(method, path, json_data=None):
+        if method == "GET":
+            if not created:
+                raise DocumentServiceError(404, "qdrant_request_failed")
+            return _existing_collection(created[0].get("quantization_config"))
+        if method == "PUT" and "/index" not in path:
+            created.append(json_data)
+        if method == "PATCH":
+            raise AssertionError("new collections must not be patched")
+        return {"result": {}}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    service._ensure_collection(MODEL)
+
+    assert created[0]["quantization_config"] == SCALAR
+
+
+def test_existing_collection_is_migrated_once_to_configured_quantization(monkeypatch):
+    service = _service(quantization="binary", quantization_always_ram=False)
+    sent = []
+
+    def fake_request(method, path, json_data=None):
+        sent.append((method, path, json_data))
+        return _existing_collection(None)
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    service._ensure_collection(MODEL)
+    service._ensure_collection(MODEL)
+
+    patches = [(path, body) for method, path, body in sent if method == "PATCH"]
+    assert patches == [
+        (f"/collections/{service._collection_name(MODEL)}", {"quantization_config": {"binary": {"always_ram": False}}})
+    ]
+
+
+def test_quantized_collection_is_disabled_when_quantization_is_turned_off(monkeypatch):
+    service = _service(quantization="none")
+    sent = []
+
+    def fake_request(method, path, json_data=None):
+        sent.append((method, path, json_data))
+        return _existing_collection(SCALAR)
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    service._ensure_collection(MODEL)
+
+    patches = [(path, body) for method, path, body in sent if method == "PATCH"]
+    assert patches == [(f"/collections/{service._collection_name(MODEL)}", {"quantization_config": "Disabled"})]
+
+
+def test_unquantized_collection_is_left_alone_when_quantization_is_off(monkeypatch):
+    service = _service(quantization="none")
+    methods = []
+
+    def fake_request(method, path, json_data=None):
+        methods.append(method)
+        return _existing_collection(None)
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    service._ensure_collection(MODEL)
+
+    assert methods == ["GET"]
+
+
+def test_collection_with_matching_quantization_is_left_alone(monkeypatch):
+    service = _service(quantization="scalar")
+    methods = []
+
+    def fake_request(method, path, json_data=None):
+        methods.append(method)
+        return _existing_collection(SCALAR)
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    service._ensure_collection(MODEL)
+
+    assert methods == ["GET"]
+
+
+def test_queries_pass_oversampling_and_rescore(monkeypatch):
+    service = _service(quantization="scalar", search_oversampling=3, retrieval_mode="dense")
+    service._ready_collections.add(service._collection_name(MODEL))
+    sent = []
+
+    def fake_request(method, path, json_data=None):
+        sent.append(json_data)
+        return {"result": []}
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    result = service.query_documents(query="ldl", top_k=5)
+
+    assert sent[0]["params"] == {"quantization": {"rescore": True, "oversampling": 3.0}}
+    assert result["trace"]["quantization"] == "scalar"
+
+
+def test_unquantized_service_sends_no_search_params(monkeypatch):
+    service = _service(retrieval_mode="dense")
+    service._ready_collections.add(service._collection_name(MODEL))
+    sent = []
+    monkeypatch.setattr(service, "_request", lambda method, path, json_data=None: sent.append(json_data) or {"result": []})
+
+    service.query_documents(query="ldl", top_k=5)
+
+    assert "params" not in sent[0]
+
+
+class RecordingStore(LocalVectorStore):
+    def __init__(self, directory, configured, exact):
+        super().__init__(str(directory))
+        self.results = {"configured": configured, "exact": exact}
+        self.params = []
+
+    def search(self, collection, vector, *, limit, query_filter=None, search_params=None):
+        self.params.append(search_params)
+        key = "exact" if (search_params or {}).get("exact") else "configured"
+        return [{"id": point_id} for point_id in self.results[key][:limit]]
+
+
+def test_quantization_recall_compares_against_exact_search(tmp_path):
+    store = RecordingStore(tmp_path, configured=["a", "b", "x", "d"], exact=["a", "b", "c", "d"])
+    service = _service(quantization="scalar", vector_store=store)
+    service._ready_collections.add(service._collection_name(MODEL))
+
+    report = service.quantization_recall(["ldl", "hdl"], top_k=4)
+
+    assert report["recall_at_k"] == 0.75
+    assert report["queries"] == 2
+    assert {"exact": True, "quantization": {"ignore": True}} in store.params
@@ -206,3 +206,58 @@ def test_prefetch_uses_top_k_10_when_decider_returns_candidates():
     assert focused_call["top_k"] == 10
     assert focused_call["doc_key"] is None
     assert focused_call["document_uuids"] == ["doc-1"]
+
+
+class RecordingProvider(LLMProvider):
+    name = "recording-provider"
+
+    def __init__(self):
+        self.messages = []
+
+    def chat(self, messages, tools):
+        self.messages.append(messages)
+        return {"reply": "ok", "tool_calls": []}
+
+
+class MultiChunkDocumentsTools(StubDocumentsTools):
+    def query_documents(self, **kwargs):
+        self.calls.append(kwargs)
+        return {
+            "query": kwargs.get("query"),
+            "chunks": [
+                {"document_uuid": "doc-1", "chunk_index": idx, "score": 0.9 - idx / 10, "text_chunk": f"trecho-{idx}"}
+                for idx in range(5)
+            ],
+            "trace": {"trace_id": "retr_test_multi"},
+        }
+
+
+class KeepLastReranker:
+    def rerank(self, query, chunks, *, chunk_ref, top_n=None):
+        kept = [dict(chunks[-1], rerank_score=1.0)]
+        return kept, {"candidates": len(chunks), "kept": len(kept), "refs": [chunk_ref(c, i) for i, c in enumerate(chunks)]}
+
+
+def test_reranker_prunes_prefetch_chunks_before_prompt():
+    db = _session()
+    provider = RecordingProvider()
+    agent = TestReasoningAgent(
+        provider=provider,
+        decider_provider=DeciderNoRetrievalProvider(),
+        documents_tools=MultiChunkDocumentsTools(),
+    )
+    agent.reranker = KeepLastReranker()
+
+    agent.chat(
+        db=db,
+        channel="bayleaf_app",
+        user_message="Quais sao os valores normais do colesterol?",
+        external_conversation_id="conv-rerank",
+        principal=_principal(),
+        lang="pt-BR",
+        agent_slug="labcopilot",
+    )
+
+    system_prompt = provider.messages[0][0]["content"]
+    assert "trecho-4" in system_prompt
+    assert "trecho-0" not in system_prompt
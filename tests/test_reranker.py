@@ -0,0 +1,52 @@
+from bayleaf_agents.services.reranker import CrossEncoderReranker
+
+
+class FakeCrossEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        _ = show_progress_bar
+        self.calls.append((list(pairs), batch_size))
+        # Score by how often the query's first word appears in the chunk.
+        return [float(text.lower().count(query.split()[0].lower())) for query, text in pairs]
+
+
+def _ref(chunk, idx):
+    return f"{chunk.get('document_uuid')}#{chunk.get('chunk_index', idx)}"
+
+
+def _chunks():
+    return [
+        {"document_uuid": "d1", "chunk_index": 0, "text_chunk": "glucose panel"},
+        {"document_uuid": "d1", "chunk_index": 1, "text_chunk": "ldl ldl ldl cutoff"},
+        {"document_uuid": "d2", "chunk_index": 0, "text_chunk": "ldl reference"},
+    ]
+
+
+def test_rerank_scores_all_pairs_in_one_batch_and_keeps_top_n():
+    reranker = CrossEncoderReranker("fake", top_n=2, batch_size=8)
+    reranker._model = FakeCrossEncoder()
+
+    ranked, stats = reranker.rerank("ldl values", _chunks(), chunk_ref=_ref)
+
+    assert [(c["document_uuid"], c["chunk_index"]) for c in ranked] == [("d1", 1), ("d2", 0)]
+    assert ranked[0]["rerank_score"] == 3.0
+    assert len(reranker._model.calls) == 1
+    assert len(reranker._model.calls[0][0]) == 3 and reranker._model.calls[0][1] == 8
+    assert stats["candidates"] == 3 and stats["kept"] == 2 and stats["scored"] == 3
+
+
+def test_rerank_reuses_cached_scores_until_chunk_text_changes():
+    reranker = CrossEncoderReranker("fake", top_n=3)
+    reranker._model = FakeCrossEncoder()
+    reranker.rerank("ldl values", _chunks(), chunk_ref=_ref)
+
+    _, repeat = reranker.rerank("  ldl   values ", _chunks(), chunk_ref=_ref)
+    changed = _chunks()
+    changed[0]["text_chunk"] = "ldl ldl ldl ldl after reindex"
+    ranked, after_reindex = reranker.rerank("ldl values", changed, chunk_ref=_ref)
+
+    assert repeat["cache_hits"] == 3 and repeat["scored"] == 0
+    assert after_reindex["scored"] == 1
+    assert ranked[0]["chunk_index"] == 0 and ranked[0]["document_uuid"] == "d1"
@@ -0,0 +1,86 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from bayleaf_agents.app import create_app
+from bayleaf_agents.services import factories
+from bayleaf_agents.services.qdrant_documents import QdrantDocumentsService
+from bayleaf_agents.services.vector_store import LocalVectorStore
+from bayleaf_agents.services.warmup import StartupWarmup
+
+MODEL = "model-a"
+
+
+class ConstantEmbedder:
+    dim = 8
+
+    def encode(self, texts, **kwargs):
+        _ = kwargs
+        return np.ones((len(texts), self.dim), dtype=np.float32)
+
+
+def test_warm_up_loads_encodes_and_creates_the_collection(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        return ConstantEmbedder()
+
+    service = QdrantDocumentsService(
+        base_url="http://qdrant.invalid",
+        collection_prefix="documents",
+        distance="Cosine",
+        timeout=1,
+        bayleaf=object(),
+        allowed_models=[MODEL],
+        default_model=MODEL,
+        vector_store=store,
+    )
+    service.models.loader = loader
+
+    report = service.warm_up()
+
+    assert loads == [MODEL]
+    assert set(report[MODEL]) == {"collection", "load_ms", "encode_ms", "collection_ms"}
+    assert store.collection_info(report[MODEL]["collection"]) is not None
+    assert service._model_dims[MODEL] == ConstantEmbedder.dim
+
+
+def test_warmup_retries_until_it_succeeds():
+    attempts = []
+
+    def run():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("qdrant_unavailable")
+        return {"models": {MODEL: {}}}
+
+    warmup = StartupWarmup(run, retry_seconds=0.01)
+    assert not warmup.ready
+    warmup.start()
+
+    assert warmup.wait(timeout=5)
+    snapshot = warmup.snapshot()
+    assert snapshot["status"] == "ready" and snapshot["attempts"] == 3
+    assert snapshot["error"] is None and snapshot["warmup"] == {"models": {MODEL: {}}}
+
+
+def test_ready_endpoint_reports_503_until_warm(monkeypatch):
+    warmup = StartupWarmup(lambda: {}, enabled=True)
+    monkeypatch.setattr(factories, "_startup_warmup", warmup)
+    client = TestClient(create_app())
+
+    # Not started: the app was not entered as a context manager, so no lifespan ran.
+    pending = client.get("/ready")
+    assert pending.status_code == 503 and pending.json()["status"] == "pending"
+
+    warmup.start()
+    warmup.wait(timeout=5)
+    assert client.get("/ready").status_code == 200
+
+
+def test_disabled_warmup_is_ready_immediately():
+    warmup = StartupWarmup(lambda: {}, enabled=False)
+    warmup.start()
+
+    assert warmup.ready and warmup.snapshot()["status"] == "disabled"